@@ -0,0 +1,44 @@
+"""
+Benchmarks of what Exam costs.  Run them all, and keep the results to compare
+with other versions, with::
+
+    python -m benchmarks --output results.json
+"""
+from __future__ import absolute_import
+
+from timeit import default_timer
+
+
+def best_of(run, setup=None, number=1000, repeat=5):
+    """
+    Returns the best time, in microseconds, that one of ``number`` calls to
+    ``run`` took, out of ``repeat`` rounds.  ``setup``, if given, is called
+    before each round and what it returns is passed to ``run`` each call of
+    the round, i.e. a list of fresh test cases for ``run`` to pop from.
+    """
+    best = None
+
+    for _ in range(repeat):
+        state = setup() if setup is not None else None
+        started = default_timer()
+
+        if state is None:
+            for _ in range(number):
+                run()
+        else:
+            for _ in range(number):
+                run(state)
+
+        elapsed = default_timer() - started
+        best = elapsed if best is None else min(best, elapsed)
+
+    return best / number * 1e6
+
+
+def compare(benchmark, size, exam, baseline):
+    """
+    Returns the result of a benchmark of size ``size``, with how long Exam
+    took and how long the hand-written ``baseline`` took, in microseconds.
+    """
+    return {'benchmark': benchmark, 'size': size, 'exam_us': exam,
+            'baseline_us': baseline, 'ratio': exam / baseline}
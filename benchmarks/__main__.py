@@ -0,0 +1,71 @@
+"""
+Runs every benchmark and writes the results, along with what they were run
+on, as JSON::
+
+    python -m benchmarks --output results.json
+    python -m benchmarks --quick
+"""
+from __future__ import absolute_import, print_function
+
+import argparse
+import datetime
+import json
+import platform
+import sys
+
+from benchmarks import cases, compare, helpers, snapshots, stub
+
+
+def metadata():
+    return {'python': sys.version.split()[0],
+            'implementation': platform.python_implementation(),
+            'platform': platform.platform(),
+            'time': datetime.datetime.utcnow().isoformat() + 'Z'}
+
+
+def stub_calls():
+    """
+    A call to a ``Stub`` against a call to a plain ``mock.Mock``.
+    """
+    return compare('stub_call', 0,
+                   stub.time_calls(stub.Stub(return_value=1)) / 1e3,
+                   stub.time_calls(stub.Mock(return_value=1)) / 1e3)
+
+
+def run(quick=False):
+    if quick:
+        results = cases.run(sizes=(0, 10), tests=50, repeat=3)
+        results.extend(helpers.run(sizes=(10, 1000)))
+        results.extend(snapshots.run(sizes=(100,)))
+    else:
+        results = cases.run()
+        results.extend(helpers.run())
+        results.extend(snapshots.run())
+
+    results.append(stub_calls())
+    return results
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(prog='python -m benchmarks')
+    parser.add_argument('--output', metavar='FILE',
+                        help='write the results to FILE as JSON')
+    parser.add_argument('--quick', action='store_true',
+                        help='only run the smallest sizes')
+    options = parser.parse_args(argv)
+
+    results = run(options.quick)
+
+    for result in results:
+        print('%-17s %6d  exam %9.2f us  baseline %9.2f us  %7.2fx' % (
+            result['benchmark'], result['size'], result['exam_us'],
+            result['baseline_us'], result['ratio']))
+
+    if options.output:
+        with open(options.output, 'w') as output:
+            json.dump({'metadata': metadata(), 'results': results}, output,
+                      indent=2, sort_keys=True)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,173 @@
+"""
+Measures what running a test costs with Exam's hooks, patchers and fixtures,
+against hand-written ``setUp`` and ``tearDown`` methods doing the same work,
+as the number of hooks, patchers, fixtures and base classes grows::
+
+    python -m benchmarks.cases
+"""
+from __future__ import absolute_import, print_function
+
+from mock import patch
+import unittest
+
+from benchmarks import best_of, compare
+from exam.cases import Exam
+from exam.decorators import before, after, fixture, patcher
+
+
+SIZES = (0, 1, 10, 50)
+
+#: Test cases run per round.  Each test case only ever runs once.
+TESTS = 200
+
+
+class Target(object):
+    """
+    Has the attributes patchers patch.
+    """
+
+
+for _index in range(max(SIZES)):
+    setattr(Target, 'attribute%d' % _index, staticmethod(lambda: None))
+del _index
+
+
+def work(testcase):
+    pass
+
+
+def test_it(self):
+    pass
+
+
+def time_tests(case_class, tests=TESTS, repeat=5):
+    """
+    Returns the best time, in microseconds, it took to run one test of
+    ``case_class``.
+    """
+    result = unittest.TestResult()
+
+    def fresh_tests():
+        return [case_class('test_it') for _ in range(tests)]
+
+    return best_of(lambda tests: tests.pop().run(result), fresh_tests,
+                   number=tests, repeat=repeat)
+
+
+def exam_case(attrs, bases=(Exam, unittest.TestCase)):
+    attrs['test_it'] = test_it
+    return type('ExamCase', bases, attrs)
+
+
+def baseline_case(set_up, tear_down=None, bases=(unittest.TestCase,)):
+    attrs = {'test_it': test_it, 'setUp': set_up}
+    if tear_down is not None:
+        attrs['tearDown'] = tear_down
+    return type('BaselineCase', bases, attrs)
+
+
+def hooks(size):
+    """
+    ``size`` ``@before`` and ``size`` ``@after`` hooks.
+    """
+    attrs = {}
+    for index in range(size):
+        attrs['before%d' % index] = before(work)
+        attrs['after%d' % index] = after(work)
+
+    def set_up(self):
+        for _ in range(size):
+            work(self)
+
+    def tear_down(self):
+        for _ in range(size):
+            work(self)
+
+    return exam_case(attrs), baseline_case(set_up, tear_down)
+
+
+def patchers(size):
+    """
+    ``size`` patchers, each patching an attribute with a ``MagicMock``.
+    """
+    names = ['attribute%d' % index for index in range(size)]
+    attrs = dict((name, patcher.object(Target, name)) for name in names)
+
+    def set_up(self):
+        for name in names:
+            patch_object = patch.object(Target, name)
+            setattr(self, name, patch_object.start())
+            self.addCleanup(patch_object.stop)
+
+    return exam_case(attrs), baseline_case(set_up)
+
+
+def fixtures(size):
+    """
+    ``size`` fixtures, each used by the test.
+    """
+    names = ['fixture%d' % index for index in range(size)]
+    attrs = dict((name, fixture(list)) for name in names)
+
+    def use_fixtures(self):
+        for name in names:
+            getattr(self, name)
+
+    def set_up(self):
+        for name in names:
+            setattr(self, name, list())
+
+    exam_class = exam_case(attrs)
+    exam_class.test_it = use_fixtures
+    baseline_class = baseline_case(set_up)
+    baseline_class.test_it = use_fixtures
+    return exam_class, baseline_class
+
+
+def mro_depth(size):
+    """
+    ``size`` levels of subclasses, each with a ``@before`` hook of its own.
+    """
+    exam_class = exam_case({})
+    baseline_class = baseline_case(unittest.TestCase.setUp)
+
+    for level in range(size):
+        exam_class = type('ExamLevel%d' % level, (exam_class,),
+                          {'before%d' % level: before(work)})
+
+        def set_up(self, parent=baseline_class):
+            parent.setUp(self)
+            work(self)
+
+        baseline_class = type('BaselineLevel%d' % level, (baseline_class,),
+                              {'setUp': set_up})
+
+    return exam_class, baseline_class
+
+
+BENCHMARKS = (hooks, patchers, fixtures, mro_depth)
+
+
+def run(sizes=SIZES, tests=TESTS, repeat=5):
+    results = []
+
+    for benchmark in BENCHMARKS:
+        for size in sizes:
+            exam_class, baseline_class = benchmark(size)
+            results.append(compare(
+                benchmark.__name__, size,
+                time_tests(exam_class, tests, repeat),
+                time_tests(baseline_class, tests, repeat)))
+
+    return results
+
+
+def main():
+    for result in run():
+        print('%-10s %4d  exam %9.1f us  baseline %9.1f us  %5.2fx' % (
+            result['benchmark'], result['size'], result['exam_us'],
+            result['baseline_us'], result['ratio']))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,115 @@
+"""
+Measures Exam's helpers against hand-written code doing the same job:
+``effect`` dispatch as its table of calls grows, ``exam.mock.Mock``
+assertions as its call history grows, and setting up ``mock_import``::
+
+    python -m benchmarks.helpers
+"""
+from __future__ import absolute_import, print_function
+
+from mock import MagicMock, Mock as BaseMock, call, patch
+import sys
+
+from benchmarks import best_of, compare
+from exam.helpers import effect, mock_import
+from exam.mock import Mock
+
+
+SIZES = (10, 100, 1000, 10000)
+
+
+def number_for(size):
+    # Enough calls to time small sizes well, few enough for big ones to be
+    # done in a reasonable time.
+    return max(10, 10000 // size)
+
+
+def effect_dispatch(size, indexed):
+    """
+    A call matching the last of ``size`` configured calls, against looking
+    it up in a hand-written dict.
+    """
+    side_effect = effect(*[(call(index), index) for index in range(size)],
+                         indexed=indexed)
+    table = dict((index, index) for index in range(size))
+    last = size - 1
+
+    def by_hand(*args):
+        return table[args[0]]
+
+    return compare('effect_indexed' if indexed else 'effect', size,
+                   best_of(lambda: side_effect(last), number=number_for(size)),
+                   best_of(lambda: by_hand(last), number=number_for(size)))
+
+
+def mock_assertion(size, index_calls):
+    """
+    ``assert_not_any_call`` on a mock called ``size`` times, against
+    checking ``call_args_list`` of a plain ``mock.Mock`` by hand.
+    """
+    mock_object = Mock(index_calls=index_calls)
+    baseline = BaseMock()
+
+    for index in range(size):
+        mock_object(index)
+        baseline(index)
+
+    def by_hand():
+        assert call(-1) not in baseline.call_args_list
+
+    return compare('mock_index_calls' if index_calls else 'mock', size,
+                   best_of(lambda: mock_object.assert_not_any_call(-1),
+                           number=number_for(size)),
+                   best_of(by_hand, number=number_for(size)))
+
+
+def mock_import_setup(depth):
+    """
+    Entering and leaving ``mock_import`` of a module ``depth`` levels deep,
+    against patching ``sys.modules`` by hand.
+    """
+    path = '.'.join('level%d' % level for level in range(depth))
+
+    def by_hand():
+        root = MagicMock()
+        modules = {'level0': root}
+        current = root
+        for level in range(1, depth):
+            current = getattr(current, 'level%d' % level)
+            modules['.'.join(path.split('.')[:level + 1])] = current
+
+        with patch.dict(sys.modules, modules):
+            pass
+
+    def with_exam():
+        with mock_import(path):
+            pass
+
+    return compare('mock_import', depth, best_of(with_exam, number=200),
+                   best_of(by_hand, number=200))
+
+
+def run(sizes=SIZES):
+    results = []
+
+    for size in sizes:
+        results.append(effect_dispatch(size, indexed=False))
+        results.append(effect_dispatch(size, indexed=True))
+        results.append(mock_assertion(size, index_calls=False))
+        results.append(mock_assertion(size, index_calls=True))
+
+    for depth in (1, 3, 6):
+        results.append(mock_import_setup(depth))
+
+    return results
+
+
+def main():
+    for result in run():
+        print('%-17s %6d  exam %9.2f us  baseline %9.2f us  %7.2fx' % (
+            result['benchmark'], result['size'], result['exam_us'],
+            result['baseline_us'], result['ratio']))
+
+
+if __name__ == '__main__':
+    main()
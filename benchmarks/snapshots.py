@@ -0,0 +1,62 @@
+"""
+Compares what handing each test a copy of its own of an object graph costs
+with each snapshot strategy, against deep copying it in a ``@before`` hook::
+
+    python -m benchmarks.snapshots
+"""
+from __future__ import absolute_import, print_function
+
+import copy
+
+from benchmarks import best_of, compare
+from exam.snapshots import take, STRATEGIES
+
+
+SIZES = (100, 1000, 10000)
+
+#: Bytes in the payload buffer of a graph.
+PAYLOAD = 1024 * 1024
+
+
+class Record(object):
+
+    def __init__(self, index):
+        self.name = 'record%d' % index
+        self.index = index
+        self.tags = ('a', 'b')
+        self.scores = [index, index + 1]
+
+
+def build_graph(size):
+    """
+    ``size`` records, a lookup of them by name and a payload buffer.
+    """
+    records = [Record(index) for index in range(size)]
+    return {'records': records,
+            'names': dict((record.name, record.index) for record in records),
+            'payload': bytearray(PAYLOAD)}
+
+
+def snapshot(size, strategy):
+    graph = build_graph(size)
+    number = max(3, 3000 // size)
+
+    return compare('snapshot_' + strategy, size,
+                   best_of(take(graph, strategy), number=number),
+                   best_of(lambda: copy.deepcopy(graph), number=number))
+
+
+def run(sizes=SIZES):
+    return [snapshot(size, strategy)
+            for size in sizes for strategy in STRATEGIES]
+
+
+def main():
+    for result in run():
+        print('%-19s %6d  copy %9.1f us  deepcopy %9.1f us  %5.2fx' % (
+            result['benchmark'], result['size'], result['exam_us'],
+            result['baseline_us'], result['ratio']))
+
+
+if __name__ == '__main__':
+    main()
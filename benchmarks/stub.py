@@ -0,0 +1,38 @@
+"""
+Compares how long a call to an ``exam.mock.Stub`` takes with calls to mock's
+``MagicMock`` and ``Mock``::
+
+    python -m benchmarks.stub
+"""
+from __future__ import absolute_import, print_function
+
+from mock import MagicMock, Mock
+import timeit
+
+from exam.mock import Stub
+
+
+CALLS = 100000
+
+
+def time_calls(double, calls=CALLS, repeat=5):
+    """
+    Returns the best time, in nanoseconds, of a call to ``double``.
+    """
+    timer = timeit.Timer(lambda: double(1, key='value'))
+    return min(timer.repeat(repeat=repeat, number=calls)) / calls * 1e9
+
+
+def main():
+    results = [(name, time_calls(double)) for name, double in [
+        ('Stub', Stub(return_value=1)),
+        ('Mock', Mock(return_value=1)),
+        ('MagicMock', MagicMock(return_value=1))]]
+
+    for name, per_call in results:
+        print('%-10s %8.0f ns per call  %5.1fx' % (name, per_call,
+                                                   per_call / results[0][1]))
+
+
+if __name__ == '__main__':
+    main()
@@ -2,4 +2,5 @@ from __future__ import absolute_import
 
 from exam.cases import Exam  # NOQA
 from exam.helpers import intercept  # NOQA
-from exam.decorators import before, after, around, fixture, patcher  # NOQA
+from exam.decorators import (before, after, around, fixture, patcher,  # NOQA
+                             uses, benchmark, parametrize)
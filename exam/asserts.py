@@ -1,5 +1,19 @@
 from functools import partial
 from operator import eq, ne
+import time
+import unittest
+
+from mock import patch
+
+from exam.timing import clock
+
+try:
+    import tracemalloc
+except ImportError:  # Python 2
+    tracemalloc = None
+
+
+cpu_clock = getattr(time, 'process_time', None) or time.clock
 
 
 IRRELEVANT = object()
@@ -56,6 +70,206 @@ class ChangeWatcher(object):
         raise AssertionError(message.format(**vars(self)))
 
 
+class Budget(object):
+    """
+    Base of the assertions that fail when running some code uses more than
+    ``limit`` of something.  As a context manager, it measures the block it
+    wraps once.  Given a callable, it calls it ``warmup`` times unmeasured
+    and then ``repeat`` times measured, and checks the least any of those
+    used, as noise only ever adds to what a run seems to use.
+    """
+
+    MESSAGE = 'Used {used}, over the budget of {limit}'
+
+    def __init__(self, limit):
+        self.limit = limit
+        self.used = None
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exec_type, exec_value, traceback):
+        used = self.stop()
+
+        if exec_type is not None:
+            return False  # reraises original exception
+
+        self.used = used
+        self.check()
+
+    def run(self, func, args, kwargs):
+        warmup = kwargs.pop('warmup', 0)
+        repeat = kwargs.pop('repeat', 1)
+
+        for _ in range(warmup):
+            func(*args, **kwargs)
+
+        measured = []
+        for _ in range(repeat):
+            self.start()
+            try:
+                func(*args, **kwargs)
+            finally:
+                measured.append(self.stop())
+
+        self.used = self.least(measured)
+        self.check()
+        return self
+
+    def least(self, measured):
+        return min(measured)
+
+    def check(self):
+        if self.used > self.limit:
+            raise AssertionError(self.MESSAGE.format(**vars(self)))
+
+    @classmethod
+    def assertion(cls, arity, **options):
+        """
+        Returns an assertion taking the ``arity`` arguments of ``cls`` and
+        its keyword ``options``, followed by what ``assertRaises`` takes
+        after the exception: nothing, to be used as a context manager, or a
+        callable and its arguments.
+        """
+        def assertion(*args, **kwargs):
+            budget = cls(*args[:arity], **dict(
+                (name, kwargs.pop(name, default))
+                for name, default in options.items()))
+
+            if len(args) > arity:
+                return budget.run(args[arity], args[arity + 1:], kwargs)
+            elif kwargs:
+                raise TypeError(
+                    'Only a callable can be warmed up or repeated')
+
+            return budget
+
+        return assertion
+
+
+class TimeBudget(Budget):
+
+    MESSAGE = 'Took {used:.6f}s of {kind}, over the budget of {limit}s'
+
+    def __init__(self, seconds, cpu=False):
+        super(TimeBudget, self).__init__(seconds)
+        self.kind = 'CPU time' if cpu else 'wall time'
+        self.clock = cpu_clock if cpu else clock
+
+    def start(self):
+        self.started = self.clock()
+
+    def stop(self):
+        return self.clock() - self.started
+
+
+class AllocationBudget(Budget):
+    """
+    Measures, with ``tracemalloc``, the most memory the code had allocated
+    at once and the number of memory blocks it left allocated.  Either
+    limit can be ``None``, which skips checking it.
+    """
+
+    def __init__(self, size, blocks=None):
+        super(AllocationBudget, self).__init__((size, blocks))
+        self.blocks = blocks
+
+    def start(self):
+        if tracemalloc is None:
+            raise unittest.SkipTest('tracemalloc is not available')
+
+        self.started_tracing = not tracemalloc.is_tracing()
+        if self.started_tracing:
+            tracemalloc.start()
+
+        if self.blocks is not None:
+            self.snapshot = self.__take_snapshot()
+
+        # Before Python 3.9, the peak can not be reset, leaving only how much
+        # memory the code left allocated.
+        if hasattr(tracemalloc, 'reset_peak'):
+            tracemalloc.reset_peak()
+        self.allocated = tracemalloc.get_traced_memory()[0]
+
+    def stop(self):
+        allocated, peak = tracemalloc.get_traced_memory()
+        if not hasattr(tracemalloc, 'reset_peak'):
+            peak = allocated
+
+        blocks = None
+        if self.blocks is not None:
+            blocks = sum(stat.count_diff for stat in
+                         self.__take_snapshot().compare_to(
+                             self.snapshot, 'filename'))
+            self.snapshot = None
+
+        if self.started_tracing:
+            tracemalloc.stop()
+
+        return peak - self.allocated, blocks
+
+    def __take_snapshot(self):
+        return tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__)])
+
+    def least(self, measured):
+        return tuple(min(used) if used[0] is not None else None
+                     for used in zip(*measured))
+
+    def check(self):
+        (size, blocks), (max_size, max_blocks) = self.used, self.limit
+
+        if max_size is not None and size > max_size:
+            raise AssertionError('Allocated {0} bytes, over the budget of '
+                                 '{1} bytes'.format(size, max_size))
+        if max_blocks is not None and blocks > max_blocks:
+            raise AssertionError('Left {0} memory blocks allocated, over the '
+                                 'budget of {1}'.format(blocks, max_blocks))
+
+
+class CallBudget(Budget):
+    """
+    Counts calls to ``target``: a mock, or the dotted path of a function or
+    method, which is patched with an autospec wrapping it while measuring.
+    """
+
+    MESSAGE = 'Called {target} {used} times, over the budget of {limit}'
+
+    def __init__(self, target, count):
+        super(CallBudget, self).__init__(count)
+        self.target = target
+
+    def start(self):
+        self.patcher = None
+        counted = self.target
+
+        if isinstance(self.target, str):
+            probe = patch(self.target)
+            original = getattr(probe.getter(), probe.attribute)
+            self.patcher = patch(self.target, autospec=True,
+                                 side_effect=original)
+            counted = self.patcher.start()
+
+        self.counted = counted
+        self.calls = counted.call_count
+
+    def stop(self):
+        calls = self.counted.call_count - self.calls
+
+        if self.patcher is not None:
+            self.patcher.stop()
+            self.patcher = None
+        self.counted = None
+
+        return calls
+
+    def least(self, measured):
+        # Unlike time, a call count is no noisier on one run than another.
+        return max(measured)
+
+
 class AssertsMixin(object):
     assertChanges = partial(ChangeWatcher, ne)
     assertDoesNotChange = partial(
@@ -64,3 +278,7 @@ class AssertsMixin(object):
         before=IRRELEVANT,
         after=IRRELEVANT
     )
+    assertFasterThan = staticmethod(TimeBudget.assertion(1, cpu=False))
+    assertMaxAllocations = staticmethod(
+        AllocationBudget.assertion(1, blocks=None))
+    assertMaxCalls = staticmethod(CallBudget.assertion(2))
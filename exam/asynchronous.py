@@ -0,0 +1,191 @@
+"""
+Runs the hooks and fixtures of Exam test cases on an event loop, for test
+cases that have coroutine functions or async generators among them and for
+``IsolatedAsyncioTestCase`` test cases.  Python 3 only.
+"""
+from functools import partial
+import asyncio
+import inspect
+
+from exam.objects import is_async
+from exam.timing import clock
+import exam.cases
+import exam.timing
+
+
+# Where isolated test cases keep their hooks between setting up and tearing
+# down.
+_HOOKS = '_exam_async_hooks'
+
+# The before hook Exam warms fixtures in, which starts after the patchers.
+_WARM_FIXTURES = '_Exam__warm_fixtures'
+
+
+async def _resolve(value):
+    return await value if inspect.isawaitable(value) else value
+
+
+class AsyncHooks(object):
+    """
+    Runs the hooks of a :class:`exam.cases.HookPlan` on an event loop, in the
+    order Exam runs hooks: the ``@around`` hooks are entered, then the
+    ``@before`` hooks run.  The async fixtures :func:`exam.cases.warm_up`
+    picks are awaited along with the rest of the fixtures it picks, once the
+    patchers have started.  After the test come the ``@after`` hooks and,
+    last, the rest of the async generator fixtures and ``@around`` hooks, in
+    reverse.
+    """
+
+    def __init__(self, testcase, plan):
+        self.testcase = testcase
+        self.plan = plan
+        self.entered = []
+        self.recorder = exam.timing.recorder
+
+    async def set_up(self):
+        for _, value in self.plan.arounds:
+            await self.__enter('around', value.init_callables[0], value)
+
+        for batch in self.plan.before_batches:
+            if batch[0][0] == _WARM_FIXTURES:
+                await self.__await_fixtures()
+
+            if len(batch) == 1:
+                await self.__run_hook('before', batch[0][1])
+            else:
+                await self.__run_concurrently(batch)
+
+    async def __await_fixtures(self):
+        # Awaited ahead of the hook warming the rest, which then finds them
+        # built.
+        for level in exam.cases.warm_up_for(self.testcase, self.plan):
+            for _, fixture in level:
+                if fixture.is_async and fixture not in self.testcase.__dict__:
+                    self.testcase.__dict__[fixture] = await self.__enter(
+                        'fixture', fixture.thing, fixture.apply)
+
+    async def tear_down(self):
+        for _, value in self.plan.afters:
+            await self.__run_hook('after', value)
+
+    async def finish(self):
+        """
+        Runs what is left of every generator entered so far, even when one
+        of them fails.  The first failure is raised once all have run.
+        """
+        error = None
+
+        while self.entered:
+            generator, phase, thing, entering = self.entered.pop()
+            started = clock()
+            try:
+                if inspect.isasyncgen(generator):
+                    await generator.__anext__()
+                else:
+                    next(generator)
+            except (StopIteration, StopAsyncIteration):
+                pass
+            except Exception as failure:
+                error = error or failure
+
+            self.__record(phase, thing, entering + clock() - started)
+
+        if error is not None:
+            raise error
+
+    async def __run_concurrently(self, batch):
+        loop = asyncio.get_running_loop()
+        results = await asyncio.gather(*[
+            self.__run_hook('before', value)
+            if is_async(value.init_callables[0]) else
+            loop.run_in_executor(exam.cases.executor(), partial(
+                exam.timing.call, 'before', value.init_callables[0],
+                value, self.testcase))
+            for _, value in batch], return_exceptions=True)
+
+        # The first failure in plan order, whichever failed first in time.
+        for result in results:
+            if isinstance(result, BaseException):
+                raise result
+
+    async def __run_hook(self, phase, value):
+        started = clock()
+        try:
+            await _resolve(value(self.testcase))
+        finally:
+            self.__record(phase, value.init_callables[0], clock() - started)
+
+    async def __enter(self, phase, thing, build):
+        """
+        Awaits what ``build`` returns for the test case, or enters it if it
+        is a generator.  ``thing`` is the hook or fixture it belongs to.
+        """
+        started = clock()
+        value = build(self.testcase)
+
+        if inspect.isasyncgen(value):
+            result = await value.__anext__()
+        elif inspect.isgenerator(value):
+            result = next(value)
+        else:
+            result = await value
+            self.__record(phase, thing, clock() - started)
+            return result
+
+        self.entered.append((value, phase, thing, clock() - started))
+        return result
+
+    def __record(self, phase, thing, seconds):
+        if self.recorder is not None:
+            self.recorder.add(phase, thing, seconds)
+
+
+def run_on_new_loop(testcase, plan, run_test):
+    """
+    Runs ``testcase``'s hooks around ``run_test`` on a single event loop
+    made for this test.  ``run_test`` itself is called outside of the loop,
+    so tests are free to run loops of their own.
+    """
+    hooks = AsyncHooks(testcase, plan)
+    loop = asyncio.new_event_loop()
+
+    try:
+        try:
+            loop.run_until_complete(hooks.set_up())
+            run_test()
+            loop.run_until_complete(hooks.tear_down())
+        finally:
+            loop.run_until_complete(hooks.finish())
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+async def async_set_up(testcase):
+    """
+    ``Exam.asyncSetUp``, which ``IsolatedAsyncioTestCase`` runs on the event
+    loop it runs the test on, after ``setUp``.
+    """
+    await super(exam.cases.Exam, testcase).asyncSetUp()
+    hooks = testcase.__dict__[_HOOKS] = AsyncHooks(
+        testcase, exam.cases.hook_plan(type(testcase)))
+    # Cleanups run even when setting up fails half way through.
+    testcase.addAsyncCleanup(_finish, testcase)
+    await hooks.set_up()
+
+
+async def async_tear_down(testcase):
+    """
+    ``Exam.asyncTearDown``, the counterpart of :func:`async_set_up`.
+    """
+    hooks = testcase.__dict__.get(_HOOKS)
+
+    try:
+        if hooks is not None:
+            await hooks.tear_down()
+    finally:
+        await super(exam.cases.Exam, testcase).asyncTearDown()
+
+
+async def _finish(testcase):
+    await testcase.__dict__.pop(_HOOKS).finish()
@@ -0,0 +1,181 @@
+"""
+Runs the body of a test marked with ``@benchmark`` many times, works out
+statistics of how long one run takes and compares them with a baseline kept
+in a JSON file next to the test module::
+
+    class TestParsing(Exam, TestCase):
+
+        payload = fixture(load_payload)
+
+        @benchmark(threshold=0.25)
+        def test_parse(self):
+            parse(self.payload)
+
+The test fails when its median run is more than ``threshold`` slower than
+the baseline's.  Baselines are written instead of compared when
+:data:`update` is true, which ``EXAM_UPDATE_BENCHMARKS=1`` or the ``exam``
+command's ``--update-benchmarks`` turn on.
+"""
+from __future__ import absolute_import
+
+import gc
+import json
+import os
+import sys
+
+from exam.timing import clock
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+#: Whether benchmarks write their baselines instead of comparing with them.
+update = bool(os.environ.get('EXAM_UPDATE_BENCHMARKS'))
+
+#: Percentiles, besides the median, reported of every benchmark.
+PERCENTILES = (5, 25, 75, 95)
+
+
+def percentile(ordered, percent):
+    """
+    Returns the ``percent`` percentile of the sorted list ``ordered``,
+    interpolating between the two values closest to it.
+    """
+    position = (len(ordered) - 1) * percent / 100.0
+    below = int(position)
+    above = min(below + 1, len(ordered) - 1)
+    return ordered[below] + (ordered[above] - ordered[below]) * \
+        (position - below)
+
+
+def statistics(per_run, number):
+    """
+    Returns the statistics of the seconds ``per_run`` took in each sample,
+    each of ``number`` runs.  Everything in it is plain JSON.
+    """
+    ordered = sorted(per_run)
+    stats = {'samples': len(ordered), 'number': number,
+             'median': percentile(ordered, 50),
+             'min': ordered[0], 'max': ordered[-1]}
+
+    for percent in PERCENTILES:
+        stats['p%d' % percent] = percentile(ordered, percent)
+
+    stats['iqr'] = stats['p75'] - stats['p25']
+    return stats
+
+
+def time_runs(run, number):
+    """
+    Returns the seconds ``number`` calls of ``run`` took, with the garbage
+    collector off, as ``timeit`` does.
+    """
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        started = clock()
+        for _ in range(number):
+            run()
+        return clock() - started
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def calibrate(run, min_time, max_number=10 ** 6):
+    """
+    Returns how many calls of ``run`` it takes for a sample to last at least
+    ``min_time`` seconds, doubling from one.
+    """
+    number = 1
+
+    while number < max_number and time_runs(run, number) < min_time:
+        number *= 2
+
+    return number
+
+
+def measure(run, samples, min_time):
+    number = calibrate(run, min_time)
+    return statistics([time_runs(run, number) / number
+                       for _ in range(samples)], number)
+
+
+def baseline_path(testcase, baselines):
+    """
+    Returns where the baselines of ``testcase`` are kept: ``baselines``
+    itself if absolute, otherwise relative to the directory of the module
+    defining the test case.
+    """
+    if os.path.isabs(baselines):
+        return baselines
+
+    module = sys.modules[type(testcase).__module__]
+    return os.path.join(os.path.dirname(os.path.abspath(module.__file__)),
+                        baselines)
+
+
+def load_baselines(path):
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as baselines_file:
+        return json.load(baselines_file)
+
+
+def save_baseline(path, test_id, stats):
+    """
+    Writes ``stats`` as the baseline of ``test_id``, keeping the other
+    baselines in ``path``.  Worker processes of the ``exam`` command may do
+    this at the same time, so the file is locked where that is possible.
+    """
+    with open(path, 'a+') as baselines_file:
+        if fcntl is not None:
+            fcntl.flock(baselines_file, fcntl.LOCK_EX)
+
+        baselines_file.seek(0)
+        content = baselines_file.read()
+        baselines = json.loads(content) if content.strip() else {}
+        baselines[test_id] = stats
+
+        baselines_file.seek(0)
+        baselines_file.truncate()
+        json.dump(baselines, baselines_file, indent=2, sort_keys=True)
+        baselines_file.write('\n')
+
+
+def format_stats(stats):
+    return 'median %.3gs, IQR %.3gs, p5 %.3gs, p95 %.3gs over %d samples ' \
+        'of %d runs' % (stats['median'], stats['iqr'], stats['p5'],
+                        stats['p95'], stats['samples'], stats['number'])
+
+
+def check(testcase, run, options):
+    """
+    Benchmarks ``run``, the bound body of ``testcase``'s test, and either
+    records its statistics as the baseline or fails the test if it got
+    slower than the baseline by more than the threshold in ``options``.
+    """
+    stats = measure(run, options['samples'], options['min_time'])
+    testcase.benchmark_stats = stats
+    path = baseline_path(testcase, options['baselines'])
+    test_id = testcase.id()
+
+    if update:
+        save_baseline(path, test_id, stats)
+        return
+
+    baseline = load_baselines(path).get(test_id)
+    if baseline is None:
+        return
+
+    limit = baseline['median'] * (1 + options['threshold'])
+    if stats['median'] > limit:
+        raise testcase.failureException(
+            'Benchmark regressed by %.0f%%, over the threshold of %.0f%%: '
+            '%s, against a baseline %s' % (
+                (stats['median'] / baseline['median'] - 1) * 100,
+                options['threshold'] * 100, format_stats(stats),
+                format_stats(baseline)))
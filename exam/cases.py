@@ -1,10 +1,372 @@
 from __future__ import absolute_import
 
-from exam.decorators import before, after, around, patcher  # NOQA
-from exam.objects import noop  # NOQA
+from exam.decorators import before, after, around, patcher, fixture  # NOQA
+from exam.objects import noop, is_async  # NOQA
 from exam.asserts import AssertsMixin
 
+from mock import NonCallableMock
+
+from collections import namedtuple
+from contextlib import contextmanager
+from functools import partial
 import inspect
+import operator
+import os
+import unittest
+import weakref
+
+import exam.patching
+import exam.profiling
+import exam.scopes
+import exam.timing
+
+
+#: Hooks, patchers and fixtures of a test case class, in the order Exam runs
+#: them.  ``patchers``, ``fixtures``, ``arounds``, ``befores`` and ``afters``
+#: are tuples of ``(attribute name, value)`` pairs.  ``fixture_levels`` sorts
+#: the fixtures by their dependencies (see :func:`_fixture_levels`) and
+#: ``before_batches`` splits ``befores`` into the batches they run in (see
+#: :func:`_batch_befores`).  ``is_async`` says whether any hook or fixture is
+#: a coroutine function or async generator.  ``unknown_depends`` maps the
+#: fixtures that depend on names the class has no attribute for to those
+#: names.  ``warm_ups`` caches what :func:`warm_up` works out.
+HookPlan = namedtuple('HookPlan', 'patchers fixtures fixture_levels arounds '
+                                  'befores afters before_batches is_async '
+                                  'unknown_depends warm_ups')
+
+# Test cases that run on an event loop of their own, if there are any.
+_isolated = getattr(unittest, 'IsolatedAsyncioTestCase', ())
+
+if _isolated:
+    import exam.asynchronous
+
+_plans = weakref.WeakKeyDictionary()
+_planned_kinds = {patcher: 'patchers', fixture: 'fixtures', around: 'arounds',
+                  before: 'befores', after: 'afters'}
+
+# A cached plan, along with what tells whether the classes it was built from
+# still look the same (see :func:`_unchanged`): the classes ``cls`` inherits
+# from and the values of their attributes, and the ids of the values of
+# ``cls``'s own attributes.  Neither refers to the class itself, which would
+# keep it alive through the weak keys of ``_plans``.
+_Planned = namedtuple('_Planned', 'plan bases values own')
+
+
+def hook_plan(cls):
+    """
+    Returns the :class:`HookPlan` for the test case class ``cls``.  The plan
+    is built the first time it is asked for, and then reused for as long as
+    ``cls`` and the classes it inherits from look the same to it (see
+    :func:`_unchanged`).
+    """
+    planned = _plans.get(cls)
+
+    if planned is None or not _unchanged(cls, planned):
+        planned = _plans[cls] = _build_plan(cls)
+
+    return planned.plan
+
+
+def _unchanged(cls, planned):
+    """
+    Whether the classes ``cls`` inherits from are the ones ``planned`` was
+    built from, and every attribute of ``cls`` and of those classes, mixins
+    included, still holds the very value it held then.  Adding, deleting or
+    reassigning any attribute anywhere in the hierarchy changes that.
+    """
+    mro = cls.__mro__
+
+    if mro[1:] != planned.bases or \
+            tuple(map(id, vars(cls).values())) != planned.own:
+        return False
+
+    for base, values in zip(planned.bases, planned.values):
+        current = vars(base).values()
+        if len(current) != len(values) or \
+                not all(map(operator.is_, current, values)):
+            return False
+
+    return True
+
+
+def _running_plan(cls):
+    # The plan Exam.run checked as the test started, as checking it costs
+    # more than looking it up.
+    planned = _plans.get(cls)
+    return planned.plan if planned is not None else hook_plan(cls)
+
+
+def forget_plans():
+    """
+    Throws away every cached hook plan, so each is built again when next
+    asked for.
+    """
+    _plans.clear()
+
+
+def _build_plan(cls):
+    found = dict((kind, []) for kind in _planned_kinds.values())
+    before_owners = []
+    mro = inspect.getmro(cls)
+
+    for base in reversed(mro):
+        for attr, class_value in vars(base).items():
+            resolved_value = getattr(cls, attr, False)
+            kind = _planned_kinds.get(type(resolved_value))
+
+            if kind is None:
+                continue
+            # If the attribute inside of this base is not the exact same
+            # value as the one in cls, that means that it's been
+            # overwritten somewhere down the line and we shall skip it
+            elif class_value is not resolved_value:
+                continue
+            else:
+                found[kind].append((attr, resolved_value))
+
+                if kind == 'befores':
+                    before_owners.append(base)
+
+    hooks = [value.init_callables[0] for kind in ('arounds', 'befores',
+                                                  'afters')
+             for _, value in found[kind]]
+    asynchronous = any(map(is_async, hooks)) or \
+        any(value.is_async for _, value in found['fixtures'])
+
+    plan = HookPlan(
+        fixture_levels=_fixture_levels(cls, found['fixtures']),
+        before_batches=_batch_befores(zip(before_owners, found['befores'])),
+        is_async=asynchronous,
+        unknown_depends=_unknown_depends(cls, found['fixtures']),
+        warm_ups={},
+        **dict((k, tuple(v)) for k, v in found.items()))
+
+    # The values of cls's own attributes may refer to it, like methods that
+    # call super(), so only their ids are kept.  A value assigned to replace
+    # another is made while that one is still alive, so never has its id.
+    return _Planned(plan, mro[1:],
+                    tuple(tuple(vars(base).values()) for base in mro[1:]),
+                    tuple(map(id, vars(cls).values())))
+
+
+def _fixture_levels(cls, fixtures):
+    """
+    Sorts ``fixtures``, ``(attribute name, fixture)`` pairs, into levels.
+    Each fixture is one level after the last of the fixtures it depends on,
+    so the fixtures of a level only depend on fixtures of earlier levels.
+    Dependencies on names that are not fixtures of ``cls`` are left out (see
+    :func:`_unknown_depends`).  Raises ``ValueError`` when fixtures depend on
+    each other in a cycle.
+    """
+    names = dict(fixtures)
+    depends = dict((attr, [name for name in value.depends if name in names])
+                   for attr, value in fixtures)
+    remaining = list(fixtures)
+    placed = set()
+    levels = []
+
+    while remaining:
+        level = [(attr, value) for attr, value in remaining
+                 if all(name in placed for name in depends[attr])]
+
+        if not level:
+            raise ValueError('Fixtures of %s depend on each other: %s' % (
+                cls.__name__, _cycle(depends, dict(remaining))))
+
+        placed.update(attr for attr, _ in level)
+        levels.append(tuple(level))
+        remaining = [pair for pair in remaining if pair[0] not in placed]
+
+    return tuple(levels)
+
+
+def _unknown_depends(cls, fixtures):
+    """
+    Maps the names of ``fixtures`` that depend on names ``cls`` has no
+    attribute for to those names.  They are only a mistake once a test needs
+    the fixture warmed, as a base class may leave them for its subclasses to
+    define.  Attributes that are not fixtures, such as a fixture a subclass
+    replaced with a plain value, are fine: there is nothing to warm.
+    """
+    unknown = {}
+
+    for attr, value in fixtures:
+        names = tuple(name for name in value.depends
+                      if not hasattr(cls, name))
+        if names:
+            unknown[attr] = names
+
+    return unknown
+
+
+def _cycle(depends, remaining):
+    # Every fixture left depends on another one left, so following
+    # dependencies from any of them ends up going around a cycle.
+    path = [sorted(remaining)[0]]
+
+    while path.count(path[-1]) < 2:
+        path.append(next(name for name in depends[path[-1]]
+                         if name in remaining))
+
+    return ' -> '.join(path[path.index(path[-1]):])
+
+
+def warm_up(plan, uses=None):
+    """
+    Returns the levels of fixtures (as in ``plan.fixture_levels``) to build
+    before a test runs: the fixtures the test ``uses``, or when it does not
+    say, the eager fixtures and the async ones, which cannot be built on
+    first use like the rest, along with everything those depend on.  Raises
+    ``ValueError`` when any of them depend on names the test case class has
+    no attribute for.
+    """
+    key = None if uses is None else frozenset(uses)
+
+    if key not in plan.warm_ups:
+        depends = dict((attr, value.depends) for attr, value in plan.fixtures)
+        pending = list(key if uses is not None else
+                       (attr for attr, value in plan.fixtures
+                        if value.eager or value.is_async))
+        needed = set()
+
+        while pending:
+            name = pending.pop()
+            if name in depends and name not in needed:
+                needed.add(name)
+                pending.extend(depends[name])
+
+        unknown = sorted(needed & set(plan.unknown_depends))
+        if unknown:
+            raise ValueError('Fixture %s depends on unknown fixtures: %s' % (
+                unknown[0], ', '.join(plan.unknown_depends[unknown[0]])))
+
+        levels = (tuple(pair for pair in level if pair[0] in needed)
+                  for level in plan.fixture_levels)
+        plan.warm_ups[key] = tuple(level for level in levels if level)
+
+    return plan.warm_ups[key]
+
+
+def warm_up_for(testcase, plan):
+    """
+    Returns the levels of fixtures :func:`warm_up` picks for the test
+    ``testcase`` is about to run, going by the fixtures it ``uses``.
+    """
+    test = getattr(testcase, getattr(testcase, '_testMethodName', ''), None)
+    return warm_up(plan, getattr(test, 'exam_uses', None))
+
+
+def _batch_befores(befores):
+    """
+    Splits ``befores``, pairs of the class defining a hook and the hook's
+    ``(attribute name, value)``, into batches that run one after the other.
+    Concurrent hooks defined one after the other in the same class share a
+    batch, every other hook is a batch of its own.
+    """
+    batches = []
+    previous = None
+
+    for owner, hook in befores:
+        current = (owner, hook[1].concurrent)
+
+        if hook[1].concurrent and current == previous:
+            batches[-1].append(hook)
+        else:
+            batches.append([hook])
+
+        previous = current
+
+    return tuple(tuple(batch) for batch in batches)
+
+
+# Thread pools do not survive forking, so every process gets one of its own.
+_executors = {}
+
+
+def executor():
+    """
+    Returns the thread pool concurrent ``@before`` hooks and fixtures run on.
+    """
+    pid = os.getpid()
+
+    if pid not in _executors:
+        from concurrent.futures import ThreadPoolExecutor
+        _executors.clear()
+        _executors[pid] = ThreadPoolExecutor()
+
+    return _executors[pid]
+
+
+def run_together(calls):
+    """
+    Calls every one of ``calls`` at once on the :func:`executor`.  Once they
+    have all returned, raises the failure of the first one that failed, in
+    the order of ``calls`` rather than in time.
+    """
+    futures = [executor().submit(call) for call in calls]
+
+    for future in futures:
+        future.exception()
+    for future in futures:
+        future.result()
+
+
+def run_rows(testcase, test, rows):
+    """
+    Calls ``test`` for ``testcase`` with each of ``rows``, each as a subtest,
+    under the one setup the test's hooks made.  Between rows, function scoped
+    fixtures first built by a row are dropped, so the next row builds them
+    afresh, and the objects of patchers are reset the way class scoped ones
+    are between tests (see :meth:`exam.decorators.patcher.reset_mock`), back
+    to how the hooks left them.  Mocks reset with ``'all'`` are put back
+    whole, along with what the hooks set on their children and the mocks
+    they return.  What the hooks set up is otherwise shared by every row.
+    """
+    plan = _running_plan(type(testcase))
+    set_up = set(testcase.__dict__)
+    patched = []
+    subtest = getattr(testcase, 'subTest', None)
+
+    for attr, patchr in plan.patchers:
+        started = getattr(testcase, attr)
+
+        if patchr.reset == 'all' and isinstance(started, NonCallableMock):
+            state = exam.patching.Template(None, None, started)
+        else:
+            state = patchr.mock_config(started, current=True)
+
+        patched.append((patchr, started, state))
+
+    for index, row in enumerate(rows):
+        if index:
+            _reset_row(testcase, set_up, patched)
+
+        if isinstance(row, dict):
+            args, kwargs = (), row
+        else:
+            args, kwargs = row if isinstance(row, tuple) else (row,), {}
+
+        with subtest(case=index, row=row) if subtest else _no_subtest():
+            test(testcase, *args, **kwargs)
+
+
+def _reset_row(testcase, set_up, patched):
+    for key in list(testcase.__dict__):
+        if key not in set_up and isinstance(key, fixture):
+            del testcase.__dict__[key]
+
+    for patchr, started, state in patched:
+        if isinstance(state, exam.patching.Template):
+            state.restore()
+        else:
+            patchr.reset_mock(started, state)
+
+
+@contextmanager
+def _no_subtest():
+    # Python 2's unittest has no subtests, so the first failing row ends the
+    # test.
+    yield
 
 
 class MultipleGeneratorsContextManager(object):
@@ -25,35 +387,123 @@ class MultipleGeneratorsContextManager(object):
 
 class Exam(AssertsMixin):
 
+    #: Whether memoized fixtures and patcher mocks are dropped from the test
+    #: case once it has run.  unittest keeps every test case around until
+    #: the whole run is done, so this keeps memory from piling up.  Set it
+    #: to ``False`` to be able to poke at them afterwards while debugging.
+    release_after_run = True
+
+    @classmethod
+    def __init_subclass__(cls, **kwargs):
+        # Plans the hooks of test case classes as soon as they are created
+        # (from Python 3.6 on), so mistakes like fixtures that depend on each
+        # other in a cycle show up right away.
+        super(Exam, cls).__init_subclass__(**kwargs)
+        hook_plan(cls)
+
     @before
     def __setup_patchers(self):
-        for attr, patchr in self.__attrs_of_type(patcher):
-            patch_object = patchr.build_patch(self)
-            setattr(self, attr, patch_object.start())
-            self.addCleanup(patch_object.stop)
-
-    def __attrs_of_type(self, kind):
-        for base in reversed(inspect.getmro(type(self))):
-            for attr, class_value in vars(base).items():
-                resolved_value = getattr(type(self), attr, False)
-
-                if type(resolved_value) is not kind:
-                    continue
-                # If the attribute inside of this base is not the exact same
-                # value as the one in type(self), that means that it's been
-                # overwritten somewhere down the line and we shall skip it
-                elif class_value is not resolved_value:
-                    continue
-                else:
-                    yield attr, resolved_value
-
-    def __run_hooks(self, hook):
-        for _, value in self.__attrs_of_type(hook):
-            value(self)
+        for attr, patchr in _running_plan(type(self)).patchers:
+            setattr(self, attr, patchr.start(self))
+
+    @before
+    def __warm_fixtures(self):
+        for level in warm_up_for(self, _running_plan(type(self))):
+            concurrent = [attr for attr, value in level if value.concurrent]
+            if len(concurrent) > 1:
+                run_together([partial(getattr, self, attr)
+                              for attr in concurrent])
+
+            for attr, _ in level:
+                getattr(self, attr)
+
+    @classmethod
+    def tearDownClass(cls):
+        try:
+            getattr(super(Exam, cls), 'tearDownClass', noop)()
+        finally:
+            exam.scopes.close_class(cls)
+
+    if _isolated:
+        # IsolatedAsyncioTestCase runs these on the event loop it runs the
+        # test on, so Exam runs all of the test's hooks from them.
+        asyncSetUp = exam.asynchronous.async_set_up
+        asyncTearDown = exam.asynchronous.async_tear_down
+
+    def __run_hooks(self, hooks, phase, recorder):
+        for _, value in hooks:
+            if recorder is None:
+                value(self)
+            else:
+                recorder.call(phase, value.init_callables[0], value, self)
+
+    def __around(self, value, recorder):
+        if recorder is None:
+            return value(self)
+
+        return recorder.around(value.init_callables[0], value(self))
+
+    def __run_befores(self, plan, recorder):
+        for batch in plan.before_batches:
+            if len(batch) == 1:
+                self.__run_hooks(batch, 'before', recorder)
+            elif recorder is None:
+                run_together([partial(value, self) for _, value in batch])
+            else:
+                run_together([partial(
+                    recorder.call, 'before', value.init_callables[0],
+                    value, self) for _, value in batch])
+
+    def __getstate__(self):
+        # Memoized fixtures are keyed by the fixture itself, and patcher
+        # mocks cannot be pickled, so leave both out of pickles.
+        patchers = set(attr for attr, _ in hook_plan(type(self)).patchers)
+        return dict((key, value) for key, value in vars(self).items()
+                    if type(key) is not fixture and key not in patchers)
+
+    def __release(self, plan):
+        for key in list(self.__dict__):
+            if type(key) is fixture:
+                del self.__dict__[key]
+
+        for attr, _ in plan.patchers:
+            self.__dict__.pop(attr, None)
+
+    def __run_plan(self, plan, run_test, recorder):
+        if isinstance(self, _isolated):
+            # Its hooks are run by asyncSetUp and asyncTearDown instead.
+            run_test()
+        elif plan.is_async:
+            from exam.asynchronous import run_on_new_loop
+            run_on_new_loop(self, plan, run_test)
+        else:
+            generators = (self.__around(value, recorder)
+                          for _, value in plan.arounds)
+            with MultipleGeneratorsContextManager(*generators):
+                self.__run_befores(plan, recorder)
+                run_test()
+                self.__run_hooks(plan.afters, 'after', recorder)
 
     def run(self, *args, **kwargs):
-        generators = (value(self) for _, value in self.__attrs_of_type(around))
-        with MultipleGeneratorsContextManager(*generators):
-            self.__run_hooks(before)
-            getattr(super(Exam, self), 'run', noop)(*args, **kwargs)
-            self.__run_hooks(after)
+        plan = hook_plan(type(self))
+        run_test = partial(getattr(super(Exam, self), 'run', noop),
+                           *args, **kwargs)
+        recorder = exam.timing.recorder
+        profiles = exam.profiling.profiles
+
+        if recorder is not None:
+            recorder.start_test(self.id())
+            run_test = partial(recorder.call, 'test',
+                               getattr(self, '_testMethodName', 'test'),
+                               run_test)
+        try:
+            if profiles is None:
+                self.__run_plan(plan, run_test, recorder)
+            else:
+                profiles.profile(self.id(), self.__run_plan, plan, run_test,
+                                 recorder)
+        finally:
+            if recorder is not None:
+                recorder.stop_test()
+            if self.release_after_run:
+                self.__release(plan)
@@ -1,38 +1,176 @@
 from __future__ import absolute_import
 
-from mock import patch
+from mock import DEFAULT, NonCallableMock
 from functools import partial, wraps
+import threading
 import types
 
+from exam.objects import is_async
+from exam.timing import name_of
+import exam.benchmarking
 import exam.cases
+import exam.mock
+import exam.patching
+import exam.persistence
+import exam.scopes
+import exam.sharing
+import exam.snapshots
+import exam.timing
 
 
 class fixture(object):
 
-    def __init__(self, thing, *args, **kwargs):
+    SCOPES = ('function', 'class', 'module', 'session')
+
+    def __init__(self, thing=None, *args, **kwargs):
         self.thing = thing
+        self.snapshot = kwargs.pop('snapshot', None)
+        self.shared = kwargs.pop('shared', False)
+        # A snapshot's value is kept, and copied for each test, for as long
+        # as its scope lasts.  Shared values last the run by default.
+        self.scope = kwargs.pop('scope', 'class' if self.snapshot else
+                                'session' if self.shared else 'function')
+        self.depends = tuple(kwargs.pop('depends', ()))
+        self.eager = kwargs.pop('eager', False)
+        self.concurrent = kwargs.pop('concurrent', False)
+        self.persist = kwargs.pop('persist', False)
+        self.inputs = tuple(kwargs.pop('inputs', ()))
         self.args = args
         self.kwargs = kwargs
+        # Concurrent hooks may ask for the fixture at the same time.
+        self.lock = threading.RLock()
+
+        if self.scope not in self.SCOPES:
+            raise ValueError('Unknown fixture scope: %r' % (self.scope,))
+        elif self.snapshot is not None and \
+                self.snapshot not in exam.snapshots.STRATEGIES:
+            raise ValueError('Unknown snapshot strategy: %r' %
+                             (self.snapshot,))
+        elif self.snapshot is not None and self.scope == 'function':
+            raise ValueError('Snapshot fixtures need a class, module or '
+                             'session scope to outlive a test')
+        elif self.shared and self.scope == 'function':
+            raise ValueError('Shared fixtures need a class, module or '
+                             'session scope to outlive a test')
+        elif self.shared and self.snapshot is not None:
+            raise ValueError('Shared fixtures are read only, and cannot '
+                             'also be snapshots')
+
+        self.__inspect_thing()
+
+    def __call__(self, thing):
+        # Only reached when the fixture was constructed with just options,
+        # i.e. ``@fixture(scope='class')``, and is now decorating a method.
+        self.thing = thing
+        self.__inspect_thing()
+        return self
+
+    def __inspect_thing(self):
+        # Worked out once, as fixtures are looked up for every test.
+        self.is_async = is_async(self.thing)
+
+        # Each test runs on an event loop of its own, which values shared
+        # between tests would outlive.
+        if self.scope != 'function' and self.is_async:
+            raise ValueError('Async fixtures cannot have a %r scope' %
+                             (self.scope,))
+        elif self.persist and self.is_async:
+            raise ValueError('Async fixtures cannot be persisted')
 
     def __get__(self, testcase, type=None):
         if not testcase:
             # Test case fixture was accesse as a class property, so just return
             # this fixture itself.
             return self
+        elif self.snapshot is not None:
+            # Each test gets a copy of its own of the value built once.
+            if self not in testcase.__dict__:
+                with self.lock:
+                    if self not in testcase.__dict__:
+                        clone = self.__scope_for(testcase).get(self, partial(
+                            self.__take_snapshot, testcase))
+                        testcase.__dict__[self] = exam.timing.call(
+                            'fixture copy', self.thing, clone)
+        elif self.scope != 'function':
+            # Scoped fixtures are built once for the first test that asks for
+            # them, and shared with the rest of the tests in that scope.
+            scope = self.__scope_for(testcase)
+            return scope.get(self, partial(self.__build, scope, testcase))
         elif self not in testcase.__dict__:
+            if self.is_async:
+                # Exam awaits async fixtures before a test's hooks run, which
+                # cannot have happened here.
+                raise RuntimeError(
+                    'Async fixture %r can only be used by Exam test cases' %
+                    (getattr(self.thing, '__name__', self.thing),))
             # If this fixture is not present in the test case's __dict__,
             # freshly apply this fixture and store that in the dict, keyed by
             # self
-            application = self.__apply(testcase)(*self.args, **self.kwargs)
-            testcase.__dict__[self] = application
+            with self.lock:
+                if self not in testcase.__dict__:
+                    testcase.__dict__[self] = exam.timing.call(
+                        'fixture', self.thing, self.apply, testcase)
 
         return testcase.__dict__[self]
 
-    def __apply(self, testcase):
+    def __scope_for(self, testcase):
+        if self.scope == 'class':
+            return exam.scopes.for_class(type(testcase))
+        elif self.scope == 'module':
+            return exam.scopes.for_module(type(testcase).__module__)
+        else:
+            return exam.scopes.for_session()
+
+    def __build(self, scope, testcase):
+        if self.shared:
+            return exam.sharing.share(self, scope, partial(
+                self.__build_value, scope, testcase), self.owner(testcase))
+
+        return self.__build_value(scope, testcase)
+
+    def __build_value(self, scope, testcase):
+        application = exam.timing.call('fixture', self.thing, self.apply,
+                                       testcase)
+        return exam.scopes.setup_value(scope, application)
+
+    def __take_snapshot(self, testcase):
+        value = self.__build(self.__scope_for(testcase), testcase)
+        return exam.snapshots.take(value, self.snapshot)
+
+    def apply(self, testcase):
+        """
+        Builds a fresh value of this fixture for ``testcase``.  For async
+        fixtures that is a coroutine or async generator still to be awaited.
+        Persisted fixtures load the value cached by an earlier run, if any.
+        """
+        build = partial(self.__apply(testcase), *self.args, **self.kwargs)
+
+        if self.persist:
+            return exam.persistence.cached(self, build, self.owner(testcase))
+
+        return build()
+
+    def owner(self, testcase):
+        """
+        Returns the class of ``testcase`` if this fixture's value may differ
+        between test case classes, or else ``None``.  It may when building
+        it gets to see the test case, unless its scope shares one value
+        between classes anyway.
+        """
+        if testcase is None or self.scope in ('module', 'session') or \
+                not self.__takes_testcase():
+            return None
+
+        return type(testcase)
+
+    def __takes_testcase(self):
         # If self.thing is a method type, it means that the function is already
         # bound to a class and therefore we should treat it just like a normal
         # functuion and return it.
-        if type(self.thing) in (type, types.MethodType):
+        return type(self.thing) not in (type, types.MethodType)
+
+    def __apply(self, testcase):
+        if not self.__takes_testcase():
             return self.thing
         # If not, it means that's it's a vanilla function,
         # so either a decorated instance method in the test case
@@ -42,6 +180,85 @@ class fixture(object):
             return partial(self.thing, testcase)
 
 
+def uses(*names):
+    """
+    Marks a test method as using the fixtures called ``names``, which Exam
+    then builds (along with what they depend on) before the test's
+    ``@before`` hooks run, instead of the class's eager fixtures.
+    """
+    def decorate(test):
+        test.exam_uses = names
+        return test
+
+    return decorate
+
+
+def parametrize(*rows):
+    """
+    Runs a test method once for each of ``rows`` under one setup: the test's
+    hooks run once, and each row is reported as a subtest.  A row is a tuple
+    of positional arguments, a dict of keyword arguments or a single
+    argument.  See :func:`exam.cases.run_rows`.
+    """
+    def decorate(test):
+        if is_async(test):
+            raise ValueError('Async tests can not be parametrized: %s' %
+                             test.__name__)
+
+        @wraps(test)
+        def run_rows(testcase):
+            exam.cases.run_rows(testcase, test, rows)
+
+        return run_rows
+
+    return decorate
+
+
+def benchmark(test=None, **options):
+    """
+    Marks a test method as a benchmark: once the test's hooks have run, its
+    body is run many times over and timed against a stored baseline.  See
+    :mod:`exam.benchmarking`.  Can be used bare, ``@benchmark``, or with
+    options, ``@benchmark(threshold=0.5)``:
+
+    ``threshold``
+        How much slower than the baseline, as a fraction of it, the median
+        run may get before the test fails.  ``0.2`` by default.
+    ``samples``
+        How many samples, each of a calibrated number of runs, to take.
+    ``min_time``
+        The least time in seconds a sample should last, which sets how many
+        runs one sample is.
+    ``baselines``
+        The JSON file baselines are kept in, relative to the test's module
+        unless absolute.  ``benchmarks.json`` by default.
+    """
+    unknown = set(options) - set(BENCHMARK_OPTIONS)
+    if unknown:
+        raise TypeError('Unknown benchmark options: %s' %
+                        ', '.join(sorted(unknown)))
+
+    settings = dict(BENCHMARK_OPTIONS, **options)
+
+    def decorate(test):
+        if is_async(test):
+            raise ValueError('Async tests can not be benchmarked: %s' %
+                             test.__name__)
+
+        @wraps(test)
+        def run_benchmark(testcase):
+            exam.benchmarking.check(testcase, partial(test, testcase),
+                                    settings)
+
+        return run_benchmark
+
+    return decorate(test) if test is not None else decorate
+
+
+BENCHMARK_OPTIONS = {'threshold': 0.2, 'samples': 20, 'min_time': 0.01,
+                     'baselines': 'benchmarks.json'}
+
+
 class base(object):
 
     def __init__(self, *things):
@@ -53,7 +270,20 @@ class base(object):
 
 class before(base):
 
+    def __init__(self, *things, **options):
+        super(before, self).__init__(*things)
+        self.concurrent = options.pop('concurrent', False)
+
+        if options:
+            raise TypeError('Unknown before options: %s' %
+                            ', '.join(sorted(options)))
+
     def __call__(self, thing):
+        # Constructed with just options, i.e. ``@before(concurrent=True)``,
+        # and now decorating the hook itself.
+        if not self.init_callables:
+            self.init_callables = (thing,)
+            return self
         # There a couple possible situations at this point:
         #
         # If ``thing`` is an instance of a test case, this means that we
@@ -88,11 +318,26 @@ class around(base):
 
 class patcher(object):
 
+    SCOPES = ('function', 'class')
+    RESETS = ('all', 'calls', None)
+
+    #: Keyword arguments consumed by ``mock.patch`` itself. All others are
+    #: used to configure the mock object the patch creates.
+    PATCH_OPTIONS = ('new', 'spec', 'create', 'spec_set', 'autospec',
+                     'new_callable')
+
     def __init__(self, *args, **kwargs):
+        self.scope = kwargs.pop('scope', 'function')
+        self.reset = kwargs.pop('reset', 'all')
         self.args = args
         self.kwargs = kwargs
         self.func = None
-        self.patch_func = patch
+        self.patch_func = exam.patching.build_patch
+
+        if self.scope not in self.SCOPES:
+            raise ValueError('Unknown patcher scope: %r' % (self.scope,))
+        elif self.reset not in self.RESETS:
+            raise ValueError('Unknown patcher reset: %r' % (self.reset,))
 
     def __call__(self, func):
         self.func = func
@@ -104,8 +349,120 @@ class patcher(object):
 
         return self.patch_func(*self.args, **self.kwargs)
 
+    def start(self, instance):
+        """
+        Starts the patch for the test case ``instance`` and returns the
+        patched in object.  Function scoped patches are stopped by the test
+        case's cleanups.  Class scoped patches are started for the first test
+        of the class and stopped when the class is done.  Every test after
+        that gets the same object back, reset as per ``reset``.
+        """
+        if self.scope == 'function':
+            patch_object, started = self.__build_and_start(instance)
+            instance.addCleanup(patch_object.stop)
+            return started
+
+        scope = exam.scopes.for_class(type(instance))
+        first_use = self not in scope.values
+        started, config = scope.get(self, partial(self.__start, scope,
+                                                  instance))
+
+        if not first_use:
+            exam.timing.call('patch reset', self.target_name(),
+                             self.reset_mock, started, config)
+
+        return started
+
+    def __build_and_start(self, instance):
+        name = self.target_name()
+        patch_object = exam.timing.call('patch build', name,
+                                        self.build_patch, instance)
+        started = exam.timing.call('patch start', name, patch_object.start)
+        return patch_object, started
+
+    def __start(self, scope, instance):
+        patch_object, started = self.__build_and_start(instance)
+        scope.add_finalizer(patch_object.stop)
+
+        return started, self.mock_config(started)
+
+    def mock_config(self, started, current=False):
+        """
+        Returns the configuration :meth:`reset_mock` applies to ``started``
+        again once it has been reset: the options the patch was given, along
+        with the return value and side effect the decorated function or
+        ``autospec`` gave it.  With ``current``, the return value and side
+        effect it has now are kept instead, however they were set.
+        """
+        config = dict((key, value) for key, value in self.kwargs.items()
+                      if key not in self.PATCH_OPTIONS)
+
+        # Mocks built by the decorated function are configured by it, and
+        # autospecced classes return a specced instance, so remember those in
+        # order to configure them the same way after resets.
+        if not hasattr(started, 'reset_mock') or not (
+                current or self.func or self.kwargs.get('autospec')):
+            return config
+        elif not hasattr(started, 'configure_mock'):
+            # Autospecced functions keep them as plain attributes.
+            config['return_value'] = started.return_value
+            config['side_effect'] = started.side_effect
+            return config
+
+        # Asking a mock for its return_value would make one up.
+        returned = vars(started).get('_mock_return_value', DEFAULT) if \
+            isinstance(started, NonCallableMock) else started.return_value
+        if returned is not DEFAULT:
+            config['return_value'] = returned
+        if getattr(started, 'side_effect', None) is not None:
+            config['side_effect'] = started.side_effect
+
+        return config
+
+    def reset_mock(self, started, config):
+        """
+        Resets a class scoped patch's object between tests.  With ``reset``
+        set to ``'all'``, the return values and side effects tests have set
+        on it are thrown away, and the configuration it was started with is
+        applied again.  Mocks that configuration returns, like the instances
+        of autospecced classes, are kept, but forget their calls along with
+        the return values and side effects tests have set on them.  With
+        ``'calls'``, only the calls it recorded are forgotten, and with
+        ``None`` it is left alone.
+        """
+        if self.reset is None or not hasattr(started, 'reset_mock'):
+            return
+        elif self.reset == 'calls':
+            started.reset_mock()
+            return
+        elif not hasattr(started, 'configure_mock'):
+            # Autospecced functions, whose reset_mock takes no options and
+            # leaves their return value and side effect alone.
+            started.reset_mock()
+            for name, value in config.items():
+                setattr(started, name, value)
+        else:
+            started.reset_mock(return_value=True, side_effect=True)
+            started.configure_mock(**config)
+
+        # Mocks only reset the calls of the mock they return, and the return
+        # values set on its children would leak into the next test.
+        returned = config.get('return_value')
+        if isinstance(returned, NonCallableMock) or \
+                isinstance(returned, exam.mock.Stub):
+            returned.reset_mock(return_value=True, side_effect=True)
+
+    def target_name(self):
+        """
+        Returns the dotted name of what this patcher patches.
+        """
+        if self.patch_func is exam.patching.build_patch_object:
+            return '%s.%s' % (name_of(self.args[0]), self.args[1])
+
+        return self.args[0]
+
     @classmethod
     def object(cls, *args, **kwargs):
         instance = cls(*args, **kwargs)
-        instance.patch_func = patch.object
+        instance.patch_func = exam.patching.build_patch_object
         return instance
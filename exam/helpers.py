@@ -4,6 +4,8 @@ import shutil
 import os
 import functools
 
+import exam.mock
+
 from mock import MagicMock, patch, call
 
 
@@ -20,7 +22,11 @@ def track(**mocks):
     tracker = MagicMock()
 
     for name, mocker in mocks.items():
-        tracker.attach_mock(mocker, name)
+        if isinstance(mocker, exam.mock.Stub):
+            mocker.track(tracker, name)
+            setattr(tracker, name, mocker)
+        else:
+            tracker.attach_mock(mocker, name)
 
     return tracker
 
@@ -76,8 +82,9 @@ class mock_import(patch.dict):
 
     FROM_X_GET_Y = lambda s, x, y: getattr(x, y)
 
-    def __init__(self, path):
-        self.mock = MagicMock()
+    def __init__(self, path, new=None):
+        self.mock = MagicMock() if new is None or self.remainder_of(path) \
+            else new
         self.path = path
         self.modules = {self.base: self.mock}
 
@@ -88,6 +95,13 @@ class mock_import(patch.dict):
                                          tail_parts, self.mock)
             self.modules[key] = reduction
 
+        if new is not None and self.remainder:
+            # Hang the module given in place of the innermost one off its
+            # parent mock, so it is found both ways it can be imported.
+            parent = self.modules[self.path.rsplit('.', 1)[0]]
+            setattr(parent, self.remainder[-1], new)
+            self.modules[self.path] = new
+
         super(mock_import, self).__init__('sys.modules', self.modules)
 
     @property
@@ -96,7 +110,11 @@ class mock_import(patch.dict):
 
     @property
     def remainder(self):
-        return self.path.split('.')[1:]
+        return self.remainder_of(self.path)
+
+    @staticmethod
+    def remainder_of(path):
+        return path.split('.')[1:]
 
     def __enter__(self):
         super(mock_import, self).__enter__()
@@ -141,22 +159,149 @@ class effect(list):
 
         class myeffect(effect):
             call_class = my_call_class
+
+    Configured with lots of calls, checking each one of them in turn gets
+    slow.  Pass ``indexed=True`` to look calls up in a hash table instead:
+
+    >>> side_effect = effect(*recorded_calls, indexed=True)
+
+    Only calls made up of plain values (numbers, strings, ``None``, objects
+    that compare by identity, and tuples and frozensets of those) are put in
+    the table.  Calls with anything else, like ``mock.ANY`` or a list, are
+    still checked one by one, in order, so the first configured call that
+    matches always wins.
     """
 
     call_class = call
 
-    def __init__(self, *calls):
+    def __init__(self, *calls, **options):
         """
         :param calls: Two-item tuple containing call and the return value.
         :type calls: :class:`effect.call_class`
+        :param indexed: Look calls up in a hash table.
+        :type indexed: :class:`bool`
         """
+        self.indexed = options.pop('indexed', False)
+        self.index = None
+
+        if options:
+            raise TypeError('Unexpected options: %r' % sorted(options))
+
         super(effect, self).__init__(calls)
 
     def __call__(self, *args, **kwargs):
         this_call = self.call_class(*args, **kwargs)
 
-        for call_obj, return_value in self:
+        if self.indexed and self.call_class is call:
+            candidates = self.__indexed_candidates(args, kwargs)
+        else:
+            candidates = self
+
+        for call_obj, return_value in candidates:
             if call_obj == this_call:
                 return return_value
 
         raise TypeError('Unknown effect for: %r, %r' % (args, kwargs))
+
+    def __indexed_candidates(self, args, kwargs):
+        if self.index is None:
+            self.index = EffectIndex(self)
+
+        return self.index.candidates(args, kwargs)
+
+
+class EffectIndex(object):
+    """
+    Hash table of the calls an :class:`effect` is configured with, keyed by
+    their arguments with :func:`call_key`.  Calls that cannot be keyed are
+    kept in order in ``scanned``.
+    """
+
+    def __init__(self, configuration):
+        self.configuration = configuration
+        self.keyed = {}
+        self.scanned = []
+
+        for position, (call_obj, return_value) in enumerate(configuration):
+            key = self.key_of_call(call_obj)
+
+            if key is None:
+                self.scanned.append((position, (call_obj, return_value)))
+            elif key not in self.keyed:
+                self.keyed[key] = position
+
+    def candidates(self, args, kwargs):
+        """
+        Returns the configured ``(call, return_value)`` tuples that may match
+        a call with ``args`` and ``kwargs``, in configuration order.
+        """
+        key = call_key(args, kwargs)
+
+        if key is None:
+            return self.configuration
+
+        found = self.keyed.get(key)
+        candidates = [entry for position, entry in self.scanned
+                      if found is None or position < found]
+
+        if found is not None:
+            candidates.append(self.configuration[found])
+
+        return candidates
+
+    def key_of_call(self, call_obj):
+        if not isinstance(call_obj, tuple) or len(call_obj) != 3 or \
+                call_obj[0]:
+            return None
+
+        return call_key(call_obj[1], call_obj[2])
+
+
+_PLAIN_TYPES = frozenset([int, float, complex, bool, str, bytes, type(None),
+                          type(u''), type(2 ** 64)])
+
+
+def _is_plain(value):
+    kind = type(value)
+
+    if kind in _PLAIN_TYPES:
+        return True
+    elif kind in (tuple, frozenset):
+        return all(map(_is_plain, value))
+    else:
+        return getattr(kind, '__eq__', None) is object.__eq__ and \
+            getattr(kind, '__hash__', None) is object.__hash__
+
+
+def call_key(args, kwargs):
+    """
+    Returns a hashable key for a call with ``args`` and ``kwargs``, such that
+    two calls with keys are equal exactly when their keys are.  That only
+    holds when every argument is a plain value (numbers, strings, ``None``,
+    objects that compare by identity, and tuples and frozensets of those),
+    so for any other call ``None`` is returned.
+    """
+    if not all(map(_is_plain, args)) or \
+            not all(map(_is_plain, kwargs.values())):
+        return None
+
+    return tuple(args), frozenset(kwargs.items())
+
+
+def _forgets_index(method):
+    @functools.wraps(method)
+    def inner(self, *args, **kwargs):
+        self.index = None
+        return method(self, *args, **kwargs)
+
+    return inner
+
+
+# Any change to the configuration of an effect invalidates its index.
+for _name in ('__setitem__', '__delitem__', '__iadd__', '__imul__',
+              '__setslice__', '__delslice__', 'append', 'extend', 'insert',
+              'pop', 'remove', 'clear', 'sort', 'reverse'):
+    if hasattr(list, _name):
+        setattr(effect, _name, _forgets_index(getattr(list, _name)))
+
+del _name
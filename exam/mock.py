@@ -1,10 +1,110 @@
 from __future__ import absolute_import
 
 from mock import Mock as BaseMock
-from mock import call
+from mock import call, DEFAULT
+
+import exam.helpers
+
+
+class RecordingPolicyError(Exception):
+    """
+    Raised when asking a :class:`Mock` about calls its recording policy did
+    not keep.
+    """
 
 
 class Mock(BaseMock):
+    """
+    ``mock.Mock`` with a few more assertions.
+
+    Pass ``index_calls=True`` to have the mock count the calls it receives by
+    their arguments as they come in, which makes ``assert_not_any_call`` and
+    ``assert_not_called_once_with`` a lookup instead of a search through
+    every recorded call.
+
+    The ``record`` keyword sets how much call history the mock keeps:
+
+    * ``'all'`` - Every call, like ``mock.Mock`` does.  The default.
+    * an ``int`` - Only that many of the most recent calls.
+    * ``'counts'`` - No calls at all, only how many times the mock was
+      called with each set of arguments.  Implies ``index_calls=True``.
+
+    ``call_args``, ``call_count`` and ``called`` are always kept.  Assertions
+    that need calls the mock did not keep raise :class:`RecordingPolicyError`.
+    """
+
+    _exam_call_index = None
+    _exam_record = 'all'
+    _exam_dropped_calls = 0
+    _exam_dropped_mock_calls = 0
+
+    def __init__(self, *args, **kwargs):
+        index_calls = kwargs.pop('index_calls', False)
+        record = kwargs.pop('record', 'all')
+        super(Mock, self).__init__(*args, **kwargs)
+        self.__set_policy(record, index_calls)
+
+    def __set_policy(self, record, index_calls=False):
+        if record not in ('all', 'counts') and not (
+                isinstance(record, int) and not isinstance(record, bool) and
+                record >= 0):
+            raise ValueError('Unknown recording policy: %r' % (record,))
+
+        self.__dict__['_exam_record'] = record
+        self.__dict__['_exam_call_index'] = CallIndex() if (
+            index_calls or record == 'counts') else None
+
+    def _get_child_mock(self, **kwargs):
+        # Children may be other kinds of mocks, like the AsyncMock of an
+        # async method of a spec, which would take the policy for an
+        # attribute to configure.
+        child = super(Mock, self)._get_child_mock(**kwargs)
+
+        if isinstance(child, Mock):
+            child.__set_policy(self._exam_record)
+
+        return child
+
+    def __call__(self, *args, **kwargs):
+        count_before = self.call_count
+
+        try:
+            return super(Mock, self).__call__(*args, **kwargs)
+        finally:
+            # Only calls mock recorded count, not ones rejected outright for
+            # not matching a spec's signature.
+            if self.call_count != count_before:
+                self.__recorded(args, kwargs)
+
+    def __recorded(self, args, kwargs):
+        if self._exam_call_index is not None:
+            self._exam_call_index.add(args, kwargs)
+
+        if self._exam_record == 'all':
+            return
+
+        keep = 0 if self._exam_record == 'counts' else self._exam_record
+        dropped = _truncate(self.call_args_list, keep)
+        self.__dict__['_exam_dropped_calls'] = \
+            self._exam_dropped_calls + dropped
+
+        # Calls are also recorded by every mock up the chain of parents,
+        # which may not be exam mocks.
+        parent = self
+        while parent is not None:
+            dropped = _truncate(parent.mock_calls, keep)
+            _truncate(parent.method_calls, keep)
+            parent.__dict__['_exam_dropped_mock_calls'] = \
+                parent.__dict__.get('_exam_dropped_mock_calls', 0) + dropped
+            parent = parent._mock_new_parent
+
+    def reset_mock(self, *args, **kwargs):
+        super(Mock, self).reset_mock(*args, **kwargs)
+        self.__dict__['_exam_dropped_calls'] = 0
+        self.__dict__['_exam_dropped_mock_calls'] = 0
+
+        if self._exam_call_index is not None:
+            self._exam_call_index.clear()
 
     def assert_called(self):
         assert self.called
@@ -16,11 +116,215 @@ class Mock(BaseMock):
         assert not call(*args, **kwargs) == self.call_args
 
     def assert_not_called_once_with(self, *args, **kwargs):
-        assert len(self.__calls_matching(*args, **kwargs)) is not 1
+        assert self.__count_calls(args, kwargs, up_to=2) != 1
 
     def assert_not_any_call(self, *args, **kwargs):
-        assert len(self.__calls_matching(*args, **kwargs)) is 0
+        assert self.__count_calls(args, kwargs, up_to=1) == 0
+
+    def assert_any_call(self, *args, **kwargs):
+        if self._exam_dropped_calls:
+            assert self.__count_calls(args, kwargs, up_to=1) == 1, \
+                'Call not found: %r' % (call(*args, **kwargs),)
+        else:
+            super(Mock, self).assert_any_call(*args, **kwargs)
+
+    def assert_has_calls(self, *args, **kwargs):
+        # Looks through mock_calls, which also holds calls to children.
+        if self._exam_dropped_mock_calls:
+            self.__history_unavailable('assert_has_calls')
+
+        super(Mock, self).assert_has_calls(*args, **kwargs)
+
+    def __count_calls(self, args, kwargs, up_to):
+        """
+        Counts the calls made with ``args`` and ``kwargs``, but stops
+        counting once ``up_to`` of them have been found.
+        """
+        index = self._exam_call_index
+
+        if index is not None:
+            key = exam.helpers.call_key(args, kwargs)
+
+            if key is not None:
+                return index.count(key, call(*args, **kwargs), up_to)
+
+        if self._exam_dropped_calls:
+            self.__history_unavailable('Looking up this call')
+
+        return _count_matching(call(*args, **kwargs), self.call_args_list,
+                               up_to)
+
+    def __history_unavailable(self, what):
+        raise RecordingPolicyError(
+            '%s needs call history %r dropped because of its recording '
+            'policy %r' % (what, self, self._exam_record))
+
+
+def _truncate(calls, keep):
+    """
+    Drops all but the last ``keep`` calls from the list ``calls``, and
+    returns how many were dropped.
+    """
+    dropped = max(len(calls) - keep, 0)
+
+    if dropped:
+        del calls[:dropped]
+
+    return dropped
+
+
+class CallIndex(object):
+    """
+    Counts calls by the :func:`exam.helpers.call_key` of their arguments.
+    Calls that have no key are kept in ``unkeyed`` instead.
+    """
+
+    def __init__(self):
+        self.clear()
+
+    def clear(self):
+        self.counts = {}
+        self.unkeyed = []
+
+    def add(self, args, kwargs):
+        key = exam.helpers.call_key(args, kwargs)
+
+        if key is None:
+            self.unkeyed.append(call(*args, **kwargs))
+        else:
+            self.counts[key] = self.counts.get(key, 0) + 1
+
+    def count(self, key, expected, up_to):
+        found = min(self.counts.get(key, 0), up_to)
+        return found + _count_matching(expected, self.unkeyed, up_to - found)
+
+
+def _count_matching(expected, calls, up_to):
+    found = 0
+
+    for other_call in calls:
+        if found >= up_to:
+            break
+        elif expected == other_call:
+            found += 1
+
+    return found
+
+
+class Stub(object):
+    """
+    A callable test double that is much cheaper to call than a ``Mock``.
+
+    A stub has a fixed set of attributes: it returns ``return_value`` (or
+    whatever ``side_effect`` says, with the same meaning as for a ``Mock``)
+    and records the arguments of each call as a plain ``(args, kwargs)``
+    tuple in ``calls``.  Unlike a ``Mock`` it never makes up attributes, so
+    accessing anything else raises ``AttributeError``.
+    """
+
+    __slots__ = ('return_value', '_side_effect', 'call_count', 'calls',
+                 'name', '_tracker')
+
+    def __init__(self, return_value=None, side_effect=None, name=None):
+        self.return_value = return_value
+        self.side_effect = side_effect
+        self.name = name
+        self.call_count = 0
+        self.calls = []
+        self._tracker = None
+
+    def __call__(self, *args, **kwargs):
+        self.call_count += 1
+        self.calls.append((args, kwargs))
+
+        if self._tracker is not None:
+            self._tracker.mock_calls.append(
+                getattr(call, self.name)(*args, **kwargs))
+
+        effect = self._side_effect
+        if effect is None:
+            return self.return_value
+        elif isinstance(effect, BaseException) or (
+                isinstance(effect, type) and
+                issubclass(effect, BaseException)):
+            raise effect
+        elif callable(effect):
+            result = effect(*args, **kwargs)
+            return self.return_value if result is DEFAULT else result
+
+        result = next(effect)
+        if isinstance(result, BaseException) or (
+                isinstance(result, type) and
+                issubclass(result, BaseException)):
+            raise result
+        return result
+
+    def __repr__(self):
+        return '<Stub %s>' % (self.name or id(self),)
+
+    @property
+    def side_effect(self):
+        return self._side_effect
+
+    @side_effect.setter
+    def side_effect(self, effect):
+        if effect is not None and not callable(effect) and \
+                not isinstance(effect, BaseException):
+            effect = iter(effect)
+
+        self._side_effect = effect
+
+    @property
+    def called(self):
+        return self.call_count > 0
+
+    @property
+    def call_args(self):
+        return call(*self.calls[-1][0], **self.calls[-1][1]) \
+            if self.calls else None
+
+    @property
+    def call_args_list(self):
+        return [call(*args, **kwargs) for args, kwargs in self.calls]
+
+    def track(self, tracker, name):
+        """
+        Records calls to this stub as ``name`` calls in ``tracker``'s
+        ``mock_calls``, the way ``Mock.attach_mock`` does for mocks.
+        """
+        self.name = name
+        self._tracker = tracker
+
+    def configure_mock(self, **attributes):
+        for name, value in attributes.items():
+            setattr(self, name, value)
+
+    def reset_mock(self, return_value=False, side_effect=False):
+        self.call_count = 0
+        self.calls = []
+
+        if return_value:
+            self.return_value = None
+        if side_effect:
+            self.side_effect = None
+
+    def assert_called(self):
+        assert self.called, '%r was not called' % (self,)
+
+    def assert_not_called(self):
+        assert not self.called, '%r was called %d times' % (
+            self, self.call_count)
+
+    def assert_called_with(self, *args, **kwargs):
+        assert self.calls and self.calls[-1] == (args, kwargs), \
+            'Expected %r, last called with %r' % (
+                call(*args, **kwargs), self.call_args)
+
+    def assert_called_once_with(self, *args, **kwargs):
+        assert self.call_count == 1, '%r was called %d times' % (
+            self, self.call_count)
+        self.assert_called_with(*args, **kwargs)
 
-    def __calls_matching(self, *args, **kwargs):
-        calls_match = lambda other_call: call(*args, **kwargs) == other_call
-        return list(filter(calls_match, self.call_args_list))
+    def assert_any_call(self, *args, **kwargs):
+        assert (args, kwargs) in self.calls, 'Call not found: %r' % (
+            call(*args, **kwargs),)
@@ -1,7 +1,17 @@
 from __future__ import absolute_import
 
+import inspect
+
 
 def always(value):
     return lambda *a, **k: value
 
 noop = no_op = always(None)
+
+
+def is_async(func):
+    """
+    Whether calling ``func`` gives a coroutine or an async generator.
+    """
+    return any(getattr(inspect, check, always(False))(func) for check in
+               ('iscoroutinefunction', 'isasyncgenfunction'))
@@ -0,0 +1,178 @@
+"""
+Orders tests so setup shared by several of them is built as few times as
+possible.  unittest runs ``setUpClass`` and ``setUpModule`` again every time
+the class or module of the next test differs from the last one's, and Exam
+builds class and module scoped fixtures and patchers again along with them.
+Which classes and modules have such setup is read off their hook plans::
+
+    tests, saved = exam.ordering.reorder(suite)
+    unittest.TextTestRunner().run(unittest.TestSuite(tests))
+
+The ``exam`` command does this with ``--reorder``.  Orders are
+deterministic: modules, classes and tests keep the order they were first
+found in, only grouped together.
+
+Suites straight from ``unittest.TestLoader`` are grouped like this already;
+what reordering fixes are suites put together some other way, such as from
+several loaders or test names, or interleaved by a plugin.  Classes are not
+grouped any finer, for example by what they patch: class scoped fixtures and
+patchers belong to a single class, so no order of classes builds them fewer
+times, and module setup is already built once per unit.
+"""
+from __future__ import absolute_import
+
+import sys
+import unittest
+
+from exam.cases import Exam, hook_plan
+
+
+def iter_tests(suite):
+    """
+    Yields every test case in ``suite``, however deeply nested.
+    """
+    for test in suite:
+        if isinstance(test, unittest.TestSuite):
+            for inner in iter_tests(test):
+                yield inner
+        else:
+            yield test
+
+
+def has_class_setup(cls):
+    """
+    Whether ``cls`` sets something up once for all of its tests: in its own
+    ``setUpClass``, or in class scoped fixtures or patchers.
+    """
+    plain = getattr(unittest.TestCase.setUpClass, '__func__', None)
+    if getattr(cls.setUpClass, '__func__', None) is not plain:
+        return True
+
+    return _scoped(cls, 'class')
+
+
+def has_module_setup(name, classes):
+    """
+    Whether the module ``name``, with test case classes ``classes``, sets
+    something up once for all of its tests: in ``setUpModule``, or in module
+    scoped fixtures.
+    """
+    module = sys.modules.get(name)
+    if getattr(module, 'setUpModule', None) is not None:
+        return True
+
+    return any(_scoped(cls, 'module') for cls in classes)
+
+
+def _scoped(cls, scope):
+    if not issubclass(cls, Exam):
+        return False
+
+    plan = hook_plan(cls)
+    return any(getattr(value, 'scope', None) == scope
+               for _, value in plan.fixtures + plan.patchers)
+
+
+class Setups(object):
+    """
+    Remembers which classes and modules have setup of their own, as that is
+    asked about every test.
+    """
+
+    def __init__(self, tests):
+        self.classes = {}
+        self.modules = {}
+
+        by_module = {}
+        for test in tests:
+            cls = type(test)
+            by_module.setdefault(cls.__module__, set()).add(cls)
+
+            if cls not in self.classes:
+                self.classes[cls] = has_class_setup(cls)
+
+        for name, classes in by_module.items():
+            self.modules[name] = has_module_setup(name, classes)
+
+    def count(self, units):
+        """
+        Returns how many times running ``units``, each a sequence of tests
+        run as one suite, sets up classes and modules, as a ``(classes,
+        modules)`` tuple.
+        """
+        classes = modules = 0
+
+        for unit in units:
+            last_class = last_module = None
+
+            for test in unit:
+                cls = type(test)
+                if cls is not last_class and self.classes[cls]:
+                    classes += 1
+                if cls.__module__ != last_module and \
+                        self.modules[cls.__module__]:
+                    modules += 1
+                last_class, last_module = cls, cls.__module__
+
+        return classes, modules
+
+
+def _grouped(tests):
+    """
+    Returns ``tests`` as ``[(module, [(class, [test, ...]), ...]), ...]``,
+    in the order each was first found.
+    """
+    modules = []
+    found = {}
+
+    for test in tests:
+        cls = type(test)
+
+        if cls.__module__ not in found:
+            found[cls.__module__] = ({}, [])
+            modules.append((cls.__module__, found[cls.__module__][1]))
+        class_tests, classes = found[cls.__module__]
+
+        if cls not in class_tests:
+            class_tests[cls] = []
+            classes.append((cls, class_tests[cls]))
+        class_tests[cls].append(test)
+
+    return modules
+
+
+def reorder(suite):
+    """
+    Returns the tests of ``suite`` grouped by module and then by class, along
+    with the ``(classes, modules)`` setups that saves over running them as
+    they were.
+    """
+    tests = list(iter_tests(suite))
+    setups = Setups(tests)
+    ordered = [test for _, classes in _grouped(tests)
+               for _, class_tests in classes for test in class_tests]
+
+    before = setups.count([tests])
+    after = setups.count([ordered])
+    return ordered, (before[0] - after[0], before[1] - after[1])
+
+
+def group_units(suite):
+    """
+    Splits the tests of ``suite`` into units for workers to run whole: one
+    per test case class, except that modules with setup of their own are
+    kept in one unit, so their setup is not built again by every worker that
+    runs one of their classes.  Returns the units and their :class:`Setups`.
+    """
+    tests = list(iter_tests(suite))
+    setups = Setups(tests)
+    units = []
+
+    for name, classes in _grouped(tests):
+        if setups.modules[name]:
+            units.append([test for _, class_tests in classes
+                          for test in class_tests])
+        else:
+            units.extend(class_tests for _, class_tests in classes)
+
+    return units, setups
@@ -0,0 +1,216 @@
+from __future__ import absolute_import
+
+from mock import patch, create_autospec, NonCallableMock
+import importlib
+import sys
+import threading
+
+
+_modules = {}
+
+
+def resolve(target):
+    """
+    Resolves the dotted ``target`` of a patch (i.e. ``'package.module.attr'``)
+    into the object owning the patched attribute and the attribute's name,
+    just like ``mock.patch`` does when it starts.
+
+    The module part of ``target`` is only imported the first time; after that
+    it is looked up in a per process cache, which is checked against
+    ``sys.modules`` so modules that have been swapped out are imported again.
+    Attributes below the module are always looked up afresh, so patches
+    nested in other patches keep working.
+    """
+    try:
+        owner_path, attribute = target.rsplit('.', 1)
+    except (TypeError, ValueError, AttributeError):
+        raise TypeError('Need a valid target to patch. You supplied: %r' %
+                        (target,))
+
+    cached = _modules.get(owner_path)
+
+    if cached is None or sys.modules.get(cached[0].__name__) is not cached[0]:
+        cached = _modules[owner_path] = _import_module_of(owner_path)
+
+    owner, remainder = cached
+    for name in remainder:
+        owner = getattr(owner, name)
+
+    return owner, attribute
+
+
+def _import_module_of(path):
+    parts = path.split('.')
+
+    for end in range(len(parts), 0, -1):
+        try:
+            module = importlib.import_module('.'.join(parts[:end]))
+        except ImportError:
+            if end == 1:
+                raise
+        else:
+            return module, tuple(parts[end:])
+
+
+class AutospecPool(object):
+    """
+    Keeps the mocks ``create_autospec`` builds, so patches that autospec the
+    same object with the same options do not have to introspect it again.
+
+    A mock is checked out for the duration of a patch and checked back in
+    when the patch stops.  Before being handed out again it is reset: calls
+    are forgotten, and every return value, side effect, child and attribute
+    that was changed while it was checked out is put back the way
+    ``create_autospec`` left it.  A patch never gets a mock another active
+    patch is using; when none is free a new one is built.
+    """
+
+    def __init__(self):
+        self.free = {}
+        self.lock = threading.Lock()
+
+    def checkout(self, original, spec_set, name, kwargs):
+        key = (id(original), spec_set, name,
+               tuple(sorted(kwargs.items())))
+
+        with self.lock:
+            free = self.free.get(key)
+            template = free.pop() if free else None
+
+        if template is None:
+            mock_object = create_autospec(original, spec_set=spec_set,
+                                          _name=name, **kwargs)
+            template = Template(key, original, mock_object)
+        else:
+            template.restore()
+
+        return template
+
+    def checkin(self, template):
+        with self.lock:
+            self.free.setdefault(template.key, []).append(template)
+
+
+#: The per process pool ``patcher`` takes autospecced mocks from.
+autospec_pool = AutospecPool()
+
+
+class Template(object):
+    """
+    An autospecced mock along with a snapshot of its pristine state.
+    """
+
+    def __init__(self, key, original, mock_object):
+        self.key = key
+        # Keeps ``original`` alive, so its id in ``key`` cannot be reused.
+        self.original = original
+        self.mock = mock_object
+        self.snapshot = [(node, dict(vars(node)), _children_of(node))
+                         for node in _nodes(mock_object)]
+
+    def restore(self):
+        for node, attributes, children in self.snapshot:
+            vars(node).clear()
+            vars(node).update(attributes)
+
+            if children is not None:
+                node._mock_children.clear()
+                node._mock_children.update(children)
+
+        self.mock.reset_mock()
+
+
+def _children_of(node):
+    children = getattr(node, '_mock_children', None)
+    return dict(children) if isinstance(children, dict) else None
+
+
+def _nodes(root):
+    """
+    Yields every mock reachable from ``root`` through its children and return
+    values, including the function wrappers autospec builds for functions.
+    """
+    seen = set()
+    pending = [root]
+
+    while pending:
+        node = pending.pop()
+
+        if id(node) in seen:
+            continue
+
+        seen.add(id(node))
+        yield node
+
+        wrapped = getattr(node, 'mock', None) if not isinstance(
+            node, NonCallableMock) else None
+        if isinstance(wrapped, NonCallableMock):
+            pending.append(wrapped)
+
+        if isinstance(node, NonCallableMock):
+            returned = vars(node).get('_mock_return_value')
+            pending.extend(
+                value for value in list(node._mock_children.values()) +
+                [returned] if isinstance(value, NonCallableMock))
+
+
+class TemplatePatch(object):
+    """
+    Patches ``owner.attribute`` with a mock from :data:`autospec_pool` and
+    returns the mock to the pool when stopped.  Quacks like the patch objects
+    ``mock.patch`` returns, as far as ``patcher`` is concerned.
+    """
+
+    def __init__(self, owner, attribute, original, spec_set, kwargs):
+        self.template = autospec_pool.checkout(original, spec_set, attribute,
+                                               kwargs)
+        self.patch = patch.object(owner, attribute, new=self.template.mock)
+
+    def start(self):
+        return self.patch.start()
+
+    def stop(self):
+        try:
+            return self.patch.stop()
+        finally:
+            autospec_pool.checkin(self.template)
+
+
+def build_patch(target, *args, **kwargs):
+    """
+    Builds the patch ``mock.patch(target, *args, **kwargs)`` would, but with
+    the owner of ``target`` resolved through :func:`resolve`.
+    """
+    owner, attribute = resolve(target)
+    return build_patch_object(owner, attribute, *args, **kwargs)
+
+
+def build_patch_object(owner, attribute, *args, **kwargs):
+    """
+    Builds the patch ``mock.patch.object(owner, attribute, *args, **kwargs)``
+    would, but with autospecced mocks taken from :data:`autospec_pool`.
+    """
+    config = dict((key, value) for key, value in kwargs.items()
+                  if key not in ('autospec', 'spec_set'))
+    original = getattr(owner, '__dict__', {}).get(attribute)
+
+    if kwargs.get('autospec') is not True or args or original is None or \
+            set(config) & set(['new', 'spec', 'create', 'new_callable']) or \
+            isinstance(owner, NonCallableMock) or \
+            isinstance(original, NonCallableMock) or \
+            not _hashable(config):
+        # Let mock deal with (and complain about) everything out of the
+        # ordinary.
+        return patch.object(owner, attribute, *args, **kwargs)
+
+    return TemplatePatch(owner, attribute, original,
+                         bool(kwargs.get('spec_set')), config)
+
+
+def _hashable(config):
+    try:
+        hash(tuple(sorted(config.items())))
+    except TypeError:
+        return False
+    else:
+        return True
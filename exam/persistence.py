@@ -0,0 +1,257 @@
+"""
+Keeps the values of fixtures declared with ``persist=True`` in a cache
+directory between runs, so a fixture that is a pure function of its code,
+its arguments and its input files is only built when one of those changes::
+
+    corpus = fixture(parse_corpus, 'corpus.txt', persist=True,
+                     inputs=['corpus.txt'], scope='session')
+
+Values are pickled.  From Python 3.8 on, they are pickled with protocol 5,
+with large buffers (such as those of numpy arrays) kept out of band in the
+same file, and loaded from a copy-on-write memory map of it, which only
+reads what the tests touch.  The cache is pruned of entries not used for
+:data:`max_age` seconds, then of the least recently used entries until it
+is no larger than :data:`max_size` bytes.
+"""
+from __future__ import absolute_import
+
+import hashlib
+import inspect
+import marshal
+import mmap
+import os
+import pickle
+import struct
+import sys
+import tempfile
+import time
+import warnings
+
+from exam.timing import name_of
+
+
+#: Where values are cached.
+directory = os.environ.get('EXAM_CACHE_DIR', '.exam-cache')
+
+#: How large, in bytes, the cache may grow.
+max_size = int(os.environ.get('EXAM_CACHE_MAX_SIZE', 2 ** 30))
+
+#: How long, in seconds, an entry is kept without being used.
+max_age = 30 * 24 * 60 * 60
+
+MAGIC = b'EXAMPKL1'
+SUFFIX = '.pickle'
+
+# Where out-of-band buffers start in a cache file, so numpy and the like get
+# aligned memory.
+ALIGNMENT = 64
+
+# Out-of-band buffers need pickle protocol 5, added in Python 3.8.
+OUT_OF_BAND = getattr(pickle, 'PickleBuffer', None) is not None
+
+
+def source_of(thing):
+    """
+    Returns what stands for the code of ``thing`` in cache keys: its source
+    where it can be found, or else its byte code or name.
+    """
+    func = getattr(thing, '__func__', thing)
+
+    try:
+        return inspect.getsource(func).encode('utf-8')
+    except (IOError, OSError, TypeError):
+        code = getattr(func, '__code__', None)
+        if code is not None:
+            return marshal.dumps(code)
+        return name_of(func).encode('utf-8')
+
+
+def inputs_of(paths):
+    """
+    Returns what stands for the content of the input files ``paths`` in
+    cache keys.  Files are only told apart by their size and modification
+    time, as hashing a large corpus would cost much of what caching saves.
+    """
+    stats = []
+
+    for path in paths:
+        status = os.stat(path)
+        stats.append((os.path.abspath(path), status.st_size,
+                      getattr(status, 'st_mtime_ns', status.st_mtime)))
+
+    return repr(stats).encode('utf-8')
+
+
+def key_for(fixture, owner=None):
+    """
+    Returns the key the value of ``fixture`` is cached under.  ``owner`` is
+    the test case class the fixture is built for, when building it gets to
+    see the test case: what it reads off the test case may differ between
+    subclasses.
+    """
+    digest = hashlib.sha256()
+    digest.update(('%d.%d\0' % sys.version_info[:2]).encode('ascii'))
+    digest.update(source_of(fixture.thing))
+
+    if owner is not None:
+        digest.update(('\0%s.%s\0' % (owner.__module__, name_of(owner)))
+                      .encode('utf-8'))
+
+    try:
+        digest.update(pickle.dumps(
+            (fixture.args, sorted(fixture.kwargs.items())), 2))
+    except Exception:
+        digest.update(repr((fixture.args, sorted(fixture.kwargs.items())))
+                      .encode('utf-8'))
+
+    digest.update(inputs_of(fixture.inputs))
+    return digest.hexdigest()
+
+
+def path_for(key):
+    return os.path.join(directory, key + SUFFIX)
+
+
+def dump(value, path):
+    """
+    Pickles ``value`` to ``path``, as a header listing where its out-of-band
+    buffers are, the pickle itself and then each buffer, aligned.  The file
+    is written aside and moved into place, so readers never see half of it.
+    """
+    buffers = []
+
+    if OUT_OF_BAND:
+        data = pickle.dumps(value, 5, buffer_callback=buffers.append)
+        buffers = [buffer.raw() for buffer in buffers]
+    else:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+
+    header_size = len(MAGIC) + 8 * (2 + 2 * len(buffers))
+    offset = header_size + len(data)
+    spans = []
+
+    for buffer in buffers:
+        offset += -offset % ALIGNMENT
+        spans.append((offset, buffer.nbytes))
+        offset += buffer.nbytes
+
+    handle, temporary = tempfile.mkstemp(dir=directory, suffix='.tmp')
+    try:
+        with os.fdopen(handle, 'wb') as cache_file:
+            cache_file.write(MAGIC)
+            cache_file.write(struct.pack('<QQ', len(data), len(buffers)))
+            for span in spans:
+                cache_file.write(struct.pack('<QQ', *span))
+            cache_file.write(data)
+
+            for (start, _), buffer in zip(spans, buffers):
+                cache_file.write(b'\0' * (start - cache_file.tell()))
+                cache_file.write(buffer)
+
+        # Python 2 has no os.replace, nor renames onto files on Windows.
+        getattr(os, 'replace', os.rename)(temporary, path)
+    except BaseException:
+        os.remove(temporary)
+        raise
+
+
+def load(path):
+    """
+    Loads a value :func:`dump` wrote.  The file is memory mapped copy on
+    write, so out-of-band buffers are views on it that tests may change
+    without changing the cache.
+    """
+    with open(path, 'rb') as cache_file:
+        if not os.fstat(cache_file.fileno()).st_size:
+            raise ValueError('Empty cache file %s' % path)
+
+        mapped = mmap.mmap(cache_file.fileno(), 0, access=mmap.ACCESS_COPY)
+
+    view = memoryview(mapped)
+    if view[:len(MAGIC)].tobytes() != MAGIC:
+        raise ValueError('Not an Exam cache file: %s' % path)
+
+    position = len(MAGIC)
+    size, count = struct.unpack_from('<QQ', mapped, position)
+    position += 16
+    buffers = []
+
+    for _ in range(count):
+        start, length = struct.unpack_from('<QQ', mapped, position)
+        position += 16
+        buffers.append(view[start:start + length])
+
+    data = view[position:position + size]
+
+    if OUT_OF_BAND:
+        return pickle.loads(data, buffers=buffers)
+
+    return pickle.loads(data.tobytes())
+
+
+def cached(fixture, build, owner=None):
+    """
+    Returns the cached value of ``fixture`` built for the test case class
+    ``owner`` (see :func:`key_for`), calling ``build`` and caching what it
+    returns when there is none.  Values that cannot be pickled are returned
+    uncached, with a warning.
+    """
+    path = path_for(key_for(fixture, owner))
+
+    if os.path.exists(path):
+        try:
+            value = load(path)
+        except Exception as error:
+            warnings.warn('Rebuilding fixture %s, as its cache could not be '
+                          'loaded: %s' % (name_of(fixture.thing), error))
+        else:
+            os.utime(path, None)  # marks it as recently used
+            return value
+
+    value = build()
+
+    if not os.path.isdir(directory):
+        os.makedirs(directory)
+
+    try:
+        dump(value, path)
+    except Exception as error:
+        warnings.warn('Not caching fixture %s: %s' %
+                      (name_of(fixture.thing), error))
+    else:
+        prune()
+
+    return value
+
+
+def prune(now=None):
+    """
+    Removes entries unused for longer than :data:`max_age`, then the least
+    recently used ones until the cache is no larger than :data:`max_size`.
+    """
+    now = time.time() if now is None else now
+    entries = []
+
+    for name in os.listdir(directory):
+        if not name.endswith(SUFFIX):
+            continue
+
+        path = os.path.join(directory, name)
+        try:
+            status = os.stat(path)
+        except OSError:  # pruned by another process
+            continue
+        entries.append((status.st_mtime, status.st_size, path))
+
+    entries.sort()
+    total = sum(size for _, size, _ in entries)
+
+    for used, size, path in entries:
+        if now - used <= max_age and total <= max_size:
+            break
+
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+        total -= size
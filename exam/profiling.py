@@ -0,0 +1,127 @@
+"""
+Profiles every Exam test with ``cProfile`` and keeps the profiles of only the
+slowest few, so finding out why a test is slow does not mean running it
+again by hand under a profiler::
+
+    profiles = exam.profiling.enable(keep=10)
+    unittest.main(exit=False)
+    profiles.write('profiles')
+
+The ``exam`` command does this with ``--profile-slowest N``.  Profiles are
+written as ``pstats`` files, which ``python -m pstats``, snakeviz,
+gprof2dot or flameprof can load.  A profile covers the whole of a test: its
+hooks, fixtures and patches as well as the test itself.
+"""
+from __future__ import absolute_import
+
+import cProfile
+import heapq
+import marshal
+import os
+import re
+import threading
+
+from exam.timing import clock
+
+
+#: Where Exam offers the profile of each test, or ``None`` while profiling is
+#: off.
+profiles = None
+
+
+def enable(keep=10):
+    """
+    Turns profiling on and returns the new :class:`SlowestProfiles`.
+    """
+    global profiles
+    profiles = SlowestProfiles(keep)
+    return profiles
+
+
+def disable():
+    global profiles
+    profiles = None
+
+
+class SlowestProfiles(object):
+    """
+    Keeps the profiles of the ``keep`` slowest tests it was offered.  Each
+    is kept as a ``(seconds, test id, stats)`` tuple, where ``stats`` is the
+    ``stats`` dict of a ``cProfile.Profile``.
+    """
+
+    def __init__(self, keep):
+        self.keep = keep
+        self.kept = []
+        self.fresh = []
+        self.lock = threading.Lock()
+
+    def profile(self, test_id, func, *args, **kwargs):
+        """
+        Calls ``func`` under ``cProfile`` and offers the profile as that of
+        the test ``test_id``.
+        """
+        profiler = cProfile.Profile()
+        started = clock()
+        profiler.enable()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            profiler.disable()
+            seconds = clock() - started
+
+            if self.is_slow(seconds):
+                profiler.create_stats()
+                self.offer((seconds, test_id, profiler.stats))
+
+    def is_slow(self, seconds):
+        return len(self.kept) < self.keep or seconds > self.kept[0][0]
+
+    def offer(self, entry):
+        """
+        Keeps ``entry`` if it is among the ``keep`` slowest so far.
+        """
+        with self.lock:
+            # Runs that do not fork drain entries into where they came from.
+            if any(kept is entry for kept in self.kept):
+                return
+            elif len(self.kept) < self.keep:
+                heapq.heappush(self.kept, entry)
+            elif entry[0] > self.kept[0][0]:
+                heapq.heapreplace(self.kept, entry)
+            else:
+                return
+
+            self.fresh.append(entry)
+
+    def drain(self):
+        """
+        Returns the entries kept since the last time this was called that
+        are still kept, so a worker process only has to send those.
+        """
+        with self.lock:
+            fresh, self.fresh = self.fresh, []
+            return [entry for entry in fresh if entry in self.kept]
+
+    def slowest(self):
+        return sorted(self.kept, key=lambda entry: (-entry[0], entry[1]))
+
+    def write(self, directory):
+        """
+        Writes each kept profile to a ``pstats`` file in ``directory``,
+        slowest first, and returns ``(seconds, test id, path)`` for each.
+        """
+        if not os.path.isdir(directory):
+            os.makedirs(directory)
+
+        written = []
+        for rank, (seconds, test_id, stats) in enumerate(self.slowest(), 1):
+            path = os.path.join(directory, '%02d-%s.prof' % (
+                rank, re.sub(r'[^\w.-]', '_', test_id)))
+
+            with open(path, 'wb') as profile_file:
+                marshal.dump(stats, profile_file)
+
+            written.append((seconds, test_id, path))
+
+        return written
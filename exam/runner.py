@@ -0,0 +1,412 @@
+"""
+Runs unittest test cases spread over a pool of worker processes::
+
+    exam -j 8 tests
+
+Tests are discovered (and so imported) by the parent process before the
+workers are forked from it, so workers start warm.  Each test case class is
+run as a whole by one worker, which keeps ``setUpClass``, class scoped
+fixtures and patchers and Exam's hook ordering working as usual.  Workers
+send back only what unittest reports about each test, which the parent
+merges into one report.
+"""
+from __future__ import absolute_import, print_function
+
+from collections import namedtuple
+import argparse
+import multiprocessing
+import multiprocessing.util
+import os
+import sys
+import time
+import unittest
+
+from exam.ordering import iter_tests, group_units
+from exam.sharding import (unit_id, load_timings, save_timings, shard,
+                           parse_shard)
+import exam.benchmarking
+import exam.profiling
+import exam.scopes
+import exam.sharing
+import exam.timing
+
+
+#: What a worker tells the parent about one outcome of one test.  Outcomes
+#: of subtests have the ``subtest``'s description, and are otherwise told
+#: about as outcomes of the test they are part of.
+Outcome = namedtuple('Outcome', 'kind test_id description details subtest')
+
+#: What a worker tells the parent about running one test case class.
+#: ``timings`` holds what :mod:`exam.timing` recorded and ``profiles`` the
+#: profiles :mod:`exam.profiling` kept, when they are on.
+UnitReport = namedtuple('UnitReport', 'index outcomes tests_run duration '
+                                      'timings profiles')
+
+
+class ReportedTest(object):
+    """
+    Stands in for a test that ran in a worker process, wherever unittest's
+    result objects expect a test case.
+    """
+
+    def __init__(self, test_id, description):
+        self.test_id = test_id
+        self.description = description
+
+    def id(self):
+        return self.test_id
+
+    def shortDescription(self):
+        return None
+
+    def __str__(self):
+        return self.description
+
+
+class RecordingResult(unittest.TestResult):
+    """
+    Result used in workers, which turns every outcome into an
+    :class:`Outcome` that can be sent to the parent process.
+    """
+
+    def __init__(self):
+        super(RecordingResult, self).__init__()
+        self.outcomes = []
+
+    def record(self, kind, test, details=None, subtest=None):
+        if details is not None and not isinstance(details, str):
+            details = self._exc_info_to_string(details, test)
+
+        described = None if subtest is None else str(subtest)
+        self.outcomes.append(Outcome(kind, test.id(), str(test), details,
+                                     described))
+
+    def addSuccess(self, test):
+        super(RecordingResult, self).addSuccess(test)
+        self.record('success', test)
+
+    def addFailure(self, test, err):
+        super(RecordingResult, self).addFailure(test, err)
+        self.record('failure', test, err)
+
+    def addError(self, test, err):
+        super(RecordingResult, self).addError(test, err)
+        self.record('error', test, err)
+
+    def addSkip(self, test, reason):
+        super(RecordingResult, self).addSkip(test, reason)
+        self.record('skip', test, reason)
+
+    def addExpectedFailure(self, test, err):
+        super(RecordingResult, self).addExpectedFailure(test, err)
+        self.record('expected_failure', test, err)
+
+    def addUnexpectedSuccess(self, test):
+        super(RecordingResult, self).addUnexpectedSuccess(test)
+        self.record('unexpected_success', test)
+
+    def addSubTest(self, test, subtest, err):
+        super(RecordingResult, self).addSubTest(test, subtest, err)
+
+        if err is not None:
+            kind = 'failure' if issubclass(err[0], test.failureException) \
+                else 'error'
+            self.record(kind, test, err, subtest)
+
+
+class MergedResult(unittest.TextTestResult):
+    """
+    Text result the parent process replays worker :class:`Outcome`\\ s into.
+    """
+
+    def replay(self, outcomes):
+        """
+        Replays the outcomes of one unit, starting and stopping each test
+        once however many outcomes its subtests had.
+        """
+        current = None
+
+        for outcome in outcomes:
+            if current is None or current.test_id != outcome.test_id:
+                if current is not None:
+                    self.stopTest(current)
+                current = ReportedTest(outcome.test_id, outcome.description)
+                self.startTest(current)
+
+            self.replay_outcome(outcome, current)
+
+        if current is not None:
+            self.stopTest(current)
+
+    def replay_outcome(self, outcome, test):
+        if outcome.subtest is not None:
+            test = ReportedTest(outcome.test_id, outcome.subtest)
+
+        if outcome.kind == 'success':
+            self.addSuccess(test)
+        elif outcome.kind == 'failure':
+            self.addFailure(test, outcome.details)
+        elif outcome.kind == 'error':
+            self.addError(test, outcome.details)
+        elif outcome.kind == 'skip':
+            self.addSkip(test, outcome.details)
+        elif outcome.kind == 'expected_failure':
+            self.addExpectedFailure(test, outcome.details)
+        elif outcome.kind == 'unexpected_success':
+            self.addUnexpectedSuccess(test)
+
+    def _exc_info_to_string(self, err, test):
+        # Errors were already formatted by the worker they happened in.
+        if isinstance(err, str):
+            return err
+
+        return super(MergedResult, self)._exc_info_to_string(err, test)
+
+
+def group_by_class(suite):
+    """
+    Splits ``suite`` into a list of suites, one per test case class, in the
+    order each class is first found.
+    """
+    groups = {}
+    order = []
+
+    for test in iter_tests(suite):
+        key = (type(test).__module__, type(test).__name__)
+
+        if key not in groups:
+            groups[key] = []
+            order.append(key)
+
+        groups[key].append(test)
+
+    return [unittest.TestSuite(groups[key]) for key in order]
+
+
+# The units of work of the current run.  Set by the parent before the workers
+# are forked, so workers find them here instead of having them pickled.
+_units = []
+
+
+def run_unit(index):
+    """
+    Runs unit number ``index`` of the current run and reports how it went.
+    """
+    result = RecordingResult()
+    started = time.time()
+    _units[index].run(result)
+    recorder = exam.timing.recorder
+    profiles = exam.profiling.profiles
+
+    return UnitReport(index, result.outcomes, result.testsRun,
+                      time.time() - started,
+                      recorder.drain() if recorder is not None else None,
+                      profiles.drain() if profiles is not None else None)
+
+
+def _init_worker():
+    # Pool workers leave through os._exit, which skips atexit, but not
+    # multiprocessing's own finalizers.
+    multiprocessing.util.Finalize(None, exam.scopes.close_session,
+                                  exitpriority=10)
+
+
+def _pool(jobs):
+    try:
+        context = multiprocessing.get_context('fork')
+    except (AttributeError, ValueError):
+        context = multiprocessing
+
+    return context.Pool(jobs, initializer=_init_worker)
+
+
+def run_units(units, jobs):
+    """
+    Runs ``units`` (a list of test suites) over ``jobs`` worker processes and
+    yields a :class:`UnitReport` for each as soon as it is done.
+    """
+    global _units
+    _units = units
+
+    # Workers of a pool cannot have pools of their own.
+    if jobs <= 1 or multiprocessing.current_process().daemon:
+        for index in range(len(units)):
+            yield run_unit(index)
+        return
+
+    pool = _pool(jobs)
+    try:
+        for report in pool.imap_unordered(run_unit, range(len(units))):
+            yield report
+    finally:
+        pool.close()
+        pool.join()
+
+
+def discover(names, pattern, top_level_dir=None):
+    loader = unittest.TestLoader()
+
+    if not names:
+        return loader.discover('.', pattern=pattern,
+                               top_level_dir=top_level_dir)
+
+    suite = unittest.TestSuite()
+    for name in names:
+        if os.path.isdir(name):
+            suite.addTests(loader.discover(name, pattern=pattern,
+                                           top_level_dir=top_level_dir))
+        else:
+            suite.addTests(loader.loadTestsFromName(name))
+
+    return suite
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='exam', description='Run unittest test cases in parallel.')
+    parser.add_argument('names', nargs='*',
+                        help='directories, modules, classes or tests to run '
+                             '(default: discover from the current directory)')
+    parser.add_argument('-j', '--jobs', type=int,
+                        default=multiprocessing.cpu_count(),
+                        help='number of worker processes '
+                             '(default: %(default)s)')
+    parser.add_argument('-p', '--pattern', default='test*.py',
+                        help='pattern test files must match '
+                             '(default: %(default)s)')
+    parser.add_argument('-t', '--top-level-directory', default=None,
+                        help='top level directory of the project')
+    parser.add_argument('--timings', metavar='FILE',
+                        help='record how long each test case class takes in '
+                             'FILE, and use it to balance --shard')
+    parser.add_argument('--shard', metavar='N/COUNT',
+                        help='only run shard N out of COUNT, balanced by '
+                             'the --timings of earlier runs')
+    parser.add_argument('--hook-timings', metavar='FILE',
+                        help='time every hook, fixture, patch and test, '
+                             'write the breakdown to FILE as JSON and '
+                             'print the slowest')
+    parser.add_argument('--profile-slowest', metavar='N', type=int,
+                        help='profile every test and keep the profiles of '
+                             'the N slowest')
+    parser.add_argument('--profile-dir', metavar='DIR',
+                        default='exam-profiles',
+                        help='where --profile-slowest writes pstats files '
+                             '(default: %(default)s)')
+    parser.add_argument('--reorder', action='store_true',
+                        help='run the classes of modules with setup of their '
+                             'own in one worker, so it is built once')
+    parser.add_argument('--update-benchmarks', action='store_true',
+                        help='write the baselines of @benchmark tests '
+                             'instead of comparing with them')
+    parser.add_argument('-v', '--verbose', action='store_const', const=2,
+                        default=1, dest='verbosity')
+    return parser
+
+
+def run(units, jobs, stream=None, verbosity=1):
+    """
+    Runs ``units`` over ``jobs`` workers, reporting to ``stream`` like
+    unittest's ``TextTestRunner`` does, and returns the merged result.  How
+    long each unit took, class and hook setup included, is kept in the
+    result's ``durations``, keyed by :func:`exam.sharding.unit_id`.
+    """
+    stream = unittest.runner._WritelnDecorator(stream or sys.stderr)
+    result = MergedResult(stream, True, verbosity)
+    result.durations = {}
+    # Suites let go of their tests as they run them, so name units up front.
+    ids = [unit_id(unit) for unit in units]
+    started = time.time()
+
+    for report in run_units(units, jobs):
+        result.durations[ids[report.index]] = report.duration
+
+        if report.timings is not None:
+            exam.timing.recorder.merge(report.timings)
+
+        for entry in report.profiles or ():
+            exam.profiling.profiles.offer(entry)
+
+        result.replay(report.outcomes)
+
+    elapsed = time.time() - started
+    result.printErrors()
+    stream.writeln(result.separator2)
+    stream.writeln('Ran %d test%s in %.3fs' % (
+        result.testsRun, result.testsRun != 1 and 's' or '', elapsed))
+    stream.writeln()
+
+    details = []
+    for name, outcomes in [('failures', result.failures),
+                           ('errors', result.errors),
+                           ('skipped', result.skipped)]:
+        if outcomes:
+            details.append('%s=%d' % (name, len(outcomes)))
+
+    status = 'OK' if result.wasSuccessful() else 'FAILED'
+    stream.writeln(status + (' (%s)' % ', '.join(details) if details else ''))
+
+    return result
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    sys.path.insert(0, os.path.abspath(args.top_level_directory or '.'))
+
+    suite = discover(args.names, args.pattern, args.top_level_directory)
+    units = group_by_class(suite)
+
+    if args.reorder:
+        grouped, setups = group_units(suite)
+        saved = [before - after for before, after in
+                 zip(setups.count(units), setups.count(grouped))]
+        units = [unittest.TestSuite(unit) for unit in grouped]
+        print('Reordering saves %d class setups and %d module setups' %
+              tuple(saved), file=sys.stderr)
+
+    if args.shard:
+        try:
+            index, count = parse_shard(args.shard)
+        except ValueError as error:
+            parser.error(str(error))
+
+        timings = load_timings(args.timings) if args.timings else {}
+        units = shard(units, index, count, timings)
+
+    if args.update_benchmarks:
+        exam.benchmarking.update = True
+
+    if args.hook_timings:
+        recorder = exam.timing.enable()
+
+    if args.profile_slowest:
+        profiles = exam.profiling.enable(args.profile_slowest)
+
+    # Workers find the directory shared fixtures are kept in through the
+    # environment they inherit.
+    exam.sharing.start_run()
+    try:
+        result = run(units, args.jobs, verbosity=args.verbosity)
+    finally:
+        exam.sharing.end_run()
+
+    if args.timings:
+        save_timings(args.timings, result.durations)
+
+    if args.hook_timings:
+        report = recorder.report()
+        exam.timing.write_json(report, args.hook_timings)
+        print(exam.timing.format_text(report), file=sys.stderr)
+
+    if args.profile_slowest:
+        print('Profiles of the slowest tests:', file=sys.stderr)
+        for seconds, test_id, path in profiles.write(args.profile_dir):
+            print('%10.4f  %s  %s' % (seconds, test_id, path),
+                  file=sys.stderr)
+
+    return 0 if result.wasSuccessful() else 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
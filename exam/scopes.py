@@ -0,0 +1,183 @@
+from __future__ import absolute_import
+
+import atexit
+from functools import partial
+import threading
+import types
+
+
+class Scope(object):
+    """
+    Holds values that outlive a single test, along with the finalizers
+    needed to tear them down once the scope ends.  Finalizers are run in the
+    reverse order that they were added.
+    """
+
+    def __init__(self, name):
+        self.name = name
+        self.values = {}
+        self.finalizers = []
+        # Reentrant, as building one value may need others of the scope.
+        self.lock = threading.RLock()
+
+    def get(self, key, factory):
+        if key not in self.values:
+            with self.lock:
+                if key not in self.values:
+                    self.values[key] = factory()
+
+        return self.values[key]
+
+    def add_finalizer(self, func):
+        self.finalizers.append(func)
+
+    def close(self):
+        errors = []
+
+        while self.finalizers:
+            try:
+                self.finalizers.pop()()
+            except Exception as error:
+                errors.append(error)
+
+        self.values.clear()
+
+        if errors:
+            raise errors[0]
+
+
+class ScopeRegistry(object):
+    """
+    Keeps track of every open :class:`Scope`, keyed by scope name (i.e.
+    ``'class'``, ``'module'`` or ``'session'``) and a key identifying the
+    scope within that name, such as the test case class or module name.
+    """
+
+    def __init__(self):
+        self.scopes = {}
+        self.opened = []
+        self.lock = threading.Lock()
+
+    def scope(self, name, key=None, on_open=None):
+        """
+        Returns the scope ``name`` for ``key``, opening it if need be.  When
+        it is opened, ``on_open`` is called, if given.
+        """
+        if (name, key) not in self.scopes:
+            with self.lock:
+                if (name, key) not in self.scopes:
+                    self.scopes[(name, key)] = Scope(name)
+                    self.opened.append((name, key))
+
+                    if on_open is not None:
+                        on_open()
+
+        return self.scopes[(name, key)]
+
+    def close(self, name, key=None):
+        scope = self.scopes.pop((name, key), None)
+
+        if scope is not None:
+            self.opened.remove((name, key))
+            scope.close()
+
+    def close_all(self):
+        """
+        Closes every open scope, the most recently opened first.
+        """
+        errors = []
+
+        while self.opened:
+            try:
+                self.close(*self.opened[-1])
+            except Exception as error:
+                errors.append(error)
+
+        if errors:
+            raise errors[0]
+
+
+#: The registry scoped fixtures publish their values into.
+registry = ScopeRegistry()
+
+
+def for_class(cls):
+    """
+    Returns the :class:`Scope` shared by every test of the test case class
+    ``cls``.
+    """
+    return registry.scope('class', cls, partial(_close_after, cls))
+
+
+def close_class(cls):
+    registry.close('class', cls)
+
+
+def _close_after(cls):
+    # unittest runs class cleanups (on Python 3.8 and later) even when a
+    # tearDownClass override does not call up to Exam's.
+    add_cleanup = getattr(cls, 'addClassCleanup', None)
+    if add_cleanup is not None:
+        add_cleanup(close_class, cls)
+
+
+def for_module(name):
+    """
+    Returns the :class:`Scope` shared by every test case in module ``name``.
+    """
+    return registry.scope('module', name)
+
+
+def close_module(name):
+    registry.close('module', name)
+
+
+def module_hooks(name):
+    """
+    Builds ``setUpModule`` and ``tearDownModule`` functions for the module
+    named ``name`` so module scoped fixtures are torn down as soon as
+    unittest is done with the module::
+
+        setUpModule, tearDownModule = module_hooks(__name__)
+
+    Without them, module scoped fixtures live until the session ends.
+    """
+    def setUpModule():
+        for_module(name)
+
+    def tearDownModule():
+        close_module(name)
+
+    return setUpModule, tearDownModule
+
+
+def for_session():
+    """
+    Returns the :class:`Scope` shared by every test of the run.
+    """
+    return registry.scope('session')
+
+
+def close_session():
+    """
+    Closes every scope that is still open, session scope included.  This is
+    registered with :mod:`atexit`, but test runners may call it earlier.
+    """
+    registry.close_all()
+
+
+atexit.register(close_session)
+
+
+def setup_value(scope, value):
+    """
+    Turns ``value`` into the value to store in ``scope``.  If ``value`` is a
+    generator, it is advanced to its first ``yield`` and the rest of it runs
+    when ``scope`` closes, just like an ``@around`` hook.
+    """
+    if not isinstance(value, types.GeneratorType):
+        return value
+
+    result = next(value)
+    scope.add_finalizer(lambda: next(value, None))
+    return result
@@ -0,0 +1,117 @@
+"""
+Splits test case classes into shards of about the same duration, based on
+how long they took in earlier runs.
+"""
+from __future__ import absolute_import
+
+import json
+import os
+
+
+#: Seconds assumed for a test case class when there are no timings at all.
+DEFAULT_DURATION = 1.0
+
+
+def unit_id(unit):
+    """
+    Returns the ``'module.Class'`` name of the test case class a unit of
+    tests (as built by :func:`exam.runner.group_by_class`) belongs to, or
+    the module's name for units of a whole module (as built by
+    :func:`exam.ordering.group_units`).
+    """
+    classes = set(type(test) for test in unit)
+
+    if len(classes) > 1:
+        return classes.pop().__module__
+
+    for cls in classes:
+        return '%s.%s' % (cls.__module__, cls.__name__)
+
+
+def load_timings(path):
+    """
+    Reads the timings file at ``path``, a JSON object of seconds keyed by
+    :func:`unit_id`.  A missing file has no timings.
+    """
+    if not os.path.exists(path):
+        return {}
+
+    with open(path) as timings_file:
+        return json.load(timings_file)
+
+
+def save_timings(path, timings):
+    """
+    Adds ``timings`` to the ones in the timings file at ``path``, replacing
+    the old timing of any class timed again.
+    """
+    merged = load_timings(path)
+    merged.update(timings)
+
+    temporary = path + '.tmp'
+    with open(temporary, 'w') as timings_file:
+        json.dump(merged, timings_file, indent=2, sort_keys=True)
+    os.rename(temporary, path)
+
+
+def estimate(ids, timings):
+    """
+    Returns the expected duration of each of ``ids``.  Classes without a
+    timing are expected to take the median of the timed ones.
+    """
+    known = sorted(timings[id_] for id_ in ids if id_ in timings)
+
+    if known:
+        middle = len(known) // 2
+        fallback = known[middle] if len(known) % 2 else \
+            (known[middle - 1] + known[middle]) / 2.0
+    else:
+        fallback = DEFAULT_DURATION
+
+    return dict((id_, timings.get(id_, fallback)) for id_ in ids)
+
+
+def assign(durations, count):
+    """
+    Splits the ids in ``durations`` over ``count`` shards using the longest
+    processing time first rule: longest first, each into the shard with the
+    least work so far.  Ties are broken by id and shard number, so every
+    machine computes the same shards.  Returns a list of sets of ids.
+    """
+    shards = [set() for _ in range(count)]
+    loads = [0.0] * count
+
+    for id_ in sorted(durations, key=lambda id_: (-durations[id_], id_)):
+        lightest = min(range(count), key=lambda shard: (loads[shard], shard))
+        shards[lightest].add(id_)
+        loads[lightest] += durations[id_]
+
+    return shards
+
+
+def shard(units, index, count, timings):
+    """
+    Returns the units of shard number ``index`` (counting from zero) out of
+    ``count``, in their original order.
+    """
+    ids = [unit_id(unit) for unit in units]
+    chosen = assign(estimate(ids, timings), count)[index]
+
+    return [unit for unit, id_ in zip(units, ids) if id_ in chosen]
+
+
+def parse_shard(value):
+    """
+    Parses a ``'3/8'`` style shard argument into a zero based shard index and
+    shard count.
+    """
+    try:
+        number, count = [int(part) for part in value.split('/')]
+    except ValueError:
+        raise ValueError('Shards look like 3/8, not %r' % (value,))
+
+    if not 1 <= number <= count:
+        raise ValueError('Shard %d does not exist out of %d' % (
+            number, count))
+
+    return number - 1, count
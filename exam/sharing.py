@@ -0,0 +1,212 @@
+"""
+Shares the values of fixtures declared with ``shared=True`` between the
+processes of a run, so large read-only buffers are held in memory once
+however many workers use them::
+
+    lookup = fixture(load_lookup_table, shared=True)
+
+The first process to need the value builds it and writes its bytes to a
+file in a directory of the run, in ``/dev/shm`` where there is one.  Every
+process then memory maps that file read only and its tests get views of the
+mapping, which the operating system backs with the same memory.  A value
+can be anything supporting the buffer protocol, such as ``bytes`` or an
+``array.array``.  Tests get a read-only ``memoryview`` of the same format
+and shape, or a read-only array for numpy arrays.
+
+Mappings are closed when the fixture's scope ends.  The run's directory is
+removed by the process that created it when the run ends: the ``exam``
+command's parent process, or the only process of any other run.
+"""
+from __future__ import absolute_import
+
+from contextlib import contextmanager
+import atexit
+import hashlib
+import json
+import mmap
+import os
+import shutil
+import tempfile
+
+from exam.timing import name_of
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+
+#: The environment variable a run's directory is passed on to workers in.
+ENVIRONMENT = 'EXAM_SHARED_DIR'
+
+#: The directory of the current run, once a value was shared.
+directory = None
+
+# The process that created the run's directory, which removes it.
+_owner = None
+
+
+def start_run():
+    """
+    Creates the directory of a run.  Processes started afterwards, or
+    forked, share values through it.
+    """
+    global directory, _owner
+
+    base = '/dev/shm' if os.path.isdir('/dev/shm') else None
+    directory = tempfile.mkdtemp(prefix='exam-shared-', dir=base)
+    _owner = os.getpid()
+    os.environ[ENVIRONMENT] = directory
+    return directory
+
+
+def end_run():
+    """
+    Removes the directory of the run, if this process created it.
+    """
+    global directory, _owner
+
+    if directory is not None and _owner == os.getpid():
+        shutil.rmtree(directory, ignore_errors=True)
+        os.environ.pop(ENVIRONMENT, None)
+        directory = _owner = None
+
+
+atexit.register(end_run)
+
+
+def run_directory():
+    if directory is None:
+        if os.environ.get(ENVIRONMENT):
+            return os.environ[ENVIRONMENT]
+        start_run()
+
+    return directory
+
+
+def key_for(fixture, owner=None):
+    """
+    Returns the name values of ``fixture`` are shared under, which tells
+    apart fixtures of the same name defined in different places, and built
+    for different test case classes ``owner`` when building them gets to see
+    the test case.
+    """
+    thing = getattr(fixture.thing, '__func__', fixture.thing)
+    code = getattr(thing, '__code__', None)
+    where = (code.co_filename, code.co_firstlineno) if code is not None \
+        else getattr(thing, '__module__', None)
+    built_for = None if owner is None else \
+        '%s.%s' % (owner.__module__, name_of(owner))
+    described = repr((name_of(thing), where, built_for, fixture.args,
+                      sorted(fixture.kwargs.items())))
+    return hashlib.sha256(described.encode('utf-8')).hexdigest()
+
+
+@contextmanager
+def _locked(path):
+    # Without fcntl, processes may both build the value, but each file is
+    # moved into place whole.
+    with open(path, 'a') as lock_file:
+        if fcntl is not None:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+        yield
+
+
+def describe(value):
+    """
+    Returns what :func:`view` needs to know to hand out views shaped like
+    ``value``.
+    """
+    buffer = memoryview(value)
+    described = {'format': buffer.format, 'shape': list(buffer.shape)}
+
+    dtype = getattr(value, 'dtype', None)
+    if dtype is not None and hasattr(value, '__array_interface__'):
+        described['dtype'] = dtype.str
+
+    return described
+
+
+def write(value, path):
+    handle, temporary = tempfile.mkstemp(dir=os.path.dirname(path))
+
+    with os.fdopen(handle, 'wb') as data_file:
+        data_file.write(memoryview(value).tobytes())
+    with open(path + '.json', 'w') as description_file:
+        json.dump(describe(value), description_file)
+
+    getattr(os, 'replace', os.rename)(temporary, path)
+
+
+def view(mapped, described):
+    """
+    Returns a read-only view of ``mapped``, shaped as ``described`` says.
+    """
+    if 'dtype' in described:
+        import numpy
+        return numpy.frombuffer(mapped, dtype=described['dtype']).reshape(
+            described['shape'])
+
+    shaped = memoryview(mapped)
+    try:
+        return shaped.cast(described['format'], described['shape'])
+    except (TypeError, ValueError):
+        # Formats memoryview can not cast to, i.e. with a byte order.
+        return shaped
+
+
+class Mapping(object):
+    """
+    A shared value mapped into this process.
+    """
+
+    def __init__(self, path):
+        with open(path + '.json') as description_file:
+            self.described = json.load(description_file)
+
+        with open(path, 'rb') as data_file:
+            if os.fstat(data_file.fileno()).st_size:
+                self.mapped = mmap.mmap(data_file.fileno(), 0,
+                                        access=mmap.ACCESS_READ)
+            else:
+                self.mapped = None  # empty files can not be mapped
+
+        self.views = []
+
+    def view(self):
+        if self.mapped is None:
+            return memoryview(b'')
+
+        self.views.append(view(self.mapped, self.described))
+        return self.views[-1]
+
+    def close(self):
+        if self.mapped is None:
+            return
+
+        try:
+            for shared in self.views:
+                getattr(shared, 'release', lambda: None)()
+            self.mapped.close()
+        except BufferError:
+            # Tests still hold views of their own, which keep the mapping
+            # alive until they are collected.
+            pass
+
+
+def share(fixture, scope, build, owner=None):
+    """
+    Returns a view of the value of ``fixture`` built for the test case class
+    ``owner`` (see :func:`key_for`) shared by every process of the run,
+    calling ``build`` for it if no process has yet.  The mapping is closed
+    when ``scope`` ends.
+    """
+    path = os.path.join(run_directory(), key_for(fixture, owner))
+
+    with _locked(path + '.lock'):
+        if not os.path.exists(path):
+            write(build(), path)
+
+    mapping = Mapping(path)
+    scope.add_finalizer(mapping.close)
+    return mapping.view()
@@ -0,0 +1,163 @@
+"""
+Clones the values of snapshot fixtures, which are built once and handed to
+every test as a copy of its own.  How a value is copied is up to its
+strategy:
+
+``'deepcopy'``
+    ``copy.deepcopy`` of the value, which copies anything but costs the most.
+``'pickle'``
+    The value is pickled once and every copy is unpickled from that.  With
+    pickle protocol 5, large buffers such as numpy arrays' are kept out of
+    band and only need a ``memcpy`` each.
+``'structural'``
+    Only what tests could change is copied: dicts, lists, sets, bytearrays
+    and plain objects, including those that are set members or dict keys.
+    Strings, numbers, tuples and other immutable parts are shared between
+    every copy.  Which parts those are is worked out
+    once, when the snapshot is taken.  Anything else is deep copied on its
+    own, and values holding the same mutable object twice are deep copied
+    as a whole.
+"""
+from __future__ import absolute_import
+
+import copy
+import pickle
+import types
+
+
+STRATEGIES = ('deepcopy', 'pickle', 'structural')
+
+# Types deepcopy treats as atomic, which copies can share.
+ATOMIC = (type(None), bool, int, float, complex, str, bytes, type,
+          types.FunctionType, types.BuiltinFunctionType, type(Ellipsis),
+          type(NotImplemented), types.ModuleType) + \
+    tuple(getattr(types, name) for name in ('UnicodeType', 'LongType')
+          if hasattr(types, name))
+
+# Pickle protocol 5 keeps buffers out of band, from Python 3.8 on.
+OUT_OF_BAND = getattr(pickle, 'PickleBuffer', None) is not None
+
+
+def take(value, strategy):
+    """
+    Takes a snapshot of ``value``, returning a callable that makes a fresh
+    copy of it every time it is called.
+    """
+    if strategy == 'deepcopy':
+        return lambda: copy.deepcopy(value)
+    elif strategy == 'pickle':
+        return _pickled(value)
+    elif strategy == 'structural':
+        try:
+            return _compile(value, set())
+        except _Shared:
+            # Copies must keep objects referenced twice the same object,
+            # which deepcopy's memo takes care of.
+            return lambda: copy.deepcopy(value)
+
+    raise ValueError('Unknown snapshot strategy: %r' % (strategy,))
+
+
+def _pickled(value):
+    if not OUT_OF_BAND:
+        data = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        return lambda: pickle.loads(data)
+
+    buffers = []
+    data = pickle.dumps(value, 5, buffer_callback=buffers.append)
+    raw = [buffer.raw() for buffer in buffers]
+
+    return lambda: pickle.loads(data, buffers=[bytearray(buffer)
+                                               for buffer in raw])
+
+
+class _Shared(Exception):
+    """
+    Raised when the value holds a mutable object more than once.
+    """
+
+
+def _is_immutable(value):
+    if isinstance(value, ATOMIC):
+        return True
+    elif type(value) in (tuple, frozenset):
+        return all(_is_immutable(item) for item in value)
+
+    return False
+
+
+def _is_plain_object(value):
+    cls = type(value)
+    return (hasattr(value, '__dict__') and not hasattr(cls, '__slots__') and
+            cls.__reduce_ex__ is object.__reduce_ex__ and
+            cls.__reduce__ is object.__reduce__ and
+            getattr(cls, '__getstate__', None) is
+            getattr(object, '__getstate__', None) and
+            not hasattr(cls, '__setstate__') and
+            not hasattr(cls, '__deepcopy__'))
+
+
+def _compile(value, seen):
+    """
+    Returns a callable copying ``value``, which shares its immutable parts.
+    """
+    if _is_immutable(value):
+        return lambda: value
+
+    if id(value) in seen:
+        raise _Shared()
+    seen.add(id(value))
+
+    cls = type(value)
+
+    if cls is dict:
+        if not all(_is_immutable(key) for key in value):
+            keys = [(_compile(key, seen), _compile(item, seen))
+                    for key, item in value.items()]
+            return lambda: dict((key(), item()) for key, item in keys)
+
+        # Immutable items are copied along with the dict, in one go.
+        shared = dict((key, item) for key, item in value.items()
+                      if _is_immutable(item))
+        if len(shared) == len(value):
+            return value.copy
+
+        items = [(key, _compile(item, seen)) for key, item in value.items()
+                 if key not in shared]
+
+        def clone_dict():
+            copied = shared.copy()
+            for key, clone in items:
+                copied[key] = clone()
+            return copied
+
+        return clone_dict
+    elif cls is list:
+        if all(_is_immutable(item) for item in value):
+            return lambda: value[:]
+
+        items = [_compile(item, seen) for item in value]
+        return lambda: [clone() for clone in items]
+    elif cls is set:
+        if all(_is_immutable(item) for item in value):
+            return value.copy
+
+        # Hashable is not immutable: plain objects hash by identity.
+        items = [_compile(item, seen) for item in value]
+        return lambda: set(clone() for clone in items)
+    elif cls is bytearray:
+        return lambda: bytearray(value)
+    elif cls is tuple:
+        items = [_compile(item, seen) for item in value]
+        return lambda: tuple(clone() for clone in items)
+    elif _is_plain_object(value):
+        attributes = _compile(value.__dict__, seen)
+
+        def clone():
+            instance = cls.__new__(cls)
+            instance.__dict__ = attributes()
+            return instance
+
+        return clone
+
+    return lambda: copy.deepcopy(value)
@@ -0,0 +1,202 @@
+"""
+Records how long each part of every test takes: ``@around``, ``@before`` and
+``@after`` hooks, building fixtures, building and starting patches, and the
+test itself.  Off unless :func:`enable` is called, in which case Exam reports
+to the :data:`recorder` it returns::
+
+    recorder = exam.timing.enable()
+    unittest.main(exit=False)
+    print(exam.timing.format_text(recorder.report()))
+
+The ``exam`` command does this with ``--hook-timings FILE``.  Phases nest: a
+``@before`` hook's time includes the time taken by the fixtures it was first
+to use, and the test's time includes ``setUp``, ``tearDown`` and cleanups,
+like stopping patches.
+"""
+from __future__ import absolute_import
+
+import json
+import threading
+import time
+
+
+#: The recorder Exam reports to, or ``None`` while timing is off.
+recorder = None
+
+#: Where records made while no test is running go, e.g. class scoped values
+#: being torn down.
+OUTSIDE_TESTS = '(outside tests)'
+
+clock = getattr(time, 'perf_counter', time.time)
+
+
+def enable():
+    """
+    Turns timing on and returns the new :class:`Recorder`.
+    """
+    global recorder
+    recorder = Recorder()
+    return recorder
+
+
+def disable():
+    global recorder
+    recorder = None
+
+
+def call(phase, thing, func, *args, **kwargs):
+    """
+    Calls ``func``, recording how long it took under the name of ``thing``
+    if timing is on.
+    """
+    current = recorder
+
+    if current is None:
+        return func(*args, **kwargs)
+
+    return current.call(phase, thing, func, *args, **kwargs)
+
+
+def name_of(thing):
+    """
+    Returns the name timings of ``thing``, a hook or fixture function or a
+    type, are reported under.  Strings are names already.
+    """
+    if isinstance(thing, str):
+        return thing
+
+    thing = getattr(thing, '__func__', thing)
+    return getattr(thing, '__qualname__', None) or \
+        getattr(thing, '__name__', None) or repr(thing)
+
+
+class Recorder(object):
+    """
+    Keeps ``(phase, name, seconds)`` records for every test, keyed by test
+    id.  Records can come from several threads at once.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.tests = {}
+        self.current = OUTSIDE_TESTS
+        self.started = None
+
+    def start_test(self, test_id):
+        self.current = test_id
+        self.started = clock()
+
+    def stop_test(self):
+        """
+        Records the time since :meth:`start_test` as the test's ``'total'``.
+        """
+        self.add('total', '', clock() - self.started)
+        self.current = OUTSIDE_TESTS
+
+    def add(self, phase, thing, seconds):
+        record = (phase, name_of(thing), seconds)
+
+        with self.lock:
+            self.tests.setdefault(self.current, []).append(record)
+
+    def call(self, phase, thing, func, *args, **kwargs):
+        started = clock()
+        try:
+            return func(*args, **kwargs)
+        finally:
+            self.add(phase, thing, clock() - started)
+
+    def around(self, thing, generator):
+        """
+        Wraps the generator of an ``@around`` hook, recording the time taken
+        up to and after its ``yield`` as one record.
+        """
+        started = clock()
+        value = next(generator)
+        entering = clock() - started
+        yield value
+
+        started = clock()
+        try:
+            next(generator)
+        except StopIteration:
+            pass
+        self.add('around', thing, entering + clock() - started)
+
+    def drain(self):
+        """
+        Returns the records so far, as :meth:`merge` takes them, and forgets
+        them.
+        """
+        with self.lock:
+            tests, self.tests = self.tests, {}
+        return tests
+
+    def merge(self, tests):
+        with self.lock:
+            for test_id, records in tests.items():
+                self.tests.setdefault(test_id, []).extend(
+                    tuple(record) for record in records)
+
+    def report(self, limit=20):
+        """
+        Returns the per test breakdown, under ``'tests'``, along with the
+        ``limit`` hooks, fixtures and patches that took the longest across
+        all tests, under ``'slowest'``.  Everything in it is plain JSON.
+        """
+        totals = {}
+        tests = {}
+
+        for test_id, records in self.tests.items():
+            tests[test_id] = {
+                'seconds': sum(seconds for phase, _, seconds in records
+                               if phase == 'total'),
+                'phases': [{'phase': phase, 'name': name, 'seconds': seconds}
+                           for phase, name, seconds in records
+                           if phase != 'total']}
+
+            for phase, name, seconds in records:
+                if phase in ('total', 'test'):
+                    continue
+
+                total = totals.setdefault((phase, name), {
+                    'phase': phase, 'name': name, 'calls': 0,
+                    'seconds': 0.0, 'max': 0.0})
+                total['calls'] += 1
+                total['seconds'] += seconds
+                total['max'] = max(total['max'], seconds)
+
+        slowest = sorted(totals.values(),
+                         key=lambda total: (-total['seconds'], total['name']))
+        return {'tests': tests, 'slowest': slowest[:limit]}
+
+
+def write_json(report, path):
+    with open(path, 'w') as report_file:
+        json.dump(report, report_file, indent=2, sort_keys=True)
+
+
+def format_text(report, tests=10):
+    """
+    Formats a :meth:`Recorder.report` as a plain text table of the slowest
+    hooks, fixtures and patches, followed by the breakdown of the ``tests``
+    slowest tests.
+    """
+    lines = ['Slowest hooks, fixtures and patches:',
+             '%10s %8s %10s  %-13s %s' % ('total (s)', 'calls', 'max (s)',
+                                          'phase', 'name')]
+    lines.extend('%10.4f %8d %10.4f  %-13s %s' % (
+        total['seconds'], total['calls'], total['max'], total['phase'],
+        total['name']) for total in report['slowest'])
+
+    slowest = sorted(report['tests'].items(),
+                     key=lambda item: (-item[1]['seconds'], item[0]))
+    lines.extend(['', 'Slowest tests:'])
+
+    for test_id, test in slowest[:tests]:
+        lines.append('%10.4f  %s' % (test['seconds'], test_id))
+        lines.extend('%10.4f    %-13s %s' % (
+            phase['seconds'], phase['phase'], phase['name'])
+            for phase in test['phases'])
+
+    return '\n'.join(lines)
@@ -27,7 +27,8 @@ setup(
     url='https://github.com/fluxx/exam',
     description='Helpers for better testing.',
     license='MIT',
-    packages=find_packages(exclude=['tests', 'tests.*']),
+    packages=find_packages(exclude=['tests', 'tests.*', 'benchmarks',
+                                    'benchmarks.*']),
     install_requires=install_requires,
     tests_require=tests_require,
     setup_requires=setup_requires,
@@ -38,6 +39,9 @@ setup(
         'lint': lint_requires
     },
     zip_safe=False,
+    entry_points={
+        'console_scripts': ['exam = exam.runner:main'],
+    },
     test_suite='nose.collector',
     classifiers=[
         "Programming Language :: Python",
@@ -2,6 +2,19 @@ import sys
 
 
 if sys.version_info < (2, 7):
+    import unittest2 as unittest
     from unittest2 import TestCase  # NOQA
 else:
+    import unittest
     from unittest import TestCase  # NOQA
+
+
+def run_tests(case_class, *names):
+    """
+    Runs the tests ``names`` of ``case_class``, or its ``test_it``, in one
+    suite like unittest would, and returns the result and the test cases.
+    """
+    tests = [case_class(name) for name in names or ('test_it',)]
+    result = unittest.TestResult()
+    unittest.TestSuite(tests).run(result)
+    return result, tests
@@ -0,0 +1,188 @@
+#: Test cases the async hook tests run.  Not named test_* so they are not
+#: collected on their own.
+import asyncio
+import threading
+from unittest import IsolatedAsyncioTestCase
+
+from tests import TestCase, dummy
+
+from exam.cases import Exam
+from exam.decorators import before, after, around, patcher, fixture, uses
+
+
+class Hooked(Exam):
+    """
+    Has async hooks and fixtures of every kind, which record what they did,
+    and on which loop, in ``events``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        self.events = []
+        super(Hooked, self).__init__(*args, **kwargs)
+
+    @fixture
+    async def connection(self):
+        self.events.append(('connect', asyncio.get_running_loop()))
+        return 'connection'
+
+    @fixture
+    async def session(self):
+        self.events.append(('open session', asyncio.get_running_loop()))
+        yield 'session'
+        self.events.append(('close session', asyncio.get_running_loop()))
+
+    @around
+    async def transaction(self):
+        self.events.append(('begin', asyncio.get_running_loop()))
+        yield
+        self.events.append(('rollback', asyncio.get_running_loop()))
+
+    @before
+    async def login(self):
+        self.events.append(('login ' + self.connection,
+                            asyncio.get_running_loop()))
+
+    @before
+    def plain_before(self):
+        self.events.append(('plain before', None))
+
+    @after
+    async def logout(self):
+        self.events.append(('logout ' + self.session,
+                            asyncio.get_running_loop()))
+
+
+class PlainHooked(Hooked, TestCase):
+
+    def test_it(self):
+        self.events.append(('test', None))
+
+    def test_other(self):
+        pass
+
+    def test_runs_a_loop_of_its_own(self):
+        self.assertEqual(asyncio.run(asyncio.sleep(0, 'slept')), 'slept')
+
+
+class FailingBefore(PlainHooked):
+
+    @before
+    async def explode(self):
+        raise ValueError('boom')
+
+
+class IsolatedHooked(Hooked, IsolatedAsyncioTestCase):
+
+    async def test_it(self):
+        self.events.append(('test ' + self.connection,
+                            asyncio.get_running_loop()))
+
+    async def test_fails(self):
+        self.fail('on purpose')
+
+
+class Synchronous(Exam, TestCase):
+
+    @before
+    def plain(self):
+        pass
+
+
+class IsolatedSynchronous(Exam, IsolatedAsyncioTestCase):
+
+    dummy_it = patcher('tests.dummy.it')
+
+    def __init__(self, *args, **kwargs):
+        self.loops = []
+        super(IsolatedSynchronous, self).__init__(*args, **kwargs)
+
+    @before
+    def sync_before(self):
+        self.loops.append(asyncio.get_running_loop())
+
+    async def test_it(self):
+        self.loops.append(asyncio.get_running_loop())
+        self.assertIs(dummy.it, self.dummy_it)
+
+
+class PatchedFixture(Exam):
+
+    dummy_it = patcher('tests.dummy.it')
+
+    @fixture
+    async def seen(self):
+        return dummy.it
+
+    def test_it(self):
+        self.assertIs(self.seen, self.dummy_it)
+
+
+class PlainPatchedFixture(PatchedFixture, TestCase):
+    pass
+
+
+class IsolatedPatchedFixture(PatchedFixture, IsolatedAsyncioTestCase):
+    pass
+
+
+class UsesOne(Exam, TestCase):
+
+    def __init__(self, *args, **kwargs):
+        self.built = []
+        super(UsesOne, self).__init__(*args, **kwargs)
+
+    @fixture
+    async def used(self):
+        self.built.append('used')
+
+    @fixture
+    async def unused(self):
+        self.built.append('unused')
+
+    @uses('used')
+    def test_it(self):
+        pass
+
+
+class NotExam(TestCase):
+
+    @fixture
+    async def connection(self):
+        pass
+
+    def test_it(self):
+        pass
+
+
+class ConcurrentBefores(Exam, IsolatedAsyncioTestCase):
+
+    def setUp(self):
+        self.sync_ran = threading.Event()
+
+    @before(concurrent=True)
+    async def waits_for_sync_hook(self):
+        # Times out unless the sync hook runs in the meantime.
+        self.assertTrue(await asyncio.get_running_loop(
+            ).run_in_executor(None, self.sync_ran.wait, 5))
+
+    @before(concurrent=True)
+    def sync_hook(self):
+        self.sync_ran.set()
+
+    async def test_it(self):
+        pass
+
+
+class FailingConcurrentBefores(Exam, IsolatedAsyncioTestCase):
+
+    @before(concurrent=True)
+    async def fails_late(self):
+        await asyncio.sleep(0.01)
+        raise ValueError('late')
+
+    @before(concurrent=True)
+    async def fails_early(self):
+        raise KeyError('early')
+
+    async def test_it(self):
+        pass
@@ -0,0 +1,29 @@
+#: Test cases the benchmark tests run.  Not named test_* so they are not
+#: collected on their own.
+import os
+import tempfile
+
+from tests import TestCase
+
+from exam.cases import Exam
+from exam.decorators import before, benchmark
+
+
+#: Kept out of the test's directory, and cleaned up by every test using it.
+BASELINES = os.path.join(tempfile.gettempdir(),
+                         'exam-test-benchmarks-%d.json' % os.getpid())
+
+
+class Benchmarked(Exam, TestCase):
+
+    def __init__(self, *args, **kwargs):
+        self.events = []
+        super(Benchmarked, self).__init__(*args, **kwargs)
+
+    @before
+    def set_up(self):
+        self.events.append('before')
+
+    @benchmark(samples=3, min_time=0.0001, baselines=BASELINES)
+    def test_it(self):
+        self.events.append('test')
@@ -19,3 +19,16 @@ def get_prop():
 
 class ThingClass(object):
     prop = True
+
+
+class Service(object):
+
+    def fetch(self, key, default=None):
+        return key
+
+    def store(self, key, value):
+        return True
+
+
+def compute(a, b=2):
+    return a + b
@@ -0,0 +1,35 @@
+#: Test cases the ordering tests reorder, claiming to come from modules of
+#: their own.  Not named test_* so they are not collected on their own.
+from tests import TestCase
+
+from exam.cases import Exam
+from exam.decorators import fixture, patcher
+
+
+class Ordered(Exam):
+
+    def test_a(self):
+        pass
+
+    def test_b(self):
+        pass
+
+
+class Plain(Ordered, TestCase):
+    __module__ = 'plain_module'
+
+
+class ClassScoped(Ordered, TestCase):
+    __module__ = 'plain_module'
+
+    dummy = patcher('tests.dummy.thing', scope='class')
+
+
+class ModuleScoped(Ordered, TestCase):
+    __module__ = 'shared_module'
+
+    data = fixture(list, scope='module')
+
+
+class Neighbour(Ordered, TestCase):
+    __module__ = 'shared_module'
@@ -0,0 +1,49 @@
+#: Test cases the persistence tests run, only ever with the cache directory
+#: patched.  Not named test_* so they are not collected on their own.
+from tests import TestCase
+
+from exam.cases import Exam
+from exam.decorators import fixture
+
+
+#: The argument of every value built, in order.
+builds = []
+
+
+def build_corpus(testcase, size):
+    builds.append(size)
+    return {'words': ['word%d' % index for index in range(size)],
+            'index': bytearray(b'\x01' * size)}
+
+
+class Persisted(Exam, TestCase):
+
+    corpus = fixture(build_corpus, 100, persist=True)
+
+    def test_one(self):
+        self.assertEqual(len(self.corpus['words']), 100)
+
+    def test_two(self):
+        self.assertEqual(len(self.corpus['words']), 100)
+
+
+class Sourced(Exam, TestCase):
+    """
+    Builds its ``data`` from the ``source`` of each subclass.
+    """
+
+    @fixture(persist=True)
+    def data(self):
+        builds.append(self.source)
+        return 'built for %s' % self.source
+
+    def test_it(self):
+        self.seen = self.data
+
+
+class SourcedFromA(Sourced):
+    source = 'a'
+
+
+class SourcedFromB(Sourced):
+    source = 'b'
@@ -0,0 +1,41 @@
+#: Test cases the runner tests run.  Not named test_* so they are not
+#: collected on their own.
+from tests import TestCase
+
+from exam.cases import Exam
+from exam.decorators import before, fixture, patcher
+
+
+class Passing(Exam, TestCase):
+
+    calls = fixture(list)
+    dummy_it = patcher('tests.dummy.it', return_value=3)
+
+    @before
+    def add_call(self):
+        self.calls.append('before')
+
+    def test_one(self):
+        from tests.dummy import get_it
+        self.assertEqual(self.calls, ['before'])
+        self.assertEqual(get_it()(), 3)
+
+    def test_two(self):
+        self.assertEqual(self.calls, ['before'])
+
+
+class Failing(Exam, TestCase):
+
+    def test_fails(self):
+        self.assertEqual(1, 2)
+
+    def test_errors(self):
+        raise KeyError('boom')
+
+    def test_skips(self):
+        self.skipTest('not today')
+
+    def test_subtests(self):
+        for i in range(3):
+            with self.subTest(i=i):
+                self.assertEqual(i, 0)
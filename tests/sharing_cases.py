@@ -0,0 +1,36 @@
+#: Test cases the sharing tests run over several worker processes.  Not named
+#: test_* so they are not collected on their own.
+from tests import TestCase
+import array
+import os
+
+from exam.cases import Exam
+from exam.decorators import fixture
+
+
+def build_table(testcase):
+    # Every process that builds the table says so in the file the test
+    # running the workers points at.
+    with open(os.environ['EXAM_SHARING_BUILDS'], 'a') as builds:
+        builds.write('%d\n' % os.getpid())
+
+    return array.array('i', range(1000))
+
+
+table = fixture(build_table, shared=True)
+
+
+class First(Exam, TestCase):
+
+    table = table
+
+    def test_reads_the_table(self):
+        self.assertEqual(self.table[999], 999)
+
+
+class Second(Exam, TestCase):
+
+    table = table
+
+    def test_reads_the_table(self):
+        self.assertEqual(self.table.tolist(), list(range(1000)))
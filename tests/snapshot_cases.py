@@ -0,0 +1,71 @@
+#: Test cases the snapshot tests run.  Not named test_* so they are not
+#: collected on their own.
+from tests import TestCase
+
+from exam.cases import Exam
+from exam.decorators import fixture
+
+
+#: The strategy of every graph built, in order.
+builds = []
+
+
+class Record(object):
+
+    def __init__(self, name, tags):
+        self.name = name
+        self.tags = tags
+
+
+def build_graph():
+    return {'records': [Record('record%d' % index, ['tag'])
+                        for index in range(3)],
+            'names': ('a', 'b'),
+            'counts': {'a': 1},
+            'seen': set([1, 2]),
+            'payload': bytearray(b'abc')}
+
+
+def mutate(graph):
+    graph['records'][0].tags.append('changed')
+    graph['records'].append(None)
+    graph['counts']['b'] = 2
+    graph['seen'].add(3)
+    graph['payload'][0:1] = b'x'
+
+
+def build_recorded_graph(testcase, strategy):
+    builds.append(strategy)
+    return build_graph()
+
+
+class Snapshotted(Exam):
+    """
+    Mutates its ``graph`` in every test, which must not leak to the next one.
+    """
+
+    def test_one(self):
+        self.assertEqual(self.graph['counts'], {'a': 1})
+        mutate(self.graph)
+
+    def test_two(self):
+        self.assertEqual(self.graph['counts'], {'a': 1})
+        mutate(self.graph)
+
+
+class DeepcopySnapshotted(Snapshotted, TestCase):
+    graph = fixture(build_recorded_graph, 'deepcopy', snapshot='deepcopy')
+
+
+class PickleSnapshotted(Snapshotted, TestCase):
+    graph = fixture(build_recorded_graph, 'pickle', snapshot='pickle')
+
+
+class StructuralSnapshotted(Snapshotted, TestCase):
+    graph = fixture(build_recorded_graph, 'structural', snapshot='structural')
+
+
+#: The case of each strategy.
+BY_STRATEGY = {'deepcopy': DeepcopySnapshotted,
+               'pickle': PickleSnapshotted,
+               'structural': StructuralSnapshotted}
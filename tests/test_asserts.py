@@ -1,4 +1,8 @@
 from tests import TestCase
+from mock import Mock
+import time
+
+from tests import dummy
 
 from exam import Exam, fixture
 from exam.asserts import AssertsMixin
@@ -61,3 +65,110 @@ class AssertChangesMixin(Exam, TestCase):
         with self.assertRaisesRegexp(AssertionError, msg):
             with self.assertChanges(len, self.thing, after=3):
                 self.thing.append(1)
+
+
+class TestAssertFasterThan(Exam, TestCase):
+
+    def test_passes_when_the_block_is_within_budget(self):
+        with self.assertFasterThan(1) as budget:
+            pass
+
+        self.assertLess(budget.used, 1)
+
+    def test_raises_assertion_error_when_over_budget(self):
+        msg = 'of wall time, over the budget of 0.001s'
+        with self.assertRaisesRegexp(AssertionError, msg):
+            with self.assertFasterThan(0.001):
+                time.sleep(0.01)
+
+    def test_can_budget_cpu_time_instead(self):
+        with self.assertFasterThan(1, cpu=True):
+            time.sleep(0.01)
+
+    def test_calls_a_callable_after_warming_it_up(self):
+        calls = []
+        self.assertFasterThan(1, calls.append, 1, warmup=2, repeat=3)
+
+        self.assertEqual(calls, [1] * 5)
+
+    def test_checks_the_fastest_of_the_repeats(self):
+        delays = [0.02, 0]
+        self.assertFasterThan(0.01, lambda: time.sleep(delays.pop()),
+                              repeat=2)
+
+    def test_only_a_callable_can_be_repeated(self):
+        with self.assertRaises(TypeError):
+            self.assertFasterThan(1, repeat=2)
+
+    def test_reraises_exception_if_raised_in_context(self):
+        with self.assertRaises(NameError):
+            with self.assertFasterThan(0):
+                undefined_name
+
+
+class TestAssertMaxAllocations(Exam, TestCase):
+
+    def test_passes_when_the_block_is_within_budget(self):
+        with self.assertMaxAllocations(4096):
+            pass
+
+    def test_raises_assertion_error_when_allocating_too_much(self):
+        with self.assertRaisesRegexp(AssertionError, 'Allocated 8'):
+            with self.assertMaxAllocations(4096):
+                [None] * 100000
+
+    def test_can_budget_blocks_left_allocated(self):
+        kept = []
+
+        with self.assertRaisesRegexp(AssertionError, 'memory blocks'):
+            self.assertMaxAllocations(
+                None, lambda: kept.extend(object() for _ in range(100)),
+                blocks=10)
+
+    def test_blocks_freed_again_are_not_counted(self):
+        budget = self.assertMaxAllocations(
+            None, lambda: [object() for _ in range(100)], blocks=10)
+
+        self.assertLess(budget.used[1], 10)
+
+
+class TestAssertMaxCalls(Exam, TestCase):
+
+    mock = fixture(Mock)
+
+    def test_counts_calls_to_a_mock(self):
+        with self.assertMaxCalls(self.mock, 2) as budget:
+            self.mock()
+            self.mock()
+
+        self.assertEqual(budget.used, 2)
+
+    def test_raises_assertion_error_when_called_too_often(self):
+        msg = 'Called tests.dummy.compute 2 times, over the budget of 1'
+        with self.assertRaisesRegexp(AssertionError, msg):
+            with self.assertMaxCalls('tests.dummy.compute', 1):
+                self.assertEqual(dummy.compute(1), 3)
+                dummy.compute(2)
+
+    def test_patches_only_while_counting(self):
+        compute = dummy.compute
+        self.assertMaxCalls('tests.dummy.compute', 1, dummy.compute, 1)
+
+        self.assertIs(dummy.compute, compute)
+
+    def test_methods_are_called_with_their_instance(self):
+        budget = self.assertMaxCalls(
+            'tests.dummy.Service.fetch', 1,
+            lambda: self.assertEqual(dummy.Service().fetch('key'), 'key'))
+
+        self.assertEqual(budget.used, 1)
+
+    def test_checks_every_repeat(self):
+        counts = [1, 2]
+
+        def call_mock():
+            for _ in range(counts.pop()):
+                self.mock()
+
+        with self.assertRaises(AssertionError):
+            self.assertMaxCalls(self.mock, 1, call_mock, repeat=2)
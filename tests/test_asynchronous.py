@@ -0,0 +1,133 @@
+import unittest
+
+from tests import TestCase, run_tests
+from tests import async_cases as cases
+
+from exam.decorators import fixture
+from exam.cases import hook_plan
+
+
+def names(case):
+    return [name for name, _ in case.events]
+
+
+class TestAsyncHooksOnPlainTestCases(TestCase):
+
+    def test_hooks_and_fixtures_run_in_order_on_one_loop(self):
+        result, (case,) = run_tests(cases.PlainHooked)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(names(case), [
+            'begin', 'connect', 'open session', 'login connection',
+            'plain before', 'test', 'logout session', 'close session',
+            'rollback'])
+        self.assertEqual(len(set(loop for _, loop in case.events if loop)), 1)
+
+    def test_each_test_gets_a_loop_of_its_own(self):
+        _, tests = run_tests(cases.PlainHooked, 'test_it', 'test_other')
+
+        loops = set(loop for case in tests for name, loop in case.events
+                    if name == 'begin')
+        self.assertEqual(len(loops), 2)
+        self.assertTrue(all(loop.is_closed() for loop in loops))
+
+    def test_tests_can_run_loops_of_their_own(self):
+        result, _ = run_tests(cases.PlainHooked,
+                              'test_runs_a_loop_of_its_own')
+
+        self.assertTrue(result.wasSuccessful())
+
+    def test_arounds_and_fixtures_finish_when_a_before_fails(self):
+        case = cases.FailingBefore('test_it')
+
+        self.assertRaises(ValueError, case.run, unittest.TestResult())
+        self.assertEqual(names(case)[-2:], ['close session', 'rollback'])
+        self.assertNotIn('test', names(case))
+
+    def test_plans_know_whether_they_are_async(self):
+        self.assertTrue(hook_plan(cases.PlainHooked).is_async)
+        self.assertFalse(hook_plan(cases.Synchronous).is_async)
+
+
+class TestAsyncHooksOnIsolatedTestCases(TestCase):
+
+    def test_setup_body_and_teardown_share_the_test_loop(self):
+        result, (case,) = run_tests(cases.IsolatedHooked)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(names(case), [
+            'begin', 'connect', 'open session', 'login connection',
+            'plain before', 'test connection', 'logout session',
+            'close session', 'rollback'])
+        self.assertEqual(len(set(loop for _, loop in case.events if loop)), 1)
+
+    def test_arounds_and_fixtures_finish_when_the_test_fails(self):
+        result, (case,) = run_tests(cases.IsolatedHooked, 'test_fails')
+
+        self.assertEqual(len(result.failures), 1)
+        self.assertEqual(names(case)[-3:],
+                         ['logout session', 'close session', 'rollback'])
+
+    def test_sync_hooks_and_patchers_work_too(self):
+        result, (case,) = run_tests(cases.IsolatedSynchronous)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(len(set(case.loops)), 1)
+
+
+class TestAsyncFixtures(TestCase):
+
+    def test_async_fixtures_see_patched_targets(self):
+        for case_class in (cases.PlainPatchedFixture,
+                           cases.IsolatedPatchedFixture):
+            result, _ = run_tests(case_class)
+            self.assertTrue(result.wasSuccessful(), result.failures)
+
+    def test_tests_that_say_what_they_use_await_only_that(self):
+        result, (case,) = run_tests(cases.UsesOne)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(case.built, ['used'])
+
+    def test_async_fixtures_cannot_be_scoped(self):
+        async def build(self):
+            pass
+
+        self.assertRaises(ValueError, fixture, build, scope='class')
+        self.assertRaises(ValueError, fixture(scope='session'), build)
+
+    def test_async_fixtures_outside_exam_raise_runtime_error(self):
+        self.assertRaises(RuntimeError, getattr, cases.NotExam('test_it'),
+                          'connection')
+
+
+class TestConcurrentAsyncBefores(TestCase):
+
+    def test_async_and_sync_hooks_of_a_batch_run_at_the_same_time(self):
+        result, _ = run_tests(cases.ConcurrentBefores)
+
+        self.assertTrue(result.wasSuccessful())
+
+    def test_first_failure_in_plan_order_is_raised(self):
+        result, _ = run_tests(cases.FailingConcurrentBefores)
+
+        self.assertEqual(len(result.errors), 1)
+        self.assertIn('ValueError: late', result.errors[0][1])
+
+
+class TestTimingAsyncHooks(TestCase):
+
+    def test_async_hooks_and_fixtures_are_timed(self):
+        import exam.timing
+
+        recorder = exam.timing.enable()
+        self.addCleanup(exam.timing.disable)
+
+        run_tests(cases.PlainHooked)
+        records, = recorder.tests.values()
+        seen = set((phase, name.split('.')[-1]) for phase, name, _ in records)
+
+        self.assertTrue(set([
+            ('fixture', 'connection'), ('fixture', 'session'),
+            ('around', 'transaction'), ('before', 'login'),
+            ('after', 'logout'), ('test', 'test_it')]) <= seen)
@@ -0,0 +1,94 @@
+from tests import TestCase, run_tests
+from mock import patch
+import json
+import os
+
+from exam.benchmarking import percentile, statistics, save_baseline
+from exam.decorators import benchmark
+
+from tests import benchmark_cases as cases
+
+
+class TestStatistics(TestCase):
+
+    def test_percentile_interpolates(self):
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 50), 3)
+        self.assertEqual(percentile([1, 2, 3, 4], 50), 2.5)
+        self.assertEqual(percentile([1, 2, 3, 4, 5], 25), 2)
+
+    def test_statistics_describe_the_samples(self):
+        stats = statistics([5, 1, 4, 2, 3], 10)
+
+        self.assertEqual(stats['median'], 3)
+        self.assertEqual(stats['iqr'], 2)
+        self.assertEqual((stats['min'], stats['max']), (1, 5))
+        self.assertEqual((stats['samples'], stats['number']), (5, 10))
+        self.assertAlmostEqual(stats['p95'], 4.8)
+
+
+class TestBenchmark(TestCase):
+
+    def setUp(self):
+        self.remove_baselines()
+        self.addCleanup(self.remove_baselines)
+
+    def remove_baselines(self):
+        if os.path.exists(cases.BASELINES):
+            os.remove(cases.BASELINES)
+
+    def saved(self):
+        with open(cases.BASELINES) as baselines_file:
+            return json.load(baselines_file)
+
+    def test_runs_the_body_many_times_after_the_hooks_once(self):
+        _, (case,) = run_tests(cases.Benchmarked)
+
+        self.assertEqual(case.events.count('before'), 1)
+        self.assertGreater(case.events.count('test'), 3)
+        self.assertEqual(case.events[0], 'before')
+
+    def test_passes_without_a_baseline(self):
+        result, (case,) = run_tests(cases.Benchmarked)
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertIn('median', case.benchmark_stats)
+        self.assertFalse(os.path.exists(cases.BASELINES))
+
+    def test_writes_the_baseline_when_updating(self):
+        with patch('exam.benchmarking.update', True):
+            _, (case,) = run_tests(cases.Benchmarked)
+
+        self.assertEqual(list(self.saved().values()), [case.benchmark_stats])
+
+    def test_keeps_other_baselines_when_updating(self):
+        save_baseline(cases.BASELINES, 'other', {'median': 1})
+
+        with patch('exam.benchmarking.update', True):
+            run_tests(cases.Benchmarked)
+
+        self.assertEqual(len(self.saved()), 2)
+
+    def test_fails_once_slower_than_the_threshold_allows(self):
+        save_baseline(cases.BASELINES, cases.Benchmarked('test_it').id(),
+                      statistics([1e-12], 1))
+        result, _ = run_tests(cases.Benchmarked)
+
+        self.assertEqual(len(result.failures), 1)
+        self.assertIn('Benchmark regressed', result.failures[0][1])
+
+    def test_passes_when_faster_than_the_baseline(self):
+        save_baseline(cases.BASELINES, cases.Benchmarked('test_it').id(),
+                      statistics([1.0], 1))
+        result, _ = run_tests(cases.Benchmarked)
+
+        self.assertTrue(result.wasSuccessful())
+
+    def test_unknown_options_are_rejected(self):
+        with self.assertRaises(TypeError):
+            benchmark(repeat=3)
+
+    def test_can_be_used_bare(self):
+        def test_it(self):
+            pass
+
+        self.assertEqual(benchmark(test_it).__name__, 'test_it')
@@ -1,8 +1,9 @@
-from mock import sentinel
-from tests import TestCase
+from mock import Mock, sentinel, patch
+from tests import TestCase, run_tests
 
-from exam.decorators import before, after, around, patcher
-from exam.cases import Exam
+from exam.decorators import (before, after, around, patcher, fixture, uses,
+                             parametrize)
+from exam.cases import Exam, hook_plan
 
 from tests.dummy import get_thing, get_it, get_prop, ThingClass
 
@@ -27,7 +28,7 @@ class SimpleTestCase(object):
         # At this point in time, exam has run its before hooks and has super'd
         # to the TestCase (us), so, capture the state of calls
         self.calls_before_run = list(self.calls)
-        self.vars_when_run = vars(self)
+        self.vars_when_run = dict(vars(self))
 
     def addCleanup(self, func):
         self.cleanups.append(func)
@@ -143,6 +144,10 @@ class SubclassedCaseWithPatcherObject(CaseWithPatcherObject):
     pass
 
 
+class CaseWithReassignedHooks(CaseWithBeforeHook):
+    pass
+
+
 # TODO: Make the subclass checking just be a subclass of the test case
 class TestExam(Exam, TestCase):
 
@@ -277,3 +282,853 @@ class TestExam(Exam, TestCase):
 
         [cleanup() for cleanup in case.cleanups]
         self.assertNotEqual(get_prop(), 15)
+
+
+class TestHookPlan(TestCase):
+
+    def test_plan_lists_hooks_in_parent_before_child_order(self):
+        plan = hook_plan(SubclassCaseWithAfterHook)
+        befores = [attr for attr, _ in plan.befores]
+        afters = [attr for attr, _ in plan.afters]
+
+        self.assertEqual(befores[-1], 'run_before')
+        self.assertEqual(afters, ['run_after', 'subclass_run_after'])
+
+    def test_plan_lists_patchers(self):
+        plan = hook_plan(SubclassedCaseWithPatcher)
+        self.assertEqual(sorted(attr for attr, _ in plan.patchers),
+                         ['dummy_it', 'dummy_thing'])
+
+    def test_plan_is_cached_per_class(self):
+        self.assertIs(hook_plan(CaseWithAroundHook),
+                      hook_plan(CaseWithAroundHook))
+
+    def test_run_does_not_walk_the_mro_once_planned(self):
+        hook_plan(CaseWithAfterHook)
+
+        with patch('exam.cases.inspect.getmro') as getmro:
+            CaseWithAfterHook().run()
+
+        self.assertFalse(getmro.called)
+
+    def test_plan_is_rebuilt_when_a_hook_is_added(self):
+        hook_plan(CaseWithReassignedHooks)
+
+        def added(self):
+            self.calls.append('added')
+
+        CaseWithReassignedHooks.added = before(added)
+        case = CaseWithReassignedHooks()
+        case.run()
+
+        self.assertEqual(case.calls_before_run, ['run before', 'added'])
+
+    def test_plan_of_subclass_is_rebuilt_when_parent_hook_is_replaced(self):
+        hook_plan(SubclassWithBeforeHook)
+        original = CaseWithBeforeHook.run_before
+
+        def replaced(self):
+            self.calls.append('replaced')
+
+        CaseWithBeforeHook.run_before = before(replaced)
+        self.addCleanup(setattr, CaseWithBeforeHook, 'run_before', original)
+
+        case = SubclassWithBeforeHook()
+        case.run()
+
+        self.assertEqual(case.calls_before_run,
+                         ['replaced', 'subclass run before'])
+
+    def test_plan_is_rebuilt_when_a_hook_is_deleted(self):
+        class Case(CaseWithBeforeHook):
+            @before
+            def doomed(self):
+                self.calls.append('doomed')
+
+        hook_plan(Case)
+        del Case.doomed
+        case = Case()
+        case.run()
+
+        self.assertEqual(case.calls_before_run, ['run before'])
+
+    def test_plan_is_rebuilt_when_a_hook_of_a_plain_mixin_is_replaced(self):
+        class Mixin(object):
+            @before
+            def mixed_in(self):
+                self.calls.append('mixed in')
+
+        class Case(Mixin, BaseTestCase):
+            pass
+
+        hook_plan(Case)
+
+        def replaced(self):
+            self.calls.append('replaced')
+
+        Mixin.mixed_in = before(replaced)
+        case = Case()
+        case.run()
+
+        self.assertEqual(case.calls_before_run, ['replaced'])
+
+    def test_plan_is_rebuilt_when_a_mixin_gains_a_hook(self):
+        class Mixin(object):
+            pass
+
+        class Case(Mixin, BaseTestCase):
+            pass
+
+        hook_plan(Case)
+        Mixin.added = before(lambda self: self.calls.append('added'))
+        case = Case()
+        case.run()
+
+        self.assertEqual(case.calls_before_run, ['added'])
+
+    def test_plan_is_rebuilt_when_a_plain_method_is_replaced_by_a_hook(self):
+        class Case(BaseTestCase):
+            def helper(self):
+                pass
+
+        hook_plan(Case)
+        Case.helper = before(lambda self: self.calls.append('helper'))
+        case = Case()
+        case.run()
+
+        self.assertEqual(case.calls_before_run, ['helper'])
+
+    def test_plan_is_rebuilt_when_a_base_method_is_replaced_by_a_hook(self):
+        class Mixin(object):
+            def helper(self):
+                pass
+
+        class Case(Mixin, BaseTestCase):
+            pass
+
+        hook_plan(Case)
+        Mixin.helper = before(lambda self: self.calls.append('helper'))
+        case = Case()
+        case.run()
+
+        self.assertEqual(case.calls_before_run, ['helper'])
+
+    def test_forget_plans_throws_cached_plans_away(self):
+        from exam.cases import forget_plans
+
+        plan = hook_plan(CaseWithBeforeHook)
+        forget_plans()
+
+        self.assertIsNot(hook_plan(CaseWithBeforeHook), plan)
+
+    def test_mixes_with_classes_that_have_a_metaclass_of_their_own(self):
+        import abc
+
+        Abstract = abc.ABCMeta('Abstract', (object,), {})
+
+        class Case(Abstract, CaseWithBeforeHook):
+            pass
+
+        case = Case()
+        case.run()
+
+        self.assertEqual(case.calls_before_run, ['run before'])
+
+
+class TestClassScopedFixturesInSuite(TestCase):
+
+    def test_fixture_is_built_once_and_torn_down_after_class(self):
+        events = []
+
+        class Case(Exam, TestCase):
+
+            @fixture(scope='class')
+            def resource(self):
+                events.append('built')
+                yield 'resource'
+                events.append('torn down')
+
+            def test_one(self):
+                events.append(self.resource)
+
+            def test_two(self):
+                events.append(self.resource)
+
+        result, _ = run_tests(Case, 'test_one', 'test_two')
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(events, ['built', 'resource', 'resource',
+                                  'torn down'])
+
+
+def build_releasing_case(**attrs):
+    class Case(Exam, TestCase):
+
+        payload = fixture(bytearray, 1024 * 1024)
+        dummy_it = patcher('tests.dummy.it')
+
+        def test_it(self):
+            self.payload
+            self.dummy_it()
+
+    for name, value in attrs.items():
+        setattr(Case, name, value)
+
+    return Case
+
+
+class TestReleaseAfterRun(TestCase):
+
+    def test_fixtures_and_patcher_mocks_are_dropped_after_run(self):
+        result, (case,) = run_tests(build_releasing_case())
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(list(k for k in vars(case) if type(k) is fixture),
+                         [])
+        self.assertNotIn('dummy_it', vars(case))
+
+    def test_release_can_be_turned_off(self):
+        result, (case,) = run_tests(
+            build_releasing_case(release_after_run=False))
+        self.assertTrue(result.wasSuccessful())
+        self.assertTrue(any(type(k) is fixture for k in vars(case)))
+        self.assertIn('dummy_it', vars(case))
+
+    def test_memory_stays_flat_as_tests_pile_up_in_the_suite(self):
+        import tracemalloc
+
+        case_class = build_releasing_case()
+        run_tests(case_class)  # warm up imports and caches
+
+        tracemalloc.start()
+        self.addCleanup(tracemalloc.stop)
+
+        run_tests(case_class, *['test_it'] * 5)
+        few, _ = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        result, tests = run_tests(case_class, *['test_it'] * 50)
+        many, peak = tracemalloc.get_traced_memory()
+
+        # Each test builds a 1MB fixture; none of them may stay alive.
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(len(tests), 50)
+        self.assertLess(many - few, 1024 * 1024)
+        self.assertLess(peak, 4 * 1024 * 1024)
+
+
+class TestClassScopedPatcher(TestCase):
+
+    def test_patch_is_started_once_and_stopped_after_the_class(self):
+        seen = []
+
+        class Case(Exam, TestCase):
+
+            dummy_it = patcher('tests.dummy.it', scope='class')
+
+            def test_one(self):
+                seen.append(get_it())
+
+            def test_two(self):
+                seen.append(get_it())
+
+        original = get_it()
+        result, _ = run_tests(Case, 'test_one', 'test_two')
+        self.assertEqual(result.failures + result.errors, [])
+        Case.tearDownClass()
+
+        self.assertIs(seen[0], seen[1])
+        self.assertIsNot(seen[0], original)
+        self.assertIs(get_it(), original)
+
+    def test_patch_is_stopped_when_tear_down_class_skips_exam(self):
+        if not hasattr(TestCase, 'addClassCleanup'):
+            self.skipTest('class cleanups need Python 3.8')
+
+        original = get_it()
+
+        class Case(Exam, TestCase):
+
+            dummy_it = patcher('tests.dummy.it', scope='class')
+
+            @classmethod
+            def tearDownClass(cls):
+                pass
+
+            def test_one(self):
+                self.assertIsNot(get_it(), original)
+
+        result, _ = run_tests(Case, 'test_one')
+
+        self.assertEqual(result.failures + result.errors, [])
+        self.assertIs(get_it(), original)
+
+    def test_calls_return_values_and_side_effects_are_reset(self):
+        seen = []
+
+        class Case(Exam, TestCase):
+
+            dummy_it = patcher('tests.dummy.it', scope='class',
+                               return_value=12)
+
+            def test_one(self):
+                self.assertEqual(get_it()(), 12)
+                self.dummy_it.return_value = 13
+                self.dummy_it.side_effect = KeyError
+                self.dummy_it.child.return_value = 14
+
+            def test_two(self):
+                seen.append(self.dummy_it.call_count)
+                seen.append(get_it()())
+                seen.append(self.dummy_it.child())
+
+        result, _ = run_tests(Case, 'test_one', 'test_two')
+        self.assertEqual(result.failures + result.errors, [])
+        Case.tearDownClass()
+
+        self.assertEqual(seen[:2], [0, 12])
+        self.assertNotEqual(seen[2], 14)
+
+    def test_decorated_patcher_configuration_survives_resets(self):
+        seen = []
+
+        class Case(Exam, TestCase):
+
+            @patcher('tests.dummy.it', scope='class')
+            def dummy_it(self):
+                return Mock(return_value='configured')
+
+            def test_one(self):
+                self.dummy_it.return_value = 'changed'
+
+            def test_two(self):
+                seen.append(get_it()())
+
+        result, _ = run_tests(Case, 'test_one', 'test_two')
+        self.assertEqual(result.failures + result.errors, [])
+        Case.tearDownClass()
+
+        self.assertEqual(seen, ['configured'])
+
+    def test_autospecced_classes_keep_returning_specced_instances(self):
+        from tests import dummy
+        seen = []
+
+        class Case(Exam, TestCase):
+
+            service = patcher('tests.dummy.Service', scope='class',
+                              autospec=True)
+
+            def test_one(self):
+                seen.append(dummy.Service())
+                dummy.Service().fetch('key')
+
+            def test_two(self):
+                seen.append(dummy.Service())
+                seen.append(self.service.return_value.fetch.call_count)
+
+        result, _ = run_tests(Case, 'test_one', 'test_two')
+        self.assertEqual(result.failures + result.errors, [])
+        Case.tearDownClass()
+
+        self.assertIs(seen[0], seen[1])
+        self.assertIs(seen[1]._spec_class, dummy.Service)
+        self.assertRaises(AttributeError, getattr, seen[1], 'not_a_method')
+        self.assertEqual(seen[2], 0)
+
+    def test_return_values_set_on_autospecced_instances_are_reset(self):
+        from tests import dummy
+        seen = []
+
+        class Case(Exam, TestCase):
+
+            service = patcher('tests.dummy.Service', scope='class',
+                              autospec=True)
+
+            def test_one(self):
+                dummy.Service().fetch.return_value = 'dirty'
+                dummy.Service().store.side_effect = KeyError
+
+            def test_two(self):
+                seen.append(dummy.Service().fetch('key'))
+                seen.append(dummy.Service().store('key', 'value'))
+
+        result, _ = run_tests(Case, 'test_one', 'test_two')
+        self.assertEqual(result.failures + result.errors, [])
+        Case.tearDownClass()
+
+        self.assertNotEqual(seen[0], 'dirty')
+        self.assertEqual(len(seen), 2)
+
+    def test_autospecced_functions_are_reset(self):
+        from tests import dummy
+        seen = []
+
+        class Case(Exam, TestCase):
+
+            compute = patcher('tests.dummy.compute', scope='class',
+                              autospec=True)
+
+            def test_one(self):
+                self.compute.return_value = 5
+                dummy.compute(1)
+
+            def test_two(self):
+                seen.append(self.compute.call_count)
+                seen.append(dummy.compute(1))
+
+        result, _ = run_tests(Case, 'test_one', 'test_two')
+        self.assertEqual(result.failures + result.errors, [])
+        Case.tearDownClass()
+
+        self.assertEqual(seen[0], 0)
+        self.assertNotEqual(seen[1], 5)
+
+    def test_calls_reset_keeps_return_values(self):
+        seen = []
+
+        class Case(Exam, TestCase):
+
+            dummy_it = patcher('tests.dummy.it', scope='class',
+                               reset='calls')
+
+            def test_one(self):
+                self.dummy_it.return_value = 13
+                get_it()()
+
+            def test_two(self):
+                seen.append(self.dummy_it.call_count)
+                seen.append(get_it()())
+
+        result, _ = run_tests(Case, 'test_one', 'test_two')
+        self.assertEqual(result.failures + result.errors, [])
+        Case.tearDownClass()
+
+        self.assertEqual(seen, [0, 13])
+
+    def test_no_reset_keeps_everything(self):
+        seen = []
+
+        class Case(Exam, TestCase):
+
+            dummy_it = patcher('tests.dummy.it', scope='class', reset=None)
+
+            def test_one(self):
+                get_it()()
+
+            def test_two(self):
+                seen.append(self.dummy_it.call_count)
+
+        result, _ = run_tests(Case, 'test_one', 'test_two')
+        self.assertEqual(result.failures + result.errors, [])
+        Case.tearDownClass()
+
+        self.assertEqual(seen, [1])
+
+    def test_stubs_can_be_class_scoped_patches(self):
+        from exam.mock import Stub
+        seen = []
+
+        class Case(Exam, TestCase):
+
+            dummy_it = patcher('tests.dummy.it', scope='class',
+                               new_callable=Stub, return_value=12)
+
+            def test_one(self):
+                self.dummy_it.return_value = 13
+                get_it()()
+
+            def test_two(self):
+                seen.append(self.dummy_it.call_count)
+                seen.append(get_it()())
+
+        result, _ = run_tests(Case, 'test_one', 'test_two')
+        self.assertEqual(result.failures + result.errors, [])
+
+        self.assertEqual(seen, [0, 12])
+
+    def test_unknown_scope_or_reset_raises_value_error(self):
+        self.assertRaises(ValueError, patcher, 'a.b', scope='galaxy')
+        self.assertRaises(ValueError, patcher, 'a.b', reset='some')
+
+
+class TestConcurrentBefores(TestCase):
+
+    def test_concurrent_hooks_of_a_class_run_at_the_same_time(self):
+        import threading
+
+        # Deadlocks (and times out) unless both hooks run at once.
+        barrier = threading.Barrier(2, timeout=5)
+
+        class Case(Exam, TestCase):
+
+            @before(concurrent=True)
+            def seed_database(self):
+                barrier.wait()
+
+            @before(concurrent=True)
+            def prime_cache(self):
+                barrier.wait()
+
+            def test_it(self):
+                pass
+
+        run_tests(Case)
+        self.assertFalse(barrier.broken)
+
+    def test_parent_hooks_finish_before_child_hooks_start(self):
+        import time
+
+        events = []
+
+        class Parent(Exam, TestCase):
+
+            @before(concurrent=True)
+            def slow_parent(self):
+                time.sleep(0.05)
+                events.append('slow parent')
+
+            @before(concurrent=True)
+            def fast_parent(self):
+                events.append('fast parent')
+
+            def test_it(self):
+                pass
+
+        class Child(Parent):
+
+            @before(concurrent=True)
+            def child(self):
+                events.append('child')
+
+        run_tests(Child)
+        self.assertEqual(sorted(events[:2]), ['fast parent', 'slow parent'])
+        self.assertEqual(events[2], 'child')
+
+    def test_first_failure_in_plan_order_is_raised(self):
+        import time
+
+        finished = []
+
+        class Case(Exam, TestCase):
+
+            @before(concurrent=True)
+            def fails_late(self):
+                time.sleep(0.05)
+                finished.append('late')
+                raise ValueError('late')
+
+            @before(concurrent=True)
+            def fails_early(self):
+                raise KeyError('early')
+
+            def test_it(self):
+                pass
+
+        self.assertRaises(ValueError, run_tests, Case)
+        self.assertEqual(finished, ['late'])
+
+    def test_concurrent_hooks_build_shared_fixtures_once(self):
+        import threading
+        import time
+
+        barrier = threading.Barrier(2, timeout=5)
+        built = []
+
+        class Case(Exam, TestCase):
+
+            @fixture
+            def database(self):
+                time.sleep(0.01)
+                built.append(True)
+                return object()
+
+            @before(concurrent=True)
+            def first(self):
+                barrier.wait()
+                self.first_database = self.database
+
+            @before(concurrent=True)
+            def second(self):
+                barrier.wait()
+                self.second_database = self.database
+
+            def test_it(self):
+                pass
+
+        _, (case,) = run_tests(Case)
+        self.assertEqual(len(built), 1)
+        self.assertIs(case.first_database, case.second_database)
+
+    def test_plan_batches_neighbouring_concurrent_hooks_of_a_class(self):
+        class Parent(Exam, TestCase):
+
+            @before(concurrent=True)
+            def one(self):
+                pass
+
+            @before(concurrent=True)
+            def two(self):
+                pass
+
+            @before
+            def three(self):
+                pass
+
+            @before(concurrent=True)
+            def four(self):
+                pass
+
+        class Child(Parent):
+
+            @before(concurrent=True)
+            def five(self):
+                pass
+
+        batches = [[attr for attr, _ in batch]
+                   for batch in hook_plan(Child).before_batches]
+        self.assertEqual(batches, [['_Exam__setup_patchers'],
+                                   ['_Exam__warm_fixtures'], ['one', 'two'],
+                                   ['three'], ['four'], ['five']])
+
+    def test_unknown_options_raise_type_error(self):
+        self.assertRaises(TypeError, before, parallel=True)
+
+
+def build_dependent_case(built):
+
+    class Case(Exam, TestCase):
+
+        @fixture
+        def database(self):
+            built.append('database')
+
+        @fixture(depends=['database'])
+        def user(self):
+            built.append('user')
+
+        @fixture(depends=['user', 'database'], eager=True)
+        def session(self):
+            built.append('session')
+
+        @fixture
+        def unrelated(self):
+            built.append('unrelated')
+
+        @before
+        def check(self):
+            built.append('before')
+
+        def test_it(self):
+            pass
+
+        @uses('user')
+        def test_uses_user(self):
+            pass
+
+    return Case
+
+
+class TestFixtureDependencies(TestCase):
+
+    def test_fixtures_are_sorted_into_levels_by_dependencies(self):
+        levels = hook_plan(build_dependent_case([])).fixture_levels
+        self.assertEqual([sorted(attr for attr, _ in level)
+                          for level in levels],
+                         [['database', 'unrelated'], ['user'], ['session']])
+
+    def test_eager_fixtures_are_warmed_in_order_before_hooks_run(self):
+        built = []
+        result, _ = run_tests(build_dependent_case(built))
+        self.assertTrue(result.wasSuccessful(), result.errors)
+        self.assertEqual(built, ['database', 'user', 'session', 'before'])
+
+    def test_uses_warms_only_what_the_test_needs(self):
+        built = []
+        result, _ = run_tests(build_dependent_case(built), 'test_uses_user')
+        self.assertTrue(result.wasSuccessful(), result.errors)
+        self.assertEqual(built, ['database', 'user', 'before'])
+
+    def test_cycles_raise_value_error_when_the_class_is_created(self):
+        def build():
+            class Case(Exam, TestCase):
+                one = fixture(object, depends=['two'])
+                two = fixture(object, depends=['three'])
+                three = fixture(object, depends=['two'])
+
+        with self.assertRaises(ValueError) as context:
+            build()
+
+        self.assertIn('two -> three -> two', str(context.exception))
+
+    def test_unknown_dependencies_raise_value_error_when_warmed(self):
+        class Case(Exam, TestCase):
+            base = fixture(object)
+            thing = fixture(list, depends=['bsae'], eager=True)
+
+            def test_it(self):
+                pass
+
+        with self.assertRaises(ValueError) as context:
+            run_tests(Case)
+
+        self.assertIn('Fixture thing depends on unknown fixtures: bsae',
+                      str(context.exception))
+
+    def test_bases_can_leave_dependencies_to_subclasses(self):
+        class Base(Exam, TestCase):
+            user = fixture(dict, depends=['config'], eager=True)
+
+        class Case(Base):
+            config = fixture(dict)
+
+            def test_it(self):
+                self.assertIn(Case.config, self.__dict__)
+
+        result, _ = run_tests(Case)
+        self.assertTrue(result.wasSuccessful(), result.errors)
+
+    def test_dependencies_replaced_by_plain_attributes_are_left_out(self):
+        class Case(Exam, TestCase):
+            base = fixture(object)
+            thing = fixture(list, depends=['base'], eager=True)
+
+        class Replaced(Case):
+            base = None
+
+            def test_it(self):
+                self.assertEqual(self.__dict__[Case.thing], [])
+
+        result, _ = run_tests(Replaced)
+        self.assertTrue(result.wasSuccessful(), result.errors)
+
+    def test_options_are_not_passed_to_the_fixture(self):
+        class Case(Exam, TestCase):
+            thing = fixture(dict, a=1, depends=[], eager=True,
+                            concurrent=True)
+
+            def test_it(self):
+                self.assertEqual(self.thing, {'a': 1})
+
+        result, _ = run_tests(Case)
+        self.assertTrue(result.wasSuccessful(), result.errors)
+
+    def test_concurrent_fixtures_of_a_level_are_built_at_the_same_time(self):
+        import threading
+
+        # Deadlocks (and times out) unless both are built at once.
+        barrier = threading.Barrier(2, timeout=5)
+
+        class Case(Exam, TestCase):
+
+            @fixture(eager=True, concurrent=True)
+            def cache(self):
+                return barrier.wait()
+
+            @fixture(eager=True, concurrent=True)
+            def database(self):
+                return barrier.wait()
+
+            def test_it(self):
+                pass
+
+        result, _ = run_tests(Case)
+        self.assertTrue(result.wasSuccessful(), result.errors)
+        self.assertFalse(barrier.broken)
+
+
+def build_parametrized_case(events, rows):
+
+    class Case(Exam, TestCase):
+
+        dummy_it = patcher('tests.dummy.it', return_value=1)
+
+        @fixture
+        def calls(self):
+            events.append('calls')
+            return []
+
+        @fixture
+        def shared(self):
+            shared = []
+            events.append(shared)
+            return shared
+
+        @before
+        def set_up(self):
+            events.append('before')
+            self.shared.append('before')
+            self.dummy_it.return_value = 2
+
+        @parametrize(*rows)
+        def test_it(self, value, expected=None):
+            self.calls.append(value)
+            self.shared.append(value)
+            self.assertEqual(self.calls, [value])
+            self.assertEqual(get_it()(), 2)
+            self.assertEqual(self.dummy_it.call_count, 1)
+            self.dummy_it.return_value = 'row %s' % value
+            self.assertEqual(value, expected)
+
+    return Case
+
+
+class TestParametrize(TestCase):
+
+    def test_rows_run_under_one_setup(self):
+        events = []
+        result, _ = run_tests(
+            build_parametrized_case(events, [(1, 1), (2, 2), (3, 3)]))
+
+        self.assertTrue(result.wasSuccessful(), result.failures)
+        self.assertEqual(events.count('before'), 1)
+        self.assertIn(['before', 1, 2, 3], events)
+
+    def test_fixtures_built_by_a_row_are_built_again_for_the_next(self):
+        events = []
+        run_tests(build_parametrized_case(events, [(1, 1), (2, 2)]))
+
+        self.assertEqual(events.count('calls'), 2)
+
+    def test_return_values_set_by_a_row_are_reset_for_the_next(self):
+        result, _ = run_tests(build_parametrized_case([], [(1, 1), (2, 2)]))
+
+        self.assertTrue(result.wasSuccessful(), result.failures)
+
+    def test_rows_can_be_keyword_arguments_or_single_values(self):
+        result, _ = run_tests(build_parametrized_case(
+            [], [{'value': 1, 'expected': 1}, None]))
+
+        self.assertTrue(result.wasSuccessful(), result.failures)
+
+    def test_autospecced_mocks_are_put_back_as_the_hooks_left_them(self):
+        from tests import dummy
+        seen = []
+
+        class Case(Exam, TestCase):
+
+            service = patcher('tests.dummy.Service', autospec=True)
+
+            @before
+            def configure(self):
+                self.service.return_value.store.return_value = 'hook'
+
+            @parametrize(1, 2)
+            def test_it(self, value):
+                seen.append(dummy.Service().fetch('key'))
+                seen.append(dummy.Service().store('key', 'value'))
+                dummy.Service().fetch.return_value = 'row %s' % value
+                dummy.Service().store.return_value = 'row %s' % value
+
+        result, _ = run_tests(Case)
+
+        self.assertTrue(result.wasSuccessful(), result.errors)
+        self.assertEqual(len(seen), 4)
+        self.assertNotEqual(seen[2], 'row 1')
+        self.assertEqual(seen[3], 'hook')
+
+    def test_each_failing_row_is_reported_as_a_subtest(self):
+        result, _ = run_tests(
+            build_parametrized_case([], [(1, 2), (2, 2), (3, 4)]))
+
+        self.assertEqual(len(result.failures), 2)
+        self.assertIn('case=0', str(result.failures[0][0]))
+        self.assertIn('case=2', str(result.failures[1][0]))
@@ -1,6 +1,7 @@
 from tests import TestCase
 
 from exam.decorators import fixture
+import exam.scopes
 
 
 class Outer(object):
@@ -80,3 +81,95 @@ class TestFixture(TestCase):
 
     def test_clas_access_returns_fixture_itself(self):
         self.assertEqual(getattr(Dummy, 'number'), Dummy.number)
+
+
+class ClassScoped(object):
+
+    built = []
+    torn_down = []
+
+    @fixture(scope='class')
+    def expensive(self):
+        ClassScoped.built.append(self)
+        yield object()
+        ClassScoped.torn_down.append(self)
+
+    shared_list = fixture(list, scope='class')
+
+
+class ExtendedClassScoped(ClassScoped):
+    pass
+
+
+class TestClassScopedFixture(TestCase):
+
+    def setUp(self):
+        ClassScoped.built[:] = []
+        ClassScoped.torn_down[:] = []
+        self.addCleanup(exam.scopes.close_class, ClassScoped)
+        self.addCleanup(exam.scopes.close_class, ExtendedClassScoped)
+
+    def test_value_is_shared_between_instances_of_the_class(self):
+        self.assertIs(ClassScoped().expensive, ClassScoped().expensive)
+        self.assertEqual(len(ClassScoped.built), 1)
+
+    def test_inline_fixtures_can_be_class_scoped(self):
+        self.assertIs(ClassScoped().shared_list, ClassScoped().shared_list)
+
+    def test_each_subclass_gets_its_own_value(self):
+        self.assertIsNot(ClassScoped().expensive,
+                         ExtendedClassScoped().expensive)
+
+    def test_generator_fixture_is_torn_down_when_class_scope_closes(self):
+        ClassScoped().expensive
+        self.assertEqual(ClassScoped.torn_down, [])
+
+        exam.scopes.close_class(ClassScoped)
+
+        self.assertEqual(ClassScoped.torn_down, ClassScoped.built)
+
+    def test_value_is_rebuilt_after_class_scope_closes(self):
+        first = ClassScoped().expensive
+        exam.scopes.close_class(ClassScoped)
+        self.assertIsNot(ClassScoped().expensive, first)
+
+    def test_unknown_scope_raises_value_error(self):
+        self.assertRaises(ValueError, fixture, list, scope='galaxy')
+
+
+class ModuleAndSessionScoped(object):
+
+    per_module = fixture(object, scope='module')
+    per_session = fixture(object, scope='session')
+
+
+class ModuleAndSessionScopedElsewhere(ModuleAndSessionScoped):
+    pass
+
+
+ModuleAndSessionScopedElsewhere.__module__ = 'tests.elsewhere'
+
+
+class TestModuleAndSessionScopedFixture(TestCase):
+
+    def tearDown(self):
+        exam.scopes.close_module(__name__)
+        exam.scopes.close_module('tests.elsewhere')
+        exam.scopes.registry.close('session')
+
+    def test_module_scoped_value_is_shared_within_a_module(self):
+        self.assertIs(ModuleAndSessionScoped().per_module,
+                      ModuleAndSessionScoped().per_module)
+
+    def test_module_scoped_value_differs_between_modules(self):
+        self.assertIsNot(ModuleAndSessionScoped().per_module,
+                         ModuleAndSessionScopedElsewhere().per_module)
+
+    def test_session_scoped_value_is_shared_across_modules(self):
+        self.assertIs(ModuleAndSessionScoped().per_session,
+                      ModuleAndSessionScopedElsewhere().per_session)
+
+    def test_closing_module_scope_rebuilds_value(self):
+        first = ModuleAndSessionScoped().per_module
+        exam.scopes.close_module(__name__)
+        self.assertIsNot(ModuleAndSessionScoped().per_module, first)
@@ -1,8 +1,9 @@
 from tests import TestCase
-from mock import patch, Mock, sentinel
+from mock import patch, Mock, sentinel, ANY
 
 from exam.helpers import intercept, rm_f, track, mock_import, call, effect
 from exam.decorators import fixture
+from exam.mock import Stub
 
 
 @patch('exam.helpers.shutil')
@@ -36,6 +37,16 @@ class TestTrack(TestCase):
         self.assertEqual(tracker.foo, self.foo_mock)
         self.assertEqual(tracker.bar, self.bar_mock)
 
+    def test_tracks_stubs_alongside_mocks(self):
+        stub = Stub()
+        tracker = track(foo=self.foo_mock, stub=stub)
+
+        self.foo_mock(1)
+        stub(2)
+
+        self.assertIs(tracker.stub, stub)
+        self.assertEqual(tracker.mock_calls, [call.foo(1), call.stub(2)])
+
 
 class TestMockImport(TestCase):
 
@@ -49,6 +60,24 @@ class TestMockImport(TestCase):
             import foo.bar.baz
             self.assertEqual(foo.bar.baz, mock_baz)
 
+    def test_can_import_a_given_object(self):
+        stub = Stub()
+
+        with mock_import('foo', new=stub) as mock_foo:
+            import foo
+            self.assertIs(foo, stub)
+            self.assertIs(mock_foo, stub)
+
+    def test_can_import_a_given_object_from_packages(self):
+        stub = Stub()
+
+        with mock_import('foo.bar.baz', new=stub) as mock_baz:
+            import foo.bar.baz
+            from foo.bar import baz
+            self.assertIs(foo.bar.baz, stub)
+            self.assertIs(baz, stub)
+            self.assertIs(mock_baz, stub)
+
     @mock_import('foo')
     def test_can_be_used_as_a_decorator_too(self, mock_foo):
         import foo
@@ -118,3 +147,65 @@ class TestEffect(TestCase):
     def test_can_be_used_with_mutable_data_structs(self):
         side_effect = effect((call([1, 2, 3]), 'list'))
         self.assertEqual(side_effect([1, 2, 3]), 'list')
+
+
+class TestIndexedEffect(TestCase):
+
+    def test_returns_values_for_configured_calls(self):
+        side_effect = effect(*[(call(i, key=str(i)), i * 2)
+                               for i in range(1000)], indexed=True)
+
+        self.assertEqual(side_effect(500, key='500'), 1000)
+        self.assertEqual(side_effect(0, key='0'), 0)
+
+    def test_raises_type_error_when_called_with_unknown_args(self):
+        side_effect = effect((call(1), 5), indexed=True)
+        self.assertRaises(TypeError, side_effect, 'junk')
+
+    def test_first_configured_match_wins(self):
+        side_effect = effect((call(1), 'first'), (call(1), 'second'),
+                             indexed=True)
+        self.assertEqual(side_effect(1), 'first')
+
+    def test_any_configured_before_exact_match_wins(self):
+        side_effect = effect((call(ANY), 'any'), (call(1), 'exact'),
+                             indexed=True)
+        self.assertEqual(side_effect(1), 'any')
+
+    def test_exact_match_configured_before_any_wins(self):
+        side_effect = effect((call(1), 'exact'), (call(ANY), 'any'),
+                             indexed=True)
+        self.assertEqual(side_effect(1), 'exact')
+        self.assertEqual(side_effect(2), 'any')
+
+    def test_unhashable_arguments_are_matched_in_order(self):
+        side_effect = effect((call([1, 2]), 'list'), (call(1), 'int'),
+                             indexed=True)
+        self.assertEqual(side_effect([1, 2]), 'list')
+        self.assertEqual(side_effect(1), 'int')
+
+    def test_identity_compared_objects_are_indexed(self):
+        side_effect = effect((call(sentinel.a), 'a'), indexed=True)
+        self.assertEqual(side_effect(sentinel.a), 'a')
+        self.assertEqual(list(side_effect.index.keyed.values()), [0])
+
+    def test_plain_calls_are_all_keyed(self):
+        config = [(call(i, (i, 'a'), k=None), i) for i in range(100)]
+        side_effect = effect(*config, indexed=True)
+
+        self.assertEqual(side_effect(99, (99, 'a'), k=None), 99)
+        self.assertEqual(len(side_effect.index.keyed), 100)
+        self.assertEqual(side_effect.index.scanned, [])
+
+    def test_changing_configuration_rebuilds_index(self):
+        side_effect = effect((call(1), 'one'), indexed=True)
+        self.assertEqual(side_effect(1), 'one')
+
+        side_effect.append((call(2), 'two'))
+        side_effect[0] = (call(1), 'uno')
+
+        self.assertEqual(side_effect(2), 'two')
+        self.assertEqual(side_effect(1), 'uno')
+
+    def test_rejects_unknown_options(self):
+        self.assertRaises(TypeError, effect, (call(1), 1), fast=True)
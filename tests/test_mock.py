@@ -1,6 +1,7 @@
 from tests import TestCase
+from mock import ANY, patch, call
 
-from exam.mock import Mock
+from exam.mock import Mock, RecordingPolicyError, Stub
 from exam.decorators import fixture, before
 
 
@@ -67,3 +68,213 @@ class MockTest(TestCase):
             # Even though it's not the latest, it was previously called with
             # these args
             self.mock.assert_not_any_call(1, 2, three=4)
+
+
+class IndexedMockTest(MockTest):
+
+    mock = fixture(Mock, index_calls=True)
+
+    def test_negative_assertions_do_not_search_call_history(self):
+        for i in range(100):
+            self.mock(i)
+
+        with patch('exam.mock._count_matching', return_value=0) as search:
+            self.mock.assert_not_any_call(1000)
+            self.mock.assert_not_called_once_with(50, 50)
+
+        for recorded_call in search.call_args_list:
+            self.assertEqual(recorded_call[0][1], [])
+
+        self.assertRaises(AssertionError, self.mock.assert_not_any_call, 5)
+        self.assertRaises(AssertionError,
+                          self.mock.assert_not_called_once_with, 5)
+
+    def test_unkeyed_calls_and_queries_still_match(self):
+        self.mock([1, 2])
+        self.mock(3)
+
+        self.assertRaises(AssertionError, self.mock.assert_not_any_call,
+                          [1, 2])
+        self.assertRaises(AssertionError, self.mock.assert_not_any_call, ANY)
+        self.assertRaises(AssertionError,
+                          self.mock.assert_not_called_once_with, 3)
+        self.mock.assert_not_any_call(4)
+
+    def test_calls_raising_from_side_effect_are_counted(self):
+        self.mock.side_effect = KeyError
+
+        self.assertRaises(KeyError, self.mock, 1)
+        self.assertRaises(AssertionError, self.mock.assert_not_any_call, 1)
+
+    def test_reset_mock_forgets_counted_calls(self):
+        self.mock(1)
+        self.mock.reset_mock()
+        self.mock.assert_not_any_call(1)
+
+    def test_child_mocks_are_not_indexed(self):
+        self.mock.child(1)
+        self.mock.child.assert_not_called_once_with(2)
+        self.assertIsNone(self.mock.child._exam_call_index)
+
+
+class LastCallsMockTest(MockTest):
+
+    mock = fixture(Mock, record=3)
+
+    def test_keeps_only_the_most_recent_calls(self):
+        for i in range(10):
+            self.mock(i)
+
+        self.assertEqual(self.mock.call_args_list,
+                         [call(7), call(8), call(9)])
+        self.assertEqual(self.mock.mock_calls, [call(7), call(8), call(9)])
+        self.assertEqual(self.mock.call_count, 10)
+        self.mock.assert_called_with(9)
+
+    def test_child_calls_are_bounded_on_the_parent_too(self):
+        for i in range(10):
+            self.mock.child(i)
+
+        self.assertEqual(len(self.mock.child.call_args_list), 3)
+        self.assertEqual(self.mock.mock_calls,
+                         [call.child(7), call.child(8), call.child(9)])
+        self.assertEqual(len(self.mock.method_calls), 3)
+
+    def test_assertions_needing_dropped_calls_raise(self):
+        for i in range(10):
+            self.mock(i)
+
+        self.assertRaises(RecordingPolicyError,
+                          self.mock.assert_not_any_call, 0)
+        self.assertRaises(RecordingPolicyError,
+                          self.mock.assert_not_called_once_with, 0)
+        self.assertRaises(RecordingPolicyError, self.mock.assert_any_call, 0)
+        self.assertRaises(RecordingPolicyError, self.mock.assert_has_calls,
+                          [call(8), call(9)])
+
+    def test_assert_has_calls_raises_for_calls_dropped_from_children(self):
+        mock = Mock(record=1)
+        mock.foo(1)
+        mock.foo(2)
+
+        self.assertRaises(RecordingPolicyError, mock.assert_has_calls,
+                          [call.foo(1), call.foo(2)])
+
+    def test_children_of_other_kinds_are_left_without_a_policy(self):
+        class Service(object):
+            async def fetch(self):
+                pass
+
+        mock = Mock(spec=Service, record=3)
+
+        self.assertNotIsInstance(mock.fetch, Mock)
+        self.assertNotIn('record', vars(mock.fetch))
+
+    def test_index_answers_for_dropped_calls(self):
+        mock = Mock(record=1, index_calls=True)
+        mock(1)
+        mock(2)
+
+        self.assertRaises(AssertionError, mock.assert_not_any_call, 1)
+        mock.assert_any_call(1)
+        mock.assert_not_any_call(3)
+
+    def test_reset_mock_makes_history_complete_again(self):
+        for i in range(10):
+            self.mock(i)
+
+        self.mock.reset_mock()
+        self.mock(1)
+        self.mock.assert_not_any_call(2)
+
+
+class CountsMockTest(MockTest):
+
+    mock = fixture(Mock, record='counts')
+
+    def test_keeps_no_calls(self):
+        for i in range(10):
+            self.mock(i)
+            self.mock.child(i)
+
+        self.assertEqual(self.mock.call_args_list, [])
+        self.assertEqual(self.mock.mock_calls, [])
+        self.assertEqual(self.mock.method_calls, [])
+        self.assertEqual(self.mock.call_count, 10)
+        self.mock.assert_called_with(9)
+        self.mock.assert_any_call(3)
+        self.mock.child.assert_any_call(3)
+
+    def test_assertions_it_cannot_answer_raise(self):
+        self.mock(1)
+
+        self.assertRaises(RecordingPolicyError,
+                          self.mock.assert_not_any_call, ANY)
+        self.assertRaises(RecordingPolicyError, self.mock.assert_has_calls,
+                          [call(1)])
+
+    def test_assert_has_calls_raises_for_calls_to_children(self):
+        self.mock.child(1)
+
+        self.assertRaises(RecordingPolicyError, self.mock.assert_has_calls,
+                          [call.child(1)])
+
+    def test_unknown_policies_raise_value_error(self):
+        self.assertRaises(ValueError, Mock, record='some')
+        self.assertRaises(ValueError, Mock, record=-1)
+
+
+class StubTest(TestCase):
+
+    stub = fixture(Stub, return_value=5)
+
+    def test_returns_return_value_and_records_calls(self):
+        self.assertEqual(self.stub(1, a=2), 5)
+        self.assertEqual(self.stub.calls, [((1,), {'a': 2})])
+        self.assertEqual(self.stub.call_args_list, [call(1, a=2)])
+        self.assertEqual(self.stub.call_args, call(1, a=2))
+        self.assertEqual(self.stub.call_count, 1)
+        self.assertTrue(self.stub.called)
+
+    def test_returns_none_by_default(self):
+        self.assertIsNone(Stub()())
+
+    def test_has_no_made_up_attributes(self):
+        self.assertRaises(AttributeError, getattr, self.stub, 'child')
+        self.assertRaises(AttributeError, setattr, self.stub, 'child', 1)
+
+    def test_side_effects_work_like_mocks(self):
+        self.stub.side_effect = KeyError
+        self.assertRaises(KeyError, self.stub)
+
+        self.stub.side_effect = lambda x: x * 2
+        self.assertEqual(self.stub(4), 8)
+
+        self.stub.side_effect = [1, ValueError]
+        self.assertEqual(self.stub(), 1)
+        self.assertRaises(ValueError, self.stub)
+
+    def test_assertions(self):
+        self.stub.assert_not_called()
+        self.assertRaises(AssertionError, self.stub.assert_called)
+
+        self.stub(1)
+        self.stub.assert_called()
+        self.stub.assert_called_once_with(1)
+        self.stub.assert_any_call(1)
+        self.assertRaises(AssertionError, self.stub.assert_called_with, 2)
+
+        self.stub(2)
+        self.assertRaises(AssertionError,
+                          self.stub.assert_called_once_with, 2)
+        self.assertRaises(AssertionError, self.stub.assert_any_call, 3)
+
+    def test_reset_mock(self):
+        self.stub.side_effect = KeyError
+        self.assertRaises(KeyError, self.stub)
+
+        self.stub.reset_mock(return_value=True, side_effect=True)
+
+        self.assertEqual(self.stub.calls, [])
+        self.assertEqual(self.stub.call_count, 0)
+        self.assertIsNone(self.stub())
@@ -0,0 +1,84 @@
+from tests import TestCase
+from tests import ordering_cases as cases
+from io import StringIO
+from mock import patch
+import unittest
+
+from exam import runner
+from exam.ordering import reorder, group_units, has_class_setup
+from exam.sharding import unit_id
+
+
+def interleaved():
+    plain, class_scoped = cases.Plain, cases.ClassScoped
+    module_scoped, neighbour = cases.ModuleScoped, cases.Neighbour
+
+    return unittest.TestSuite([
+        class_scoped('test_a'), module_scoped('test_a'), plain('test_a'),
+        class_scoped('test_b'), neighbour('test_a'), module_scoped('test_b'),
+        unittest.TestSuite([plain('test_b'), neighbour('test_b')])])
+
+
+def names(tests):
+    return ['%s.%s' % (type(test).__name__, test._testMethodName)
+            for test in tests]
+
+
+class TestReorder(TestCase):
+
+    def test_groups_by_module_then_class_in_order_first_found(self):
+        tests, _ = reorder(interleaved())
+
+        self.assertEqual(names(tests), [
+            'ClassScoped.test_a', 'ClassScoped.test_b',
+            'Plain.test_a', 'Plain.test_b',
+            'ModuleScoped.test_a', 'ModuleScoped.test_b',
+            'Neighbour.test_a', 'Neighbour.test_b'])
+
+    def test_counts_only_setups_that_are_shared(self):
+        _, saved = reorder(interleaved())
+
+        # ClassScoped is set up once instead of twice, and shared_module's
+        # module scoped fixture once instead of three times.
+        self.assertEqual(saved, (1, 2))
+
+    def test_is_deterministic(self):
+        self.assertEqual(names(reorder(interleaved())[0]),
+                         names(reorder(interleaved())[0]))
+
+    def test_class_setup_is_found_in_hook_plans_and_set_up_class(self):
+        custom = type('Custom', (unittest.TestCase,),
+                      {'setUpClass': classmethod(lambda cls: None)})
+
+        self.assertTrue(has_class_setup(cases.ClassScoped))
+        self.assertTrue(has_class_setup(custom))
+        self.assertFalse(has_class_setup(cases.Plain))
+
+
+class TestGroupUnits(TestCase):
+
+    def test_modules_with_setup_of_their_own_stay_in_one_unit(self):
+        units, _ = group_units(interleaved())
+
+        self.assertEqual([names(unit) for unit in units], [
+            ['ClassScoped.test_a', 'ClassScoped.test_b'],
+            ['Plain.test_a', 'Plain.test_b'],
+            ['ModuleScoped.test_a', 'ModuleScoped.test_b',
+             'Neighbour.test_a', 'Neighbour.test_b']])
+
+    def test_units_of_a_module_are_named_after_it(self):
+        units, _ = group_units(interleaved())
+
+        self.assertEqual([unit_id(unit) for unit in units],
+                         ['plain_module.ClassScoped', 'plain_module.Plain',
+                          'shared_module'])
+
+    def test_runner_reports_setups_saved(self):
+        stderr = StringIO()
+        with patch('sys.stderr', stderr):
+            status = runner.main(['-j', '1', '--reorder',
+                                  'tests.runner_cases.Passing'])
+
+        self.assertEqual(status, 0)
+        self.assertIn('Reordering saves 0 class setups and 0 module setups',
+                      stderr.getvalue())
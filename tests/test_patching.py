@@ -0,0 +1,132 @@
+from tests import TestCase
+from mock import patch, NonCallableMock
+
+from exam.patching import resolve, build_patch, build_patch_object
+import exam.patching
+
+from tests import dummy
+
+
+class TestResolve(TestCase):
+
+    def test_resolves_module_attributes(self):
+        self.assertEqual(resolve('tests.dummy.thing'), (dummy, 'thing'))
+
+    def test_resolves_attributes_of_objects_in_modules(self):
+        self.assertEqual(resolve('tests.dummy.ThingClass.prop'),
+                         (dummy.ThingClass, 'prop'))
+
+    def test_caches_module_imports(self):
+        resolve('tests.dummy.thing')
+
+        with patch('exam.patching.importlib.import_module') as import_module:
+            self.assertEqual(resolve('tests.dummy.thing'), (dummy, 'thing'))
+
+        self.assertFalse(import_module.called)
+
+    def test_looks_up_attributes_below_module_afresh(self):
+        resolve('tests.dummy.ThingClass.prop')
+
+        with patch('tests.dummy.ThingClass') as mock_class:
+            self.assertEqual(resolve('tests.dummy.ThingClass.prop'),
+                             (mock_class, 'prop'))
+
+    def test_imports_again_when_module_is_replaced(self):
+        resolve('tests.dummy.thing')
+
+        with patch.dict('sys.modules', {'tests.dummy': dummy.ThingClass}):
+            self.assertEqual(resolve('tests.dummy.thing'),
+                             (dummy.ThingClass, 'thing'))
+
+    def test_raises_type_error_for_invalid_targets(self):
+        self.assertRaises(TypeError, resolve, 'nodots')
+
+
+class TestAutospecPool(TestCase):
+
+    def setUp(self):
+        self.pool = exam.patching.autospec_pool = \
+            exam.patching.AutospecPool()
+
+    def tearDown(self):
+        exam.patching.autospec_pool = exam.patching.AutospecPool()
+
+    def use(self, *args, **kwargs):
+        patch_object = build_patch('tests.dummy.Service', *args, **kwargs)
+        mock_class = patch_object.start()
+        self.addCleanup(patch_object.stop)
+        return patch_object, mock_class
+
+    def test_patches_with_an_autospecced_mock(self):
+        patch_object, mock_class = self.use(autospec=True)
+
+        self.assertIs(dummy.Service, mock_class)
+        mock_class().fetch('key')
+        self.assertRaises(TypeError, mock_class().fetch)
+        self.assertRaises(AttributeError, getattr, mock_class(), 'missing')
+
+        patch_object.stop()
+        self.assertIsNot(dummy.Service, mock_class)
+
+    def test_reuses_mock_once_patch_stops(self):
+        first_patch, first = self.use(autospec=True)
+        first_patch.stop()
+        _, second = self.use(autospec=True)
+
+        self.assertIs(first, second)
+
+    def test_never_hands_out_a_mock_in_use(self):
+        first = self.pool.checkout(dummy.Service, False, 'Service', {})
+        second = self.pool.checkout(dummy.Service, False, 'Service', {})
+
+        self.assertIsNot(first.mock, second.mock)
+
+    def test_reused_mock_forgets_what_the_last_test_did(self):
+        first_patch, mock_class = self.use(autospec=True)
+        pristine_instance = mock_class.return_value
+        mock_class().fetch('key')
+        mock_class.return_value.fetch.return_value = 'changed'
+        mock_class.side_effect = KeyError
+        mock_class.store = 'replaced'
+        mock_class.extra = 'added'
+        first_patch.stop()
+
+        _, reused = self.use(autospec=True)
+
+        self.assertIs(reused, mock_class)
+        self.assertIs(reused.return_value, pristine_instance)
+        self.assertFalse(reused.called)
+        self.assertIsInstance(reused().fetch('key'), NonCallableMock)
+        self.assertFalse(hasattr(reused, 'extra'))
+        self.assertNotEqual(reused.store, 'replaced')
+        self.assertEqual(reused.return_value.fetch.call_count, 1)
+        reused.return_value.fetch.assert_called_once_with('key')
+
+    def test_reused_function_mock_forgets_what_the_last_test_did(self):
+        patch_object = build_patch('tests.dummy.compute', autospec=True)
+        compute = patch_object.start()
+        compute(1)
+        compute.return_value = 5
+        patch_object.stop()
+
+        patch_object = build_patch('tests.dummy.compute', autospec=True)
+        reused = patch_object.start()
+        self.addCleanup(patch_object.stop)
+
+        self.assertIs(reused, compute)
+        self.assertFalse(reused.called)
+        self.assertNotEqual(reused(1), 5)
+        self.assertRaises(TypeError, reused)
+
+    def test_options_get_mocks_of_their_own(self):
+        first_patch, first = self.use(autospec=True)
+        first_patch.stop()
+        _, second = self.use(autospec=True, spec_set=True)
+
+        self.assertIsNot(first, second)
+
+    def test_falls_back_to_mock_patch_for_anything_else(self):
+        patch_object = build_patch_object(dummy, 'Service', autospec=True,
+                                          create=True)
+        self.assertNotIsInstance(patch_object,
+                                 exam.patching.TemplatePatch)
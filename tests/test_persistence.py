@@ -0,0 +1,159 @@
+from tests import TestCase, run_tests
+from tests.persistence_cases import build_corpus
+from tests import persistence_cases as cases
+from mock import patch
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+import warnings
+
+from exam.decorators import fixture
+from exam.persistence import dump, load, prune, key_for
+import exam.persistence
+
+
+class PersistenceTestCase(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = patch('exam.persistence.directory', self.directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        del cases.builds[:]
+
+    def entries(self):
+        return sorted(name for name in os.listdir(self.directory)
+                      if name.endswith('.pickle'))
+
+
+class TestPersistedFixtures(PersistenceTestCase):
+
+    def test_value_is_built_once_across_tests(self):
+        result, _ = run_tests(cases.Persisted, 'test_one', 'test_two')
+
+        self.assertTrue(result.wasSuccessful())
+        self.assertEqual(cases.builds, [100])
+        self.assertEqual(len(self.entries()), 1)
+
+    def test_different_arguments_are_cached_apart(self):
+        fixture(build_corpus, 1, persist=True).apply(None)
+        fixture(build_corpus, 2, persist=True).apply(None)
+        fixture(build_corpus, 1, persist=True).apply(None)
+
+        self.assertEqual(cases.builds, [1, 2])
+
+    def test_changing_an_input_file_rebuilds(self):
+        path = os.path.join(self.directory, 'corpus.txt')
+        with open(path, 'w') as corpus_file:
+            corpus_file.write('a')
+
+        persisted = fixture(build_corpus, 1, persist=True, inputs=[path])
+        persisted.apply(None)
+        persisted.apply(None)
+
+        with open(path, 'w') as corpus_file:
+            corpus_file.write('longer')
+        persisted.apply(None)
+
+        self.assertEqual(cases.builds, [1, 1])
+
+    def test_subclasses_are_cached_apart(self):
+        tests = []
+        for case_class in (cases.SourcedFromA, cases.SourcedFromB):
+            tests.extend(run_tests(case_class)[1])
+
+        self.assertEqual([case.seen for case in tests],
+                         ['built for a', 'built for b'])
+        self.assertEqual(cases.builds, ['a', 'b'])
+
+    def test_session_scoped_values_are_cached_for_every_class(self):
+        persisted = fixture(build_corpus, 1, persist=True, scope='session')
+
+        for case_class in (TestPersistedFixtures, TestCacheFiles):
+            persisted.apply(case_class('run'))
+
+        self.assertEqual(cases.builds, [1])
+
+    def test_key_depends_on_the_fixture_code(self):
+        self.assertNotEqual(key_for(fixture(build_corpus, 1)),
+                            key_for(fixture(lambda self, size: size, 1)))
+
+    def test_values_that_cannot_be_pickled_are_not_cached(self):
+        lock = threading.Lock()
+
+        with warnings.catch_warnings(record=True) as caught:
+            warnings.simplefilter('always')
+            value = fixture(lambda self: lock, persist=True).apply(None)
+
+        self.assertIs(value, lock)
+        self.assertIn('Not caching', str(caught[0].message))
+        self.assertEqual(self.entries(), [])
+
+    def test_broken_cache_files_are_rebuilt(self):
+        persisted = fixture(build_corpus, 1, persist=True)
+        persisted.apply(None)
+
+        with open(exam.persistence.path_for(key_for(persisted)), 'wb') \
+                as cache_file:
+            cache_file.write(b'garbage')
+
+        with warnings.catch_warnings(record=True):
+            warnings.simplefilter('always')
+            persisted.apply(None)
+
+        self.assertEqual(cases.builds, [1, 1])
+
+    def test_async_fixtures_cannot_be_persisted(self):
+        namespace = {}
+        try:
+            exec('async def build(self):\n    pass', namespace)
+        except SyntaxError:
+            raise unittest.SkipTest('async def is not supported')
+
+        with self.assertRaises(ValueError):
+            fixture(namespace['build'], persist=True)
+
+
+class TestCacheFiles(PersistenceTestCase):
+
+    def test_values_survive_a_round_trip(self):
+        path = os.path.join(self.directory, 'value.pickle')
+        value = {'buffer': bytearray(b'abc' * 1000), 'list': [1, 2]}
+        dump(value, path)
+
+        self.assertEqual(load(path), value)
+
+    def test_loaded_buffers_can_change_without_changing_the_cache(self):
+        path = os.path.join(self.directory, 'value.pickle')
+        dump(bytearray(b'abc'), path)
+
+        loaded = load(path)
+        loaded[0:1] = b'x'
+
+        self.assertEqual(load(path), bytearray(b'abc'))
+
+    def test_prune_removes_entries_unused_for_too_long(self):
+        for name, used in [('old', 0), ('new', time.time())]:
+            path = os.path.join(self.directory, name + '.pickle')
+            dump(name, path)
+            os.utime(path, (used, used))
+
+        prune()
+
+        self.assertEqual(self.entries(), ['new.pickle'])
+
+    def test_prune_removes_least_recently_used_entries_over_size(self):
+        now = time.time()
+        for age, name in enumerate(['c', 'b', 'a']):
+            path = os.path.join(self.directory, name + '.pickle')
+            dump(bytearray(1000), path)
+            os.utime(path, (now - age, now - age))
+
+        with patch('exam.persistence.max_size', 2500):
+            prune()
+
+        self.assertEqual(self.entries(), ['b.pickle', 'c.pickle'])
@@ -0,0 +1,96 @@
+from tests import TestCase
+from io import StringIO
+from mock import patch
+import os
+import pstats
+import shutil
+import tempfile
+import time
+import unittest
+
+from exam import runner
+from exam.cases import Exam
+from exam.decorators import before
+from exam.profiling import SlowestProfiles
+import exam.profiling
+
+
+class Profiled(Exam, unittest.TestCase):
+
+    @before
+    def set_up(self):
+        pass
+
+    def test_fast(self):
+        pass
+
+    def test_slow(self):
+        time.sleep(0.02)
+
+    def test_slowest(self):
+        time.sleep(0.04)
+
+
+class TestSlowestProfiles(TestCase):
+
+    def setUp(self):
+        self.profiles = exam.profiling.enable(keep=2)
+        self.addCleanup(exam.profiling.disable)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.directory = os.path.join(directory, 'profiles')
+
+    def run_profiled(self):
+        unittest.TestLoader().loadTestsFromTestCase(Profiled).run(
+            unittest.TestResult())
+
+    def test_only_the_slowest_tests_are_kept(self):
+        self.run_profiled()
+
+        self.assertEqual([test_id for _, test_id, _ in
+                          self.profiles.slowest()],
+                         [Profiled('test_slowest').id(),
+                          Profiled('test_slow').id()])
+
+    def test_profiles_are_written_as_pstats_files(self):
+        self.run_profiled()
+        written = self.profiles.write(self.directory)
+
+        self.assertEqual(
+            [os.path.basename(path) for _, _, path in written],
+            ['01-%s.prof' % Profiled('test_slowest').id(),
+             '02-%s.prof' % Profiled('test_slow').id()])
+
+        stats = pstats.Stats(written[0][2])
+        functions = [function for _, _, function in stats.stats]
+        self.assertIn('set_up', functions)
+        self.assertIn('test_slowest', functions)
+
+    def test_drain_returns_only_new_entries_still_kept(self):
+        profiles = SlowestProfiles(1)
+        slow, slower = (1.0, 'slow', {}), (2.0, 'slower', {})
+        profiles.offer(slow)
+        profiles.offer(slower)
+
+        self.assertEqual(profiles.drain(), [slower])
+        self.assertEqual(profiles.drain(), [])
+
+    def test_entries_drained_into_their_own_keeper_are_not_kept_twice(self):
+        profiles = SlowestProfiles(2)
+        profiles.offer((1.0, 'slow', {}))
+
+        for entry in profiles.drain():
+            profiles.offer(entry)
+
+        self.assertEqual(len(profiles.kept), 1)
+
+    def test_runner_writes_the_slowest_profiles(self):
+        exam.profiling.disable()
+        stderr = StringIO()
+        with patch('sys.stderr', stderr):
+            runner.main(['-j', '2', '--profile-slowest', '1',
+                         '--profile-dir', self.directory,
+                         'tests.runner_cases'])
+
+        self.assertEqual(len(os.listdir(self.directory)), 1)
+        self.assertIn('Profiles of the slowest tests:', stderr.getvalue())
@@ -0,0 +1,79 @@
+from tests import TestCase
+from io import StringIO
+from mock import patch
+import pickle
+import unittest
+
+from exam import runner
+from tests import runner_cases
+
+
+class TestGroupByClass(TestCase):
+
+    def test_splits_suite_into_one_suite_per_class_in_order(self):
+        suite = unittest.TestSuite([
+            runner_cases.Passing('test_one'),
+            unittest.TestSuite([runner_cases.Failing('test_fails'),
+                                runner_cases.Passing('test_two')])])
+
+        units = runner.group_by_class(suite)
+
+        self.assertEqual([[test.id() for test in unit] for unit in units], [
+            ['tests.runner_cases.Passing.test_one',
+             'tests.runner_cases.Passing.test_two'],
+            ['tests.runner_cases.Failing.test_fails']])
+
+
+class TestRun(TestCase):
+
+    def run_cases(self, jobs):
+        suite = unittest.TestLoader().loadTestsFromModule(runner_cases)
+        stream = StringIO()
+        result = runner.run(runner.group_by_class(suite), jobs,
+                            stream=stream)
+        return result, stream.getvalue()
+
+    def assert_merged_report(self, result, output):
+        # Two failing subtests still make test_subtests one test.
+        self.assertEqual(result.testsRun, 6)
+        self.assertEqual(len(result.failures), 3)
+        self.assertEqual(len(result.errors), 1)
+        self.assertEqual(len(result.skipped), 1)
+        self.assertFalse(result.wasSuccessful())
+
+        self.assertIn('test_fails', result.failures[0][0].id())
+        self.assertIn('AssertionError: 1 != 2', result.failures[0][1])
+        self.assertIn("KeyError: 'boom'", result.errors[0][1])
+        self.assertIn('(i=1)', str(result.failures[1][0]))
+        self.assertIn('(i=2)', str(result.failures[2][0]))
+        self.assertIn('Ran 6 tests', output)
+        self.assertIn('FAILED (failures=3, errors=1, skipped=1)', output)
+
+    def test_merges_results_from_worker_processes(self):
+        self.assert_merged_report(*self.run_cases(jobs=2))
+
+    def test_runs_in_process_with_one_job(self):
+        self.assert_merged_report(*self.run_cases(jobs=1))
+
+    def test_main_returns_exit_status(self):
+        stderr = StringIO()
+
+        with patch('sys.stderr', stderr):
+            status = runner.main(['-j', '2', 'tests.runner_cases.Passing'])
+
+        self.assertEqual(status, 0)
+        self.assertIn('Ran 2 tests', stderr.getvalue())
+
+
+class TestPickling(TestCase):
+
+    def test_exam_test_cases_pickle_without_fixtures_or_patchers(self):
+        case = runner_cases.Passing('test_one')
+        case.release_after_run = False
+        case.run(unittest.TestResult())
+
+        restored = pickle.loads(pickle.dumps(case))
+
+        self.assertEqual(restored.id(), case.id())
+        self.assertNotIn('dummy_it', vars(restored))
+        self.assertEqual(restored.calls, [])
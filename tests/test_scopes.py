@@ -0,0 +1,124 @@
+from tests import TestCase
+from mock import Mock, call
+
+from exam.scopes import Scope, ScopeRegistry, setup_value, module_hooks
+import exam.scopes
+
+
+class TestScope(TestCase):
+
+    def test_get_builds_value_once(self):
+        scope = Scope('class')
+        factory = Mock(return_value=5)
+
+        self.assertEqual(scope.get('key', factory), 5)
+        self.assertEqual(scope.get('key', factory), 5)
+        factory.assert_called_once_with()
+
+    def test_get_builds_value_once_across_threads(self):
+        import threading
+        import time
+
+        scope = Scope('class')
+        built = []
+
+        def factory():
+            time.sleep(0.01)
+            built.append(True)
+            return len(built)
+
+        threads = [threading.Thread(target=scope.get, args=('key', factory))
+                   for _ in range(4)]
+        [thread.start() for thread in threads]
+        [thread.join() for thread in threads]
+
+        self.assertEqual(built, [True])
+
+    def test_close_runs_finalizers_in_reverse_order(self):
+        scope = Scope('class')
+        tracker = Mock()
+        scope.add_finalizer(tracker.first)
+        scope.add_finalizer(tracker.second)
+
+        scope.close()
+
+        self.assertEqual(tracker.mock_calls, [call.second(), call.first()])
+
+    def test_close_runs_every_finalizer_and_reraises_first_error(self):
+        scope = Scope('class')
+        ran = Mock()
+        scope.add_finalizer(ran)
+        scope.add_finalizer(Mock(side_effect=KeyError))
+        scope.add_finalizer(Mock(side_effect=ValueError))
+
+        self.assertRaises(ValueError, scope.close)
+        ran.assert_called_once_with()
+
+    def test_close_forgets_values(self):
+        scope = Scope('class')
+        scope.get('key', list)
+        scope.close()
+        self.assertEqual(scope.values, {})
+
+    def test_setup_value_advances_generators_until_scope_closes(self):
+        scope = Scope('class')
+        steps = []
+
+        def generator():
+            steps.append('setup')
+            yield 'value'
+            steps.append('teardown')
+
+        self.assertEqual(setup_value(scope, generator()), 'value')
+        self.assertEqual(steps, ['setup'])
+
+        scope.close()
+        self.assertEqual(steps, ['setup', 'teardown'])
+
+    def test_setup_value_leaves_other_values_alone(self):
+        self.assertEqual(setup_value(Scope('class'), [1]), [1])
+
+
+class TestScopeRegistry(TestCase):
+
+    def test_scope_is_reused_for_same_name_and_key(self):
+        registry = ScopeRegistry()
+        self.assertIs(registry.scope('module', 'a'),
+                      registry.scope('module', 'a'))
+        self.assertIsNot(registry.scope('module', 'a'),
+                         registry.scope('module', 'b'))
+
+    def test_close_all_closes_scopes_in_reverse_creation_order(self):
+        registry = ScopeRegistry()
+        closed = []
+
+        for name, key in [('session', None), ('module', 'm'), ('class', 1)]:
+            registry.scope(name, key).add_finalizer(
+                lambda name=name: closed.append(name))
+
+        registry.close_all()
+
+        self.assertEqual(closed, ['class', 'module', 'session'])
+        self.assertEqual(registry.scopes, {})
+
+    def test_close_all_closes_every_scope_even_if_one_fails(self):
+        registry = ScopeRegistry()
+        survivor = Mock()
+        registry.scope('session').add_finalizer(survivor)
+        registry.scope('module', 'm').add_finalizer(
+            Mock(side_effect=KeyError))
+
+        self.assertRaises(KeyError, registry.close_all)
+        survivor.assert_called_once_with()
+
+    def test_module_hooks_close_the_module_scope(self):
+        finalizer = Mock()
+        setUpModule, tearDownModule = module_hooks('tests.fake_module')
+
+        setUpModule()
+        exam.scopes.for_module('tests.fake_module').add_finalizer(finalizer)
+        tearDownModule()
+
+        finalizer.assert_called_once_with()
+        self.assertNotIn(('module', 'tests.fake_module'),
+                         exam.scopes.registry.scopes)
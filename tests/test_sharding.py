@@ -0,0 +1,105 @@
+from tests import TestCase
+from io import StringIO
+from mock import patch
+import os
+import shutil
+import tempfile
+import unittest
+
+from exam import runner
+from exam.sharding import (assign, estimate, shard, parse_shard, unit_id,
+                           load_timings, save_timings, DEFAULT_DURATION)
+from tests import runner_cases
+
+
+class TestAssign(TestCase):
+
+    def test_balances_shards_longest_first(self):
+        durations = {'a': 8, 'b': 7, 'c': 6, 'd': 5, 'e': 4}
+        shards = assign(durations, 2)
+
+        self.assertEqual(shards, [set(['a', 'd', 'e']), set(['b', 'c'])])
+
+    def test_is_deterministic_for_equal_durations(self):
+        durations = dict((name, 1.0) for name in 'fedcba')
+
+        self.assertEqual(assign(durations, 3), assign(dict(durations), 3))
+        self.assertEqual(assign(durations, 3),
+                         [set(['a', 'd']), set(['b', 'e']), set(['c', 'f'])])
+
+    def test_every_id_is_in_exactly_one_shard(self):
+        durations = dict((str(i), i % 7) for i in range(100))
+        shards = assign(durations, 8)
+
+        self.assertEqual(sum(len(s) for s in shards), 100)
+        self.assertEqual(set().union(*shards), set(durations))
+
+
+class TestEstimate(TestCase):
+
+    def test_untimed_classes_take_the_median_of_timed_ones(self):
+        durations = estimate(['a', 'b', 'c', 'new'],
+                             {'a': 1.0, 'b': 2.0, 'c': 10.0})
+        self.assertEqual(durations['new'], 2.0)
+
+    def test_without_any_timings_every_class_takes_the_default(self):
+        self.assertEqual(estimate(['a'], {}), {'a': DEFAULT_DURATION})
+
+
+class TestShard(TestCase):
+
+    units = runner.group_by_class(
+        unittest.TestLoader().loadTestsFromModule(runner_cases))
+
+    def test_unit_id_names_the_class(self):
+        self.assertEqual([unit_id(unit) for unit in self.units],
+                         ['tests.runner_cases.Failing',
+                          'tests.runner_cases.Passing'])
+
+    def test_shards_together_have_every_unit_once(self):
+        timings = {'tests.runner_cases.Failing': 5.0}
+        first = shard(self.units, 0, 2, timings)
+        second = shard(self.units, 1, 2, timings)
+
+        self.assertEqual(first, [self.units[0]])
+        self.assertEqual(second, [self.units[1]])
+
+    def test_parse_shard(self):
+        self.assertEqual(parse_shard('3/8'), (2, 8))
+        self.assertRaises(ValueError, parse_shard, '9/8')
+        self.assertRaises(ValueError, parse_shard, 'three')
+
+
+class TestTimingsFile(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        self.path = os.path.join(self.directory, 'timings.json')
+
+    def test_missing_file_has_no_timings(self):
+        self.assertEqual(load_timings(self.path), {})
+
+    def test_saving_merges_with_earlier_timings(self):
+        save_timings(self.path, {'a': 1.0, 'b': 2.0})
+        save_timings(self.path, {'b': 3.0})
+
+        self.assertEqual(load_timings(self.path), {'a': 1.0, 'b': 3.0})
+
+    def test_runner_records_timings_and_runs_only_its_shard(self):
+        with patch('sys.stderr', StringIO()):
+            runner.main(['-j', '1', '--timings', self.path,
+                         'tests.runner_cases'])
+
+        timings = load_timings(self.path)
+        self.assertEqual(sorted(timings), ['tests.runner_cases.Failing',
+                                           'tests.runner_cases.Passing'])
+
+        stderr = StringIO()
+        with patch('sys.stderr', stderr):
+            runner.main(['-j', '1', '--timings', self.path,
+                         '--shard', '1/2', 'tests.runner_cases'])
+
+        ran = 4 if timings['tests.runner_cases.Failing'] > \
+            timings['tests.runner_cases.Passing'] else 2
+        self.assertIn('Ran %d tests' % ran, stderr.getvalue())
@@ -0,0 +1,108 @@
+from tests import TestCase
+from io import StringIO
+from mock import patch
+import array
+import os
+import shutil
+import tempfile
+
+from exam import runner
+from exam.decorators import fixture
+from exam.scopes import Scope
+from exam.sharing import share
+import exam.sharing
+
+
+def build_bytes(testcase):
+    return b'shared bytes'
+
+
+class TestShare(TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, self.directory)
+        patcher = patch('exam.sharing.directory', self.directory)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.scope = Scope('session')
+        self.addCleanup(self.scope.close)
+
+    def share(self, value, thing=build_bytes):
+        return share(fixture(thing), self.scope, lambda: value)
+
+    def test_views_are_read_only(self):
+        view = self.share(b'shared bytes')
+
+        self.assertEqual(view.tobytes(), b'shared bytes')
+        self.assertTrue(view.readonly)
+
+    def test_views_keep_the_format_and_shape(self):
+        view = self.share(array.array('d', [1.5, 2.5]))
+
+        self.assertEqual(view.format, 'd')
+        self.assertEqual(view.tolist(), [1.5, 2.5])
+
+    def test_empty_values_can_be_shared(self):
+        self.assertEqual(self.share(b'').tobytes(), b'')
+
+    def test_built_once_for_every_use(self):
+        builds = []
+
+        def build():
+            builds.append(1)
+            return b'x'
+
+        for _ in range(2):
+            share(fixture(build_bytes), self.scope, build)
+
+        self.assertEqual(builds, [1])
+
+    def test_values_built_for_different_classes_are_shared_apart(self):
+        shared = fixture(build_bytes)
+        views = [share(shared, self.scope, lambda: value, owner)
+                 for value, owner in [(b'a', TestShare), (b'b', TestRuns)]]
+
+        self.assertEqual([view.tobytes() for view in views], [b'a', b'b'])
+
+    def test_mappings_are_closed_with_their_scope(self):
+        view = self.share(b'shared bytes')
+        self.scope.close()
+
+        with self.assertRaises(ValueError):
+            view.tobytes()
+
+    def test_shared_fixtures_must_outlive_a_test(self):
+        with self.assertRaises(ValueError):
+            fixture(build_bytes, shared=True, scope='function')
+
+        self.assertEqual(fixture(build_bytes, shared=True).scope, 'session')
+
+
+class TestRuns(TestCase):
+
+    def setUp(self):
+        self.addCleanup(exam.sharing.end_run)
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.builds = os.path.join(directory, 'builds')
+
+    def test_run_directory_is_removed_by_its_owner(self):
+        directory = exam.sharing.start_run()
+
+        with patch('exam.sharing._owner', -1):
+            exam.sharing.end_run()
+        self.assertTrue(os.path.isdir(directory))
+
+        exam.sharing.end_run()
+        self.assertFalse(os.path.exists(directory))
+        self.assertNotIn(exam.sharing.ENVIRONMENT, os.environ)
+
+    def test_workers_share_one_build(self):
+        with patch.dict(os.environ, {'EXAM_SHARING_BUILDS': self.builds}):
+            with patch('sys.stderr', StringIO()):
+                status = runner.main(['-j', '2', 'tests.sharing_cases'])
+
+        self.assertEqual(status, 0)
+        with open(self.builds) as builds:
+            self.assertEqual(len(builds.read().split()), 1)
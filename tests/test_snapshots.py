@@ -0,0 +1,95 @@
+from tests import TestCase, run_tests
+from tests.snapshot_cases import Record, build_graph, mutate
+from tests import snapshot_cases as cases
+
+from exam.decorators import fixture
+from exam.snapshots import take, STRATEGIES
+import exam.scopes
+
+
+class TestStrategies(TestCase):
+
+    def test_copies_are_equal_but_independent(self):
+        for strategy in STRATEGIES:
+            clone = take(build_graph(), strategy)
+            first = clone()
+            mutate(first)
+            second = clone()
+
+            self.assertEqual(second['records'][0].tags, ['tag'], strategy)
+            self.assertEqual(len(second['records']), 3, strategy)
+            self.assertEqual(second['counts'], {'a': 1}, strategy)
+            self.assertEqual(second['seen'], set([1, 2]), strategy)
+            self.assertEqual(second['payload'], bytearray(b'abc'), strategy)
+            self.assertEqual(second['records'][2].name, 'record2', strategy)
+
+    def test_structural_copies_share_immutable_parts(self):
+        graph = build_graph()
+        copied = take(graph, 'structural')()
+
+        self.assertIs(copied['names'], graph['names'])
+        self.assertIs(copied['records'][0].name, graph['records'][0].name)
+        self.assertIsNot(copied['records'][0], graph['records'][0])
+        self.assertIsInstance(copied['records'][0], Record)
+
+    def test_structural_copies_copy_set_members_and_dict_keys(self):
+        member, key = Record('member', []), Record('key', [])
+        graph = {'nodes': set([member]), 'index': {key: 1}}
+        clone = take(graph, 'structural')
+
+        first = clone()
+        next(iter(first['nodes'])).tags.append('changed')
+        next(iter(first['index'])).tags.append('changed')
+        second = clone()
+
+        self.assertEqual(next(iter(second['nodes'])).tags, [])
+        self.assertEqual(next(iter(second['index'])).tags, [])
+        self.assertEqual(member.tags, [])
+        self.assertEqual(key.tags, [])
+
+    def test_structural_copies_keep_shared_objects_shared(self):
+        shared = []
+        copied = take({'a': shared, 'b': shared}, 'structural')()
+
+        self.assertIs(copied['a'], copied['b'])
+        self.assertIsNot(copied['a'], shared)
+
+    def test_structural_copies_handle_cycles(self):
+        graph = {}
+        graph['self'] = graph
+        copied = take(graph, 'structural')()
+
+        self.assertIs(copied['self'], copied)
+
+    def test_unknown_strategies_are_rejected(self):
+        with self.assertRaises(ValueError):
+            take({}, 'fork')
+
+
+class TestSnapshotFixtures(TestCase):
+
+    def setUp(self):
+        del cases.builds[:]
+
+    def test_built_once_and_copied_for_each_test(self):
+        for strategy in STRATEGIES:
+            result, _ = run_tests(cases.BY_STRATEGY[strategy],
+                                  'test_one', 'test_two')
+
+            self.assertTrue(result.wasSuccessful(), result.failures)
+
+        self.assertEqual(cases.builds, list(STRATEGIES))
+
+    def test_a_test_sees_one_copy_throughout(self):
+        case = cases.PickleSnapshotted('test_one')
+        self.addCleanup(exam.scopes.close_class, type(case))
+
+        self.assertIs(case.graph, case.graph)
+
+    def test_function_scoped_snapshots_are_rejected(self):
+        with self.assertRaises(ValueError):
+            fixture(build_graph, snapshot='pickle', scope='function')
+
+    def test_unknown_strategies_are_rejected(self):
+        with self.assertRaises(ValueError):
+            fixture(build_graph, snapshot='fork')
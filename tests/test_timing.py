@@ -0,0 +1,151 @@
+from tests import TestCase
+from io import StringIO
+from mock import patch
+import json
+import os
+import shutil
+import tempfile
+import unittest
+
+from exam import runner
+from exam.cases import Exam
+from exam.decorators import before, after, around, fixture, patcher
+from exam.timing import Recorder, format_text, write_json, OUTSIDE_TESTS
+import exam.timing
+
+
+def build_user(testcase):
+    return 'user'
+
+
+class Timed(Exam, unittest.TestCase):
+
+    user = fixture(build_user)
+    dummy_it = patcher('tests.dummy.it')
+
+    @around
+    def wrap(self):
+        yield
+
+    @before
+    def set_up(self):
+        self.user
+
+    @after
+    def tear_down(self):
+        pass
+
+    def test_it(self):
+        pass
+
+
+class TestRecordingTests(TestCase):
+
+    def setUp(self):
+        self.recorder = exam.timing.enable()
+        self.addCleanup(exam.timing.disable)
+
+    def run_timed(self):
+        case = Timed('test_it')
+        case.run(unittest.TestResult())
+        return [(phase, name) for phase, name, _ in
+                self.recorder.tests[case.id()]]
+
+    def test_every_phase_of_a_test_is_recorded(self):
+        records = self.run_timed()
+
+        self.assertEqual(sorted(records), sorted([
+            ('before', 'Exam.__setup_patchers'),
+            ('patch build', 'tests.dummy.it'),
+            ('patch start', 'tests.dummy.it'),
+            ('before', 'Exam.__warm_fixtures'),
+            ('fixture', 'build_user'),
+            ('before', 'Timed.set_up'),
+            ('test', 'test_it'),
+            ('after', 'Timed.tear_down'),
+            ('around', 'Timed.wrap'),
+            ('total', '')]))
+
+    def test_nothing_is_recorded_once_disabled(self):
+        exam.timing.disable()
+        Timed('test_it').run(unittest.TestResult())
+
+        self.assertEqual(self.recorder.tests, {})
+
+    def test_records_outside_tests_are_kept_apart(self):
+        exam.timing.call('fixture', 'shared', int)
+        self.assertEqual([name for _, name, _ in
+                          self.recorder.tests[OUTSIDE_TESTS]], ['shared'])
+
+    def test_call_returns_what_the_function_returns(self):
+        self.assertEqual(exam.timing.call('fixture', 'x', int, '3'), 3)
+
+
+class TestReport(TestCase):
+
+    def build_recorder(self):
+        recorder = Recorder()
+        recorder.merge({
+            'a': [('before', 'hook', 1.0), ('test', 'test_a', 3.0),
+                  ('total', '', 4.5)],
+            'b': [('before', 'hook', 2.0), ('fixture', 'user', 0.5),
+                  ('total', '', 2.5)]})
+        return recorder
+
+    def test_report_breaks_down_tests_and_totals_hooks(self):
+        report = self.build_recorder().report()
+
+        self.assertEqual(report['tests']['a']['seconds'], 4.5)
+        self.assertEqual(len(report['tests']['a']['phases']), 2)
+        self.assertEqual(report['slowest'], [
+            {'phase': 'before', 'name': 'hook', 'calls': 2, 'seconds': 3.0,
+             'max': 2.0},
+            {'phase': 'fixture', 'name': 'user', 'calls': 1, 'seconds': 0.5,
+             'max': 0.5}])
+
+    def test_report_can_be_limited(self):
+        self.assertEqual(len(self.build_recorder().report(1)['slowest']), 1)
+
+    def test_drain_forgets_what_it_returns(self):
+        recorder = self.build_recorder()
+        drained = recorder.drain()
+
+        self.assertEqual(sorted(drained), ['a', 'b'])
+        self.assertEqual(recorder.tests, {})
+
+    def test_text_lists_slowest_hooks_then_slowest_tests(self):
+        text = format_text(self.build_recorder().report(), tests=1)
+
+        self.assertIn('before        hook', text)
+        self.assertIn('4.5000  a', text)
+        self.assertNotIn('2.5000  b', text)
+
+
+class TestRunnerHookTimings(TestCase):
+
+    def setUp(self):
+        directory = tempfile.mkdtemp()
+        self.addCleanup(shutil.rmtree, directory)
+        self.path = os.path.join(directory, 'hook-timings.json')
+        self.addCleanup(exam.timing.disable)
+
+    def test_runner_writes_json_and_prints_text(self):
+        stderr = StringIO()
+        with patch('sys.stderr', stderr):
+            runner.main(['-j', '2', '--hook-timings', self.path,
+                         'tests.runner_cases'])
+
+        with open(self.path) as report_file:
+            report = json.load(report_file)
+
+        self.assertIn('tests.runner_cases.Passing.test_one', report['tests'])
+        self.assertIn('Passing.add_call',
+                      [total['name'] for total in report['slowest']])
+        self.assertIn('Slowest tests:', stderr.getvalue())
+
+    def test_write_json_writes_the_report(self):
+        write_json({'tests': {}, 'slowest': []}, self.path)
+
+        with open(self.path) as report_file:
+            self.assertEqual(json.load(report_file),
+                             {'tests': {}, 'slowest': []})